@@ -0,0 +1,130 @@
+# ============================================
+# Squid Game - State-update benchmarks (no drawing)
+# ============================================
+# How long the engines take to advance their state, scaled by players, steps
+# and matches beyond the sizes of the real games.
+
+import numpy as np
+
+from .common import GAMES, fresh_game, game
+
+
+class Simulate:
+    """simulate() of every game as season.py --no-render runs it."""
+    params = list(GAMES)
+    param_names = ["game"]
+
+    def setup(self, n):
+        self.game = game(n)
+
+    def time_simulate(self, n):
+        self.game.simulate()
+
+
+class Game1Update:
+    """Red Light, Green Light: every round of the table applied to `n_players`."""
+    params = [456, 10_000, 100_000]
+    param_names = ["players"]
+
+    def setup(self, n_players):
+        self.g = game(1)
+        self.rounds = self.g.scale_rounds(self.g.df, n_players)
+        self.played = self.g.run_rounds(self.g.RedLightEngine(n_players, rng=np.random.RandomState(self.g.SEED)),
+                                        self.rounds)
+
+    def time_run_rounds(self, n_players):
+        engine = self.g.RedLightEngine(n_players, rng=np.random.RandomState(self.g.SEED))
+        self.g.run_rounds(engine, self.rounds)
+
+    def time_frame_state(self, n_players):
+        self.played.offsets()
+        self.played.color_codes()
+
+
+class Game2Motion:
+    """Dalgona: `steps` calls of move_step and the per-frame snapshot of every player."""
+    params = ([187, 10_000, 100_000], [10, 100])
+    param_names = ["players", "steps"]
+
+    def setup(self, n_players, steps):
+        g = self.g = game(2)
+        rng = np.random.default_rng(g.SEED)
+        shapes = rng.integers(0, len(g.shape_order), n_players)
+        status = np.where(rng.random(n_players) < 0.4, g.FAIL_SCHED, g.WORKING)
+        self.players = g.PlayerStore(shapes, status, rng.uniform(0, 45, n_players), rng.uniform(0, 30, n_players))
+        self.players.tx[:] = rng.uniform(0, 45, n_players)
+        self.players.ty[:] = rng.uniform(0, 30, n_players)
+        self.ix = np.arange(n_players)
+        self.fail = rng.choice(n_players, max(1, n_players // 100), replace=False)
+
+    def time_move_step(self, n_players, steps):
+        p = self.players
+        for _ in range(steps):
+            self.g.move_step(p, self.ix, p.tx, p.ty, step=0.6, jitter=0.03)
+
+    def time_log_snapshot(self, n_players, steps):
+        # what simulate() keeps per frame: positions, faces and the per-shape counters
+        p, g = self.players, self.g
+        xy = np.empty((steps, n_players, 2), dtype=np.float32)
+        face = np.empty((steps, n_players), dtype=np.int8)
+        counts = np.empty((steps, 2, len(g.shape_order)), dtype=np.int32)
+        for frame in range(steps):
+            p.set_status(self.fail, g.FAILED if frame % 2 else g.FAIL_SCHED)
+            xy[frame] = p.xy()
+            face[frame] = np.where(p.status == g.FAILED, g.FAILED_FACE, p.shape)
+            counts[frame] = p.finished_by_shape, p.failed_by_shape
+
+
+class Game3Brackets:
+    """Tug of war: `brackets` whole single-elimination tournaments at once."""
+    params = [1_000, 10_000]
+    param_names = ["brackets"]
+
+    def setup(self, n):
+        self.g = game(3)
+
+    def time_simulate_brackets(self, n):
+        self.g.simulate_brackets(n, seed=0)
+
+
+class Game4Matches:
+    """Marbles: `matches` full matches of one sub-game side by side."""
+    params = (["odd_even", "throw_wall", "hit_out", "generic"], [1_000, 20_000])
+    param_names = ["style", "matches"]
+
+    def setup(self, style, n):
+        self.g = game(4)
+
+    def time_simulate_matches(self, style, n):
+        self.g.simulate_matches(style, n, rng=np.random.default_rng(0))
+
+
+class Game5Storyboard:
+    """Glass bridge: `frames` storyboard captures and the survival Monte Carlo at any bridge size."""
+    params = ([16, 456], [18, 64])
+    param_names = ["players", "steps"]
+    frames = 200
+
+    def setup(self, n_players, n_steps):
+        self.g = game(5)
+        rng = np.random.default_rng(0)
+        self.pos = rng.uniform(0, 10, (n_players, 2)).astype(np.float32)
+        self.visible = np.ones(n_players, dtype=bool)
+        self.safe = rng.random(n_steps) < 0.5
+        self.broken = rng.random((n_steps, 2)) < 0.25
+
+    def time_capture(self, n_players, n_steps):
+        board = self.g.Storyboard(n_players, n_steps, self.frames)
+        for i in range(self.frames):
+            board.capture(self.pos, self.visible, self.safe, self.broken, f"Turn {i % 16}", "")
+        board.as_state()
+
+    def time_survival_mc(self, n_players, n_steps):
+        self.g.bridge_survival_mc(n_steps, n_players, n_bridges=100_000)
+
+
+class Game5Build:
+    """The real storyboard, built when the script is executed."""
+
+    def time_build(self):
+        fresh_game(5)
@@ -0,0 +1,61 @@
+# ============================================
+# Squid Game - Draw and encode benchmarks
+# ============================================
+# The two halves of a rendered frame, timed apart on the same sample of frames
+# (up to 16, spread over the animation): matplotlib drawing into the RGBA
+# buffer, then turning that buffer into GIF / APNG bytes.
+
+from .common import GAMES, frame_images, game, render_frames, sample_frames
+
+
+class Draw:
+    """draw(i) + rasterization of the sampled frames (BLIT games restore the background)."""
+    params = list(GAMES)
+    param_names = ["game"]
+
+    def setup(self, n):
+        self.game = game(n)
+        state = self.game.simulate()
+        self.fig, self.draw = self.game.build_figure(state)
+        self.frames = sample_frames(state["n_frames"])
+
+    def teardown(self, n):
+        import matplotlib.pyplot as plt
+        plt.close(self.fig)
+
+    def time_draw(self, n):
+        for _ in frame_images(self.fig, self.draw, self.frames, getattr(self.game, "BLIT", False)):
+            pass
+
+
+class BuildFigure:
+    """Static artists of every game (paid once per rendering process)."""
+    params = list(GAMES)
+    param_names = ["game"]
+
+    def setup(self, n):
+        self.game = game(n)
+        self.state = self.game.simulate()
+
+    def time_build_figure(self, n):
+        import matplotlib.pyplot as plt
+        fig, _ = self.game.build_figure(self.state)
+        plt.close(fig)
+
+
+class Encode:
+    """encode_payload() of the sampled frames, each one against the frame before it."""
+    params = (list(GAMES), ["gif", "apng"])
+    param_names = ["game", "format"]
+
+    def setup(self, n, fmt):
+        g = game(n)
+        state = g.simulate()
+        self.images = render_frames(g, state, sample_frames(state["n_frames"]))
+
+    def time_encode(self, n, fmt):
+        from frame_writer import encode_payload
+        prev = None
+        for rgba in self.images:
+            encode_payload(fmt, rgba, prev)
+            prev = rgba
@@ -0,0 +1,50 @@
+# ============================================
+# Squid Game - Scraper parse benchmarks (no network)
+# ============================================
+# Parses pages saved with `player info scrapper.py --save-html DIR` when
+# SQUID_BENCH_CORPUS=DIR is set; otherwise the pages wiki_standin.py generates,
+# shaped like the wiki's player pages (big page chrome around one portable infobox).
+
+import os
+
+from .common import scraper
+from .wiki_standin import make_page, make_wikitext
+
+CORPUS_DIR = os.environ.get("SQUID_BENCH_CORPUS")
+N_PAGES = 20
+
+
+def corpus():
+    s = scraper()
+    if CORPUS_DIR:
+        return s.load_corpus(CORPUS_DIR)
+    base = s.PAGE_URL.rsplit("/wiki/", 1)[0]
+    return [(f"{base}/wiki/Player_{n:03d}_(33rd_Squid_Game)", make_page(n)) for n in range(1, N_PAGES + 1)]
+
+
+class ParseHtml:
+    """Records out of the corpus pages: page-wide selectors vs the single-pass infobox parser."""
+    params = ["selectors", "single-pass"]
+    param_names = ["parser"]
+
+    def setup(self, parser):
+        s = scraper()
+        self.parse = s.parse_player_soup if parser == "selectors" else s.parse_player
+        self.pages = corpus()
+
+    def time_parse(self, parser):
+        for url, html in self.pages:
+            self.parse(html, url)
+
+
+class ParseWikitext:
+    """The api backend's parse: infobox parameters of N_PAGES wikitexts, each value cleaned."""
+
+    def setup(self):
+        self.s = scraper()
+        self.texts = [make_wikitext(n) for n in range(1, N_PAGES + 1)]
+
+    def time_parse(self):
+        for text in self.texts:
+            for value in self.s.infobox_params(text).values():
+                self.s.clean_wikitext(value)
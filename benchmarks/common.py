@@ -0,0 +1,52 @@
+# ============================================
+# Squid Game - Benchmark helpers (shared by the bench_* modules)
+# ============================================
+# The bench_* modules follow asv's conventions: classes with `params` /
+# `param_names`, a `setup(*params)` that is not timed, `time_*` methods that
+# are, and an optional `teardown`. benchmarks/run.py discovers and times them.
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("MPLBACKEND", "Agg")   # draw benchmarks never open a window
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))  # the game scripts import the shared modules next to them
+
+from parallel_render import frame_images, load_game
+
+GAMES = range(1, 6)
+
+
+def game(n):
+    """Game script `n`, imported once per process."""
+    return load_game(REPO / f"simulation game {n}.py")
+
+
+def fresh_game(n):
+    """Game script `n` executed again from scratch (for work done at import time)."""
+    path = REPO / f"simulation game {n}.py"
+    spec = importlib.util.spec_from_file_location(f"squid_bench_game_{n}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def scraper():
+    return load_game(REPO / "player info scrapper.py")
+
+
+def sample_frames(n_frames, count=16):
+    """Up to `count` frame indices spread over the whole animation."""
+    return range(0, n_frames, max(1, n_frames // count))
+
+
+def render_frames(g, state, frames):
+    """Copies of the RGBA buffers of `frames` (what the encoders receive)."""
+    import matplotlib.pyplot as plt
+    fig, draw = g.build_figure(state)
+    images = [rgba.copy() for rgba in frame_images(fig, draw, frames, getattr(g, "BLIT", False))]
+    plt.close(fig)
+    return images
@@ -0,0 +1,189 @@
+# ============================================
+# Squid Game - Benchmark runner
+# ============================================
+# Times every time_* method of the benchmarks/bench_*.py classes (asv layout:
+# params / param_names / setup / teardown) for each parameter combination and
+# stores the result per commit (merged into earlier runs of that commit), so
+# two commits can be compared later:
+#
+#   benchmarks/results/<commit>.json     (<commit>-dirty.json for uncommitted trees)
+#
+# Each sample repeats the call until it takes at least --min-time; the best
+# and median per-call times of --repeat samples are kept.
+#
+# Usage:
+#   python benchmarks/run.py                        # everything, saved for HEAD
+#   python benchmarks/run.py -b Game1 -b Encode     # names containing a pattern
+#   python benchmarks/run.py --quick                # a single sample each, nothing saved
+#   python benchmarks/run.py --compare 3f0f171 HEAD # ratios; exits 1 on a regression
+
+import argparse
+import importlib
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))  # `benchmarks` is imported as a package
+
+RESULTS_DIR = HERE / "results"
+
+
+def git(*args):
+    return subprocess.run(["git", *args], cwd=HERE.parent, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def commit_id():
+    """Short hash of HEAD, suffixed with -dirty when tracked files have uncommitted changes."""
+    dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], cwd=HERE.parent).returncode != 0
+    return git("rev-parse", "--short", "HEAD") + ("-dirty" if dirty else "")
+
+
+# ----------------------
+# Discovery
+# ----------------------
+def discover(patterns=()):
+    """[(name, class, method name)] of every benchmark whose name contains one of `patterns`."""
+    found = []
+    for path in sorted(HERE.glob("bench_*.py")):
+        module = importlib.import_module(f"benchmarks.{path.stem}")
+        for cls in vars(module).values():
+            if not isinstance(cls, type) or cls.__module__ != module.__name__:
+                continue
+            for attr in sorted(a for a in dir(cls) if a.startswith("time_")):
+                name = f"{path.stem}.{cls.__name__}.{attr}"
+                if not patterns or any(p in name for p in patterns):
+                    found.append((name, cls, attr))
+    return found
+
+
+def param_grid(cls):
+    """[(label, args)] for every combination of the class's params."""
+    names = list(getattr(cls, "param_names", []))
+    if not names:
+        return [("", ())]
+    params = getattr(cls, "params")
+    axes = params if len(names) > 1 else [params]
+    return [(", ".join(f"{n}={v}" for n, v in zip(names, combo)), combo) for combo in itertools.product(*axes)]
+
+
+# ----------------------
+# Timing
+# ----------------------
+def time_call(fn, args, repeat, min_time):
+    t0 = time.perf_counter()
+    fn(*args)                                   # warm-up; also sizes the samples
+    first = time.perf_counter() - t0
+    number = max(1, int(min_time / first)) if first > 0 else 1
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn(*args)
+        samples.append((time.perf_counter() - t0) / number)
+    return {"min": min(samples), "median": statistics.median(samples), "number": number, "repeat": repeat}
+
+
+def run_benchmark(cls, attr, args, repeat, min_time):
+    bench = cls()
+    if hasattr(bench, "setup"):
+        bench.setup(*args)
+    try:
+        return time_call(getattr(bench, attr), args, repeat, min_time)
+    finally:
+        if hasattr(bench, "teardown"):
+            bench.teardown(*args)
+
+
+def run_all(patterns=(), repeat=5, min_time=0.1):
+    results = {}
+    for name, cls, attr in discover(patterns):
+        for label, args in param_grid(cls):
+            try:
+                res = run_benchmark(cls, attr, args, repeat, min_time)
+            except NotImplementedError:         # asv convention: setup opts out of this combination
+                continue
+            except Exception as e:
+                res = {"error": f"{type(e).__name__}: {e}"}
+            results.setdefault(name, {})[label] = res
+            shown = res["error"] if "error" in res else f"{format_time(res['min'])}  (median {format_time(res['median'])})"
+            print(f"{name}({label})  {shown}", flush=True)
+    return results
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:7.2f}{unit}"
+    return f"{seconds / 1e-9:7.2f}ns"
+
+
+# ----------------------
+# Results
+# ----------------------
+def save(results):
+    import numpy as np
+    RESULTS_DIR.mkdir(exist_ok=True)
+    commit = commit_id()
+    path = RESULTS_DIR / f"{commit}.json"
+    stored = json.loads(path.read_text())["benchmarks"] if path.is_file() else {}
+    for name, by_params in results.items():     # a -b run only replaces what it measured
+        stored.setdefault(name, {}).update(by_params)
+    with open(path, "w") as f:
+        json.dump({"commit": commit, "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                   "machine": platform.node(), "python": platform.python_version(), "numpy": np.__version__,
+                   "benchmarks": stored}, f, indent=1)
+    return path
+
+
+def load(ref):
+    """Results of a file path, or of a commit (anything git rev-parse accepts)."""
+    path = Path(ref)
+    if not path.is_file():
+        path = RESULTS_DIR / f"{git('rev-parse', '--short', ref)}.json"
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(old, new, threshold=0.1):
+    """Print new/old best times per benchmark; returns the number of regressions."""
+    print(f"{old['commit']} -> {new['commit']}")
+    if old.get("machine") != new.get("machine"):
+        print(f"warning: measured on different machines ({old.get('machine')} / {new.get('machine')})")
+    regressions = 0
+    for name in sorted(set(old["benchmarks"]) & set(new["benchmarks"])):
+        for label in sorted(set(old["benchmarks"][name]) & set(new["benchmarks"][name])):
+            a, b = old["benchmarks"][name][label], new["benchmarks"][name][label]
+            if "min" not in a or "min" not in b:
+                continue
+            ratio = b["min"] / a["min"]
+            mark = "+" if ratio > 1 + threshold else "-" if ratio < 1 / (1 + threshold) else " "
+            regressions += mark == "+"
+            print(f"{mark} {format_time(a['min'])} {format_time(b['min'])} {ratio:6.2f}x  {name}({label})")
+    print(f"{regressions} regression(s) above {threshold:.0%}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Squid Game benchmarks - time, store and compare per commit")
+    parser.add_argument("-b", "--bench", action="append", default=[], metavar="PATTERN",
+                        help="only benchmarks whose name contains PATTERN (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per benchmark (default: 5)")
+    parser.add_argument("--min-time", type=float, default=0.1, help="seconds per sample (default: 0.1)")
+    parser.add_argument("--quick", action="store_true", help="a single sample per benchmark, results not saved")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two stored runs (commits or files)")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slow-down reported as regression (default: 0.1)")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(load(args.compare[0]), load(args.compare[1]), args.threshold) else 0)
+    if args.quick:
+        run_all(args.bench, repeat=1, min_time=0)
+    else:
+        print(f"Saved {save(run_all(args.bench, args.repeat, args.min_time))}")
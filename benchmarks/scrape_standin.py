@@ -0,0 +1,83 @@
+# ============================================
+# Squid Game - Scraper fetch benchmark against the local wiki stand-in
+# ============================================
+# Scrapes the same players from wiki_standin.py (artificial latency, injected
+# 503s) with every backend and reports wall time, throughput and requests:
+#
+#   sequential   the original loop: one page at a time, a new connection for each
+#   concurrent   scrape_all_players(): pooled session, bounded parallelism, retries
+#   pipeline     scrape_pipeline(): fetch threads feeding a parse process pool
+#   api          scrape_all_players_api(): api.php batches of 50 titles
+#
+# The api backend reads generated wikitext, so with --corpus its records differ.
+#
+# Usage:
+#   python benchmarks/scrape_standin.py                          # 60 players, 50 ms, 3% 503s
+#   python benchmarks/scrape_standin.py --players 456 --latency 0.1 --corpus saved_pages/
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # `benchmarks` is imported as a package
+
+from benchmarks.common import scraper
+from benchmarks.wiki_standin import TITLE, WikiStandin, players_df
+
+
+def run_backends(wiki, n_players, concurrency=8, backends=("sequential", "concurrent", "pipeline", "api")):
+    """{backend: (records DataFrame, seconds, requests made)} for the first `n_players`."""
+    s = scraper()
+    df = players_df(n_players, wiki)
+    limiter = lambda: s.HostLimiter(per_host=concurrency, interval=0.0)   # the stand-in needs no politeness
+    runs = {
+        "sequential": lambda: pd.DataFrame([r for r in map(s.scrape_player, df["URL"]) if r]),
+        "concurrent": lambda: s.scrape_all_players(df, concurrency, limiter=limiter()),
+        "pipeline": lambda: s.scrape_pipeline(df, concurrency, limiter=limiter())[0],
+        "api": lambda: s.scrape_all_players_api(df, api_url=wiki.api_url, limiter=limiter()),
+    }
+    results = {}
+    for name in backends:
+        before = len(wiki.requests)
+        with contextlib.redirect_stdout(io.StringIO()):   # per-page progress lines
+            t0 = time.perf_counter()
+            records = runs[name]()
+            seconds = time.perf_counter() - t0
+        results[name] = (records, seconds, len(wiki.requests) - before)
+    return results
+
+
+def report(results, n_players):
+    first = None
+    for name, (records, seconds, n_requests) in results.items():
+        rows = records.sort_values("Url", ignore_index=True)
+        first = rows if first is None else first
+        same = "same records" if rows.equals(first) else "RECORDS DIFFER"
+        print(f"{name:>11}: {len(records):4d}/{n_players} records {seconds:7.2f}s "
+              f"({len(records) / seconds:6.1f} pages/s) {n_requests:5d} requests  {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scraper backends against a local wiki stand-in")
+    parser.add_argument("--players", type=int, default=60, help="pages to scrape (default: 60)")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per response (default: 0.05)")
+    parser.add_argument("--error-rate", type=float, default=0.03, help="share of 503 responses (default: 0.03)")
+    parser.add_argument("--concurrency", type=int, default=8, help="pages in flight (default: 8)")
+    parser.add_argument("--corpus", metavar="DIR", help="serve pages saved with --save-html instead of generated ones")
+    parser.add_argument("--backend", action="append", choices=["sequential", "concurrent", "pipeline", "api"],
+                        help="only these backends (repeatable; default: all)")
+    args = parser.parse_args()
+
+    pages = None
+    if args.corpus:
+        pages = {int(TITLE.search(url).group(1)): html for url, html in scraper().load_corpus(args.corpus)}
+    with WikiStandin(args.players, args.latency, args.error_rate, pages=pages) as wiki:
+        results = run_backends(wiki, args.players, args.concurrency,
+                               tuple(args.backend or ("sequential", "concurrent", "pipeline", "api")))
+    print(f"{args.players} players, {args.latency * 1e3:.0f} ms latency, {args.error_rate:.0%} 503s")
+    report(results, args.players)
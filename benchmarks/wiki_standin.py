@@ -0,0 +1,246 @@
+# ============================================
+# Squid Game - Local stand-in for the Fandom wiki
+# ============================================
+# A threaded HTTP server on 127.0.0.1 that answers what the scraper asks the
+# real wiki, so fetching can be benchmarked and tested without the network:
+#
+#   /wiki/Player_XXX_(33rd_Squid_Game)   rendered player page (generated, or
+#                                         saved with --save-html)
+#   /api.php                              revisions|pageimages batches (with
+#                                         continuation, redirects, missing
+#                                         pages) and imageinfo lookups
+#   /images/pXXX.png                      the infobox images
+#
+# Every response waits `latency` seconds and fails with a 503 at `error_rate`;
+# pages and images carry an ETag and answer If-None-Match with a 304.
+#
+# The generated page and wikitext of a player hold the same values, so the
+# html and api backends must produce identical records from them.
+#
+# Usage:
+#   with WikiStandin(latency=0.05, error_rate=0.03) as wiki:
+#       df = players_df(60, wiki)
+#       scraper.scrape_all_players(df)
+
+import hashlib
+import html as html_lib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .common import scraper
+
+# (wikitext, rendered html) of one infobox value; both read as the same text
+VALUES = [
+    ("{f} of {n:03d}", "{f} of {n:03d}"),
+    ("[[X|Link & {f}]] and more", '<a href="/wiki/X">Link &amp; {f}</a> and more'),
+    ("A<br>B <!-- c --> {n}", "A<br>B <!-- c --> {n}"),
+    ("'''Bold''' ''it''", "<b>Bold</b> <i>it</i>"),
+    ('<span> spaced </span> "q"', "<span> spaced </span> &quot;q&quot;"),
+    ("{{{{Game|Red Light}}}} round {n}", '<a href="/wiki/Red_Light">Red Light</a> round {n}'),
+]
+TITLE = re.compile(r"Player[ _](\d+)")
+
+
+def value(field, n, rendered):
+    return VALUES[(n + len(field)) % len(VALUES)][rendered].format(f=field, n=n)
+
+
+def image_name(n):
+    return f"p{n:03d}.png"
+
+
+def make_page(n, image_base="https://static.example/images"):
+    """A player page whose infobox fills every data-source the scraper reads."""
+    rows = "".join(
+        f'<div class="pi-item pi-data pi-border-color" data-source="{f}"><h3 class="pi-data-label">{f.title()}</h3>'
+        f'<div class="pi-data-value pi-font">{value(f, n, True)}</div></div>'
+        for f in scraper().FIELDS)
+    chrome = "".join(f'<div class="nav-item"><a href="/wiki/Link_{i}">Link {i}</a><p>{"lorem ipsum " * 20}</p></div>'
+                     for i in range(400))
+    src = html_lib.escape(f"{image_base}/{image_name(n)}?cb=1&x=2")
+    return (f'<!DOCTYPE html><html><head><title>Player {n:03d}</title><script>{"var x=1;" * 2000}</script></head>'
+            f'<body><header>{chrome}</header><main><aside class="portable-infobox pi-background">'
+            f'<h2 class="pi-item pi-title" data-source="title">Player {n:03d}</h2>'
+            f'<figure class="pi-item pi-image" data-source="image"><a href="#">'
+            f'<img src="{src}" alt="p"></a></figure>'
+            f'<section class="pi-item pi-group">{rows}</section></aside>'
+            f'<div class="mw-parser-output">{"<p>story <a href=#>x</a></p>" * 300}</div></main>'
+            f'<footer>{chrome}</footer></body></html>')
+
+
+def make_wikitext(n):
+    params = "".join(f"\n| {f} = {value(f, n, False)}" for f in scraper().FIELDS)
+    return (f"'''Player {n:03d}''' is a player.\n{{{{Character Infobox\n| image = [[File:{image_name(n)}|250px]]"
+            f"{params}\n}}}}\n" + "Story text. " * 500)
+
+
+def players_df(n_players, wiki):
+    """generate_urls() of the first `n_players`, pointed at the stand-in."""
+    df = scraper().generate_players(n_players)
+    return df.assign(URL=df["Player Number"].astype(int).map(wiki.page_url.format))
+
+
+class WikiStandin:
+    """The stand-in server; start()/stop() or use it as a context manager.
+
+    `pages` ({player number: html}) replaces the generated pages, e.g. with
+    load_corpus() of a --save-html directory. In api.php, `redirects` are
+    player numbers whose title redirects, `missing` ones have no page and
+    `no_pageimage` ones only resolve their image through imageinfo.
+    """
+
+    def __init__(self, n_players=456, latency=0.0, error_rate=0.0, seed=0, pages=None,
+                 redirects=(), missing=(), no_pageimage=(), api_page_size=30):
+        self.n_players, self.latency, self.error_rate = n_players, latency, error_rate
+        self.pages, self.api_page_size = pages, api_page_size
+        self.redirects, self.missing, self.no_pageimage = set(redirects), set(missing), set(no_pageimage)
+        self.requests = []          # (path, query dict, status) of every request
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._server = None
+
+    # ---------- lifecycle ----------
+    def start(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive, so pooled sessions reuse connections
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                standin._handle(self)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def page_url(self):
+        return self.base_url + "/wiki/Player_{:03d}_(33rd_Squid_Game)"
+
+    @property
+    def api_url(self):
+        return self.base_url + "/api.php"
+
+    def image_url(self, n):
+        return f"{self.base_url}/images/{image_name(n)}?cb=1&x=2"
+
+    def count(self, path_prefix="/", status=None):
+        with self._lock:
+            return sum(p.startswith(path_prefix) and status in (None, s) for p, _, s in self.requests)
+
+    # ---------- content ----------
+    def _page(self, n):
+        if self.pages is not None:
+            page = self.pages.get(n)
+            return page.encode() if isinstance(page, str) else page
+        if n not in self._cache:
+            self._cache[n] = make_page(n, self.base_url + "/images").encode()
+        return self._cache[n]
+
+    def _image(self, n):
+        return hashlib.sha256(f"image {n}".encode()).digest() * 256   # 8 KB, distinct per player
+
+    def _api(self, q):
+        titles = q.get("titles", "").split("|")
+        query = {"pages": []}
+        if q.get("prop") == "imageinfo":
+            for title in titles:
+                m = re.fullmatch(r"File:p(\d+)\.png", title)
+                page = {"title": title}
+                if m and 1 <= int(m.group(1)) <= self.n_players:
+                    page["imageinfo"] = [{"url": self.image_url(int(m.group(1)))}]
+                else:
+                    page["missing"] = True
+                query["pages"].append(page)
+            return {"query": query}
+
+        start = int(q.get("rvcontinue", 0))
+        query["normalized"] = [{"from": t, "to": t.replace("_", " ")} for t in titles if "_" in t]
+        query["redirects"] = []
+        for i, title in enumerate(titles):
+            title = title.replace("_", " ")
+            m = TITLE.match(title)
+            n = int(m.group(1)) if m else None
+            if n is not None and n in self.redirects:
+                query["redirects"].append({"from": title, "to": f"Player {n:03d}"})
+                title = f"Player {n:03d}"
+            if not start <= i < start + self.api_page_size:
+                continue                       # only api_page_size pages per response: continue
+            if n is None or n in self.missing or not 1 <= n <= self.n_players:
+                query["pages"].append({"title": title, "missing": True})
+                continue
+            page = {"title": title, "revisions": [{"slots": {"main": {"content": make_wikitext(n)}}}]}
+            if n not in self.no_pageimage:
+                page["original"] = {"source": self.image_url(n)}
+            query["pages"].append(page)
+        data = {"query": query}
+        if start + self.api_page_size < len(titles):
+            data["continue"] = {"rvcontinue": str(start + self.api_page_size), "continue": "||"}
+        return data
+
+    # ---------- HTTP ----------
+    def _handle(self, req):
+        time.sleep(self.latency)
+        parts = urlsplit(req.path)
+        path = unquote(parts.path)
+        q = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        with self._lock:
+            fail = self._rng.random() < self.error_rate
+        body, ctype = None, "text/html; charset=utf-8"
+        if not fail:
+            m = TITLE.search(path)
+            if path == "/api.php":
+                body, ctype = json.dumps(self._api(q)).encode(), "application/json"
+            elif path.startswith("/wiki/") and m:
+                body = self._page(int(m.group(1)))
+            elif path.startswith("/images/"):
+                n = re.fullmatch(r"/images/p(\d+)\.png", path)
+                body, ctype = (self._image(int(n.group(1))) if n else None), "image/png"
+
+        if fail:
+            status, body = 503, b""
+        elif body is None:
+            status, body = 404, b"not found"
+        else:
+            status = 200
+        etag = f'"{hashlib.md5(body).hexdigest()}"' if status == 200 and path != "/api.php" else None
+        if etag is not None and req.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+        with self._lock:
+            self.requests.append((path, q, status))
+
+        req.send_response(status)
+        if status == 503:
+            req.send_header("Retry-After", "0")
+        if etag is not None:
+            req.send_header("ETag", etag)
+        req.send_header("Content-Type", ctype)
+        req.send_header("Content-Length", str(len(body)))
+        req.end_headers()
+        req.wfile.write(body)
@@ -0,0 +1,341 @@
+# ============================================
+# Squid Game - Streaming frame output (shared by all games)
+# ============================================
+# matplotlib's "pillow" writer keeps every rendered frame in memory and only
+# quantizes + writes them when the animation ends. The encoders below write
+# each frame as soon as it is grabbed, so memory stays at ~2 frames no matter
+# how long the animation is.
+#
+#   .gif          -> GifEncoder   (Pillow, one adaptive palette per changed box)
+#   .png / .apng  -> ApngEncoder  (pure Python + zlib, changed box only)
+#   .webp / .mp4  -> FfmpegEncoder (raw RGBA piped into a local ffmpeg)
+#
+# Usage:
+#   ani.save("game.gif", writer=StreamingWriter(fps=FPS))
+#   with open_encoder("game.mp4", fps=FPS) as enc:
+#       for rgba in frames: enc.write(rgba)
+
+import hashlib
+import io
+import shutil
+import struct
+import subprocess
+import tempfile
+import zlib
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from matplotlib.animation import AbstractMovieWriter
+
+ENCODER_VERSION = 1
+
+# GIF delays (1/100 s) and APNG delays (1/1000 s) are uint16: longer holds are split
+MAX_DELAY = 0xFFFF
+
+FORMATS = {".gif": "gif", ".png": "apng", ".apng": "apng", ".webp": "webp", ".mp4": "mp4"}
+
+
+def format_for(path):
+    fmt = FORMATS.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Unsupported output '{path}' (use one of {', '.join(sorted(FORMATS))})")
+    return fmt
+
+
+def frame_digest(rgba):
+    """Cheap identity of a frame, used to merge repeated frames into one longer frame."""
+    return hashlib.blake2b(np.ascontiguousarray(rgba), digest_size=16).digest()
+
+
+def changed_box(rgba, prev):
+    """(x0, y0, x1, y1) of the pixels that differ from `prev` (whole frame if prev is None)."""
+    h, w = rgba.shape[:2]
+    if prev is None:
+        return 0, 0, w, h
+    diff = np.any(rgba != prev, axis=2)
+    rows, cols = np.flatnonzero(diff.any(axis=1)), np.flatnonzero(diff.any(axis=0))
+    if len(rows) == 0:
+        return 0, 0, 1, 1
+    return cols[0], rows[0], cols[-1] + 1, rows[-1] + 1
+
+
+# ----------------------
+# GIF
+# ----------------------
+def _gif_frame_block(rgba, offset=(0, 0)):
+    """Quantize one frame and return its image descriptor + local palette + LZW data."""
+    im = Image.fromarray(np.ascontiguousarray(rgba[..., :3])).convert("P", palette=Image.Palette.ADAPTIVE)
+    buf = io.BytesIO()
+    im.save(buf, format="GIF")
+    data = buf.getvalue()
+
+    # Re-use the single-frame GIF: its global color table becomes our local one
+    flags = data[10]
+    table = 3 * 2 ** ((flags & 7) + 1) if flags & 0x80 else 0
+    palette = data[13:13 + table]
+    i = 13 + table
+    while data[i] == 0x21:          # skip extensions Pillow may have written
+        i += 2
+        while data[i]:
+            i += data[i] + 1
+        i += 1
+    descriptor = bytearray(data[i:i + 10])
+    descriptor[1:5] = struct.pack("<HH", *offset)
+    if descriptor[9] & 0x80:        # already carries a local color table
+        return bytes(descriptor) + data[i + 10:-1]
+    descriptor[9] |= (0x80 | (flags & 7)) if table else 0
+    return bytes(descriptor) + palette + data[i + 10:-1]   # drop the ';' trailer
+
+
+class GifEncoder:
+    def __init__(self, path, fps, loop=0):
+        self.fp = open(path, "wb")
+        self.delay_ms = 1000 / fps
+        self.loop = loop
+        self.size = None
+        self._pending = None   # [digest, block, n_frames]
+        self._prev = None
+
+    @staticmethod
+    def encode(rgba, prev=None):
+        """Only the box that changed since `prev` is stored; the rest shows through."""
+        x0, y0, x1, y1 = changed_box(rgba, prev)
+        return frame_digest(rgba), rgba.shape[1::-1], _gif_frame_block(rgba[y0:y1, x0:x1], (x0, y0))
+
+    def append(self, payload):
+        digest, size, block = payload
+        if self.size is None:
+            self.size = size
+            self.fp.write(b"GIF89a" + struct.pack("<HHBBB", *size, 0, 0, 0))
+            self.fp.write(b"!\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", self.loop) + b"\x00")
+        elif size != self.size:
+            raise ValueError(f"frame size {size} != {self.size}")
+        # a repeat lengthens the held frame while its delay still fits the uint16 field
+        if (self._pending is not None and self._pending[0] == digest
+                and round(self.delay_ms * (self._pending[2] + 1) / 10) <= MAX_DELAY):
+            self._pending[2] += 1
+            return
+        self._flush()
+        self._pending = [digest, block, 1]
+
+    def write(self, rgba):
+        self.append(self.encode(rgba, self._prev))
+        self._prev = np.array(rgba)
+
+    def _flush(self):
+        if self._pending is None:
+            return
+        _, block, n = self._pending
+        delay_cs = int(round(self.delay_ms * n / 10))
+        self.fp.write(b"!\xf9\x04\x00" + struct.pack("<H", delay_cs) + b"\x00\x00")
+        self.fp.write(block)
+        self._pending = None
+
+    def close(self):
+        self._flush()
+        self.fp.write(b";")
+        self.fp.close()
+
+
+# ----------------------
+# APNG
+# ----------------------
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+class ApngEncoder:
+    def __init__(self, path, fps, loop=0, level=6):
+        self.fp = open(path, "wb")
+        self.delay_ms = int(round(1000 / fps))
+        self.loop = loop
+        self.level = level
+        self.size = None
+        self.n_frames = 0
+        self.seq = 0
+        self._actl_at = None
+        self._pending = None   # [digest, box, zdata, n_frames]
+        self._prev = None
+
+    @staticmethod
+    def encode(rgba, prev=None, level=6):
+        """Deflate the box that changed since `prev`; the first frame is always whole."""
+        box = changed_box(rgba, prev)
+        x0, y0, x1, y1 = box
+        rgb = np.ascontiguousarray(rgba[y0:y1, x0:x1, :3])
+        h, w = rgb.shape[:2]
+        rows = rgb.reshape(h, w * 3)
+        up = np.empty((h, w * 3 + 1), dtype=np.uint8)
+        up[:, 0] = 2                                  # PNG "Up" filter on every row
+        up[0, 1:] = rows[0]
+        up[1:, 1:] = rows[1:] - rows[:-1]             # uint8 wrap-around is the PNG rule
+        return frame_digest(rgba), rgba.shape[1::-1], box, zlib.compress(up.tobytes(), level)
+
+    def append(self, payload):
+        digest, size, box, zdata = payload
+        if self.size is None:
+            self.size = size
+            self.fp.write(b"\x89PNG\r\n\x1a\n")
+            self.fp.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", *size, 8, 2, 0, 0, 0)))
+            self._actl_at = self.fp.tell()
+            self.fp.write(_png_chunk(b"acTL", struct.pack(">II", 0, self.loop)))
+        elif size != self.size:
+            raise ValueError(f"frame size {size} != {self.size}")
+        # a repeat lengthens the held frame while its delay still fits the uint16 field
+        if (self._pending is not None and self._pending[0] == digest
+                and self.delay_ms * (self._pending[3] + 1) <= MAX_DELAY):
+            self._pending[3] += 1
+            return
+        self._flush()
+        self._pending = [digest, box, zdata, 1]
+
+    def write(self, rgba):
+        self.append(self.encode(rgba, self._prev, self.level))
+        self._prev = np.array(rgba)
+
+    def _flush(self):
+        if self._pending is None:
+            return
+        _, (x0, y0, x1, y1), zdata, n = self._pending
+        self.fp.write(_png_chunk(b"fcTL", struct.pack(">IIIIIHHBB", self.seq, x1 - x0, y1 - y0, x0, y0,
+                                                      self.delay_ms * n, 1000, 0, 0)))
+        self.seq += 1
+        if self.n_frames == 0:
+            self.fp.write(_png_chunk(b"IDAT", zdata))
+        else:
+            self.fp.write(_png_chunk(b"fdAT", struct.pack(">I", self.seq) + zdata))
+            self.seq += 1
+        self.n_frames += 1
+        self._pending = None
+
+    def close(self):
+        self._flush()
+        self.fp.write(_png_chunk(b"IEND", b""))
+        # the frame count is only known now: patch it into acTL
+        if self._actl_at is not None:
+            self.fp.seek(self._actl_at)
+            self.fp.write(_png_chunk(b"acTL", struct.pack(">II", self.n_frames, self.loop)))
+        self.fp.close()
+
+
+# ----------------------
+# ffmpeg (WebP / MP4)
+# ----------------------
+FFMPEG_ARGS = {
+    "webp": ["-c:v", "libwebp", "-lossless", "0", "-quality", "80", "-loop", "0"],
+    "mp4":  ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+             "-movflags", "+faststart"],
+}
+
+
+class FfmpegEncoder:
+    def __init__(self, path, fps, fmt, ffmpeg="ffmpeg"):
+        self.exe = shutil.which(ffmpeg)
+        if self.exe is None:
+            raise RuntimeError(f"'{ffmpeg}' not found on PATH; it is needed for .{fmt} output")
+        self.path, self.fps, self.fmt = str(path), fps, fmt
+        self.size = None
+        self.proc = None
+        self._log = tempfile.TemporaryFile()
+
+    @staticmethod
+    def encode(rgba):
+        return rgba.shape[1::-1], np.ascontiguousarray(rgba, dtype=np.uint8).tobytes()
+
+    def append(self, payload):
+        size, raw = payload
+        if self.proc is None:
+            self.size = size
+            cmd = [self.exe, "-y", "-loglevel", "error",
+                   "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{size[0]}x{size[1]}", "-r", str(self.fps),
+                   "-i", "-", *FFMPEG_ARGS[self.fmt], self.path]
+            self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=self._log)
+        elif size != self.size:
+            raise ValueError(f"frame size {size} != {self.size}")
+        self.proc.stdin.write(raw)
+
+    def write(self, rgba):
+        self.append(self.encode(rgba))
+
+    def close(self):
+        if self.proc is not None:
+            self.proc.stdin.close()
+            if self.proc.wait() != 0:
+                self._log.seek(0)
+                raise RuntimeError(f"ffmpeg failed for {self.path}: {self._log.read().decode(errors='replace')}")
+        self._log.close()
+
+
+# ----------------------
+# Entry points
+# ----------------------
+def open_encoder(path, fps):
+    fmt = format_for(path)
+    if fmt == "gif":
+        return _Encoding(GifEncoder(path, fps))
+    if fmt == "apng":
+        return _Encoding(ApngEncoder(path, fps))
+    return _Encoding(FfmpegEncoder(path, fps, fmt))
+
+
+def encode_payload(fmt, rgba, prev=None):
+    """The CPU-heavy half of writing a frame; safe to run in worker processes.
+
+    `prev` is the frame before this one (None for the first frame of a chunk).
+    """
+    if fmt == "gif":
+        return GifEncoder.encode(rgba, prev)
+    if fmt == "apng":
+        return ApngEncoder.encode(rgba, prev)
+    return FfmpegEncoder.encode(rgba)
+
+
+class _Encoding:
+    """Context-manager wrapper: write(rgba) / append(payload) / close()."""
+
+    def __init__(self, encoder):
+        self.encoder = encoder
+        self.n_frames = 0
+
+    def write(self, rgba):
+        self.encoder.write(rgba)
+        self.n_frames += 1
+
+    def append(self, payload):
+        self.encoder.append(payload)
+        self.n_frames += 1
+
+    def close(self):
+        self.encoder.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StreamingWriter(AbstractMovieWriter):
+    """Drop-in `writer=` for Animation.save() that encodes each frame as it is grabbed."""
+
+    def __init__(self, fps=5, metadata=None, codec=None, bitrate=None):
+        super().__init__(fps=fps, metadata=metadata, codec=codec, bitrate=bitrate)
+        self._enc = None
+
+    @classmethod
+    def isAvailable(cls):
+        return True
+
+    def setup(self, fig, outfile, dpi=None):
+        super().setup(fig, outfile, dpi=dpi)
+        self._enc = open_encoder(outfile, self.fps)
+
+    def grab_frame(self, **savefig_kwargs):
+        buf = io.BytesIO()
+        self.fig.savefig(buf, **{**savefig_kwargs, "format": "rgba", "dpi": self.dpi})
+        w, h = self.frame_size
+        self._enc.write(np.frombuffer(buf.getbuffer(), dtype=np.uint8).reshape(h, w, 4))
+
+    def finish(self):
+        self._enc.close()
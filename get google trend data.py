@@ -3,14 +3,26 @@
 
 from pytrends.request import TrendReq
 import pandas as pd
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from time import sleep
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
+
+from trend_store import STORE_DIR, WORLD, TrendStore, ibr_to_long, to_long
 
 # ---------------------------
 # Config
 # ---------------------------
 KW_LIST = ["Squid Game"]          # keywords to track
+ANCHOR = None                     # term shared by every keyword group (default: first keyword)
+MAX_TERMS = 5                     # Google Trends compares at most 5 terms per request
 TIMEFRAME = "2025-01-01 2025-08-01"  # date range (YYYY-MM-DD YYYY-MM-DD)
 # Asia/Jakarta is UTC+7 => tz=420. (Your original code used 360 = UTC+6)
 TZ_OFFSET_MINUTES = 420
@@ -27,17 +39,40 @@ COUNTRIES = [
     "KZ","UZ","AZ","QA","KW","OM","BH","JO","LB","YE"
 ]
 
-# Output filenames (timestamped for reproducibility)
+# Outputs go to the partitioned store (trend_store.py, STORE_DIR).
+# CSV exports (export_csv=True) are timestamped; a resumed run keeps its stamp.
 STAMP = datetime.now().strftime("%Y%m%d_%H%M%S")
-FN_WORLD_IOT = f"trends_worldwide_iot_{STAMP}.csv"
-FN_IBR_COUNTRY = f"trends_interest_by_country_{STAMP}.csv"
-FN_IOT_BY_COUNTRY = f"trends_iot_by_country_{STAMP}.csv"
+
+def output_names(stamp: str = STAMP) -> Dict[str, str]:
+    return {
+        "world_iot": f"trends_worldwide_iot_{stamp}.csv",
+        "ibr_country": f"trends_interest_by_country_{stamp}.csv",
+        "iot_by_country": f"trends_iot_by_country_{stamp}.csv",
+    }
+
+# Response cache / checkpoint journal
+CACHE_PATH = "trends_cache.sqlite"
+CACHE_TTL_HOURS = 24.0       # older responses are fetched again
+CACHE_MAX_MB = 256.0         # least recently used responses are dropped beyond this
+JOURNAL_PATH = "trends_journal.jsonl"
+
+# Incremental mode: extend the per-country series already in the store
+OVERLAP_DAYS = 28            # days re-fetched with each new window to rescale it onto the stored series
 
 # Rate limiting / retries
 SLEEP_SECONDS = 1.0          # polite delay between requests
 MAX_RETRIES = 3              # per-country retries on failure
 RETRY_BACKOFF = 2.0          # exponential backoff multiplier
 
+# Concurrent fetching (shared token bucket across all sessions)
+WORKERS = 4                  # parallel sessions
+START_RATE = 1.0 / SLEEP_SECONDS   # requests/second to start with
+MIN_RATE = 0.05              # never slower than one request per 20s
+MAX_RATE = 4.0               # never faster than this, however well it goes
+RATE_STEP = 0.1              # additive speed-up per successful request
+THROTTLE_FACTOR = 0.5        # multiplicative slow-down on HTTP 429
+MAX_THROTTLED = 8            # per-country 429 retries before giving up
+
 
 # ---------------------------
 # Helpers
@@ -72,77 +107,674 @@ def fetch_interest_by_region(py: TrendReq, keywords: List[str], timeframe: str,
     return df if isinstance(df, pd.DataFrame) else pd.DataFrame()
 
 
-def fetch_iot_for_countries(py: TrendReq, keywords: List[str], timeframe: str, countries: List[str]) -> pd.DataFrame:
-    """Fetch interest-over-time series for each country in list, with retries and rate limiting."""
-    rows = []
-    for c in countries:
-        attempt = 0
-        while attempt < MAX_RETRIES:
+# ---------------------------
+# Response cache & run journal
+# ---------------------------
+class ResponseCache:
+    """SQLite cache of fetched frames keyed by (endpoint, keywords, timeframe, geo, tz).
+
+    Entries older than `ttl_hours` count as missing. Once the stored payloads
+    exceed `max_mb`, the least recently used entries are deleted.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, ttl_hours: float = CACHE_TTL_HOURS, max_mb: float = CACHE_MAX_MB):
+        self.path, self.ttl = path, ttl_hours * 3600
+        self.max_bytes = int(max_mb * 2**20)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, endpoint TEXT, keywords TEXT,"
+            " timeframe TEXT, geo TEXT, tz INTEGER, fetched REAL, used REAL, size INTEGER, payload BLOB)")
+
+    @staticmethod
+    def key(endpoint: str, keywords: List[str], timeframe: str, geo: str, tz: int) -> str:
+        return json.dumps([endpoint, list(keywords), timeframe, geo, tz])
+
+    def get(self, endpoint: str, keywords: List[str], timeframe: str, geo: str, tz: int) -> Optional[pd.DataFrame]:
+        key, now = self.key(endpoint, keywords, timeframe, geo, tz), time.time()
+        with self._lock:
+            row = self._db.execute("SELECT fetched, payload FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[0] > self.ttl:
+                return None
+            self._db.execute("UPDATE responses SET used = ? WHERE key = ?", (now, key))
+        return pickle.loads(row[1])
+
+    def put(self, endpoint: str, keywords: List[str], timeframe: str, geo: str, tz: int, df: pd.DataFrame) -> None:
+        payload, now = pickle.dumps(df), time.time()
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             (self.key(endpoint, keywords, timeframe, geo, tz), endpoint, json.dumps(keywords),
+                              timeframe, geo, tz, now, now, len(payload), payload))
+            self._evict()
+
+    def get_or_fetch(self, endpoint: str, keywords: List[str], timeframe: str, geo: str, tz: int,
+                     fetch: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        df = self.get(endpoint, keywords, timeframe, geo, tz)
+        if df is None:
+            df = fetch()
+            self.put(endpoint, keywords, timeframe, geo, tz, df)
+        return df
+
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY used").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class RunJournal:
+    """Append-only JSONL checkpoint: a start line per run, one line per finished or failed step, a finish line.
+
+    A run whose last start has no finish (crash, Ctrl-C) is resumed when the
+    parameters match: it keeps its output stamp and `done` lists the steps
+    main() reloads from the store instead of fetching again.
+    """
+
+    def __init__(self, path: str = JOURNAL_PATH):
+        self.path = path
+        self.stamp: Optional[str] = None
+        self.done: set = set()
+        self.failed: Dict[str, str] = {}
+        self.resumed = False
+
+    def open(self, params: dict, resume: bool = True) -> "RunJournal":
+        last = None
+        if resume and os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:   # torn last line after a crash
+                        continue
+                    if event["event"] == "start":
+                        last = {"stamp": event["stamp"], "params": event["params"], "done": set(), "failed": {}, "open": True}
+                    elif last is not None and event["stamp"] == last["stamp"]:
+                        if event["event"] == "done":
+                            last["done"].add(event["step"]); last["failed"].pop(event["step"], None)
+                        elif event["event"] == "failed":
+                            last["failed"][event["step"]] = event.get("error", "")
+                        elif event["event"] == "finish":
+                            last["open"] = False
+        if last is not None and last["open"] and last["params"] == params:
+            self.stamp, self.done, self.failed, self.resumed = last["stamp"], last["done"], last["failed"], True
+        else:
+            self.stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self._write({"event": "start", "params": params})
+        return self
+
+    def _write(self, event: dict) -> None:
+        with open(self.path, "a") as f:
+            f.write(json.dumps({**event, "stamp": self.stamp, "at": time.time()}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record(self, step: str, error: Optional[str] = None) -> None:
+        if error is None:
+            self.done.add(step); self.failed.pop(step, None)
+            self._write({"event": "done", "step": step})
+        else:
+            self.failed[step] = error
+            self._write({"event": "failed", "step": step, "error": error})
+
+    def finish(self, **summary) -> None:
+        self._write({"event": "finish", **summary})
+
+
+# ---------------------------
+# Concurrent fetching
+# ---------------------------
+class TokenBucket:
+    """Thread-safe token bucket whose refill rate adapts to throttling (AIMD).
+
+    Every request takes one token. A success raises the rate by `step` (up to
+    `max_rate`); an HTTP 429 multiplies it by `factor` (down to `min_rate`) and
+    pauses all callers for Retry-After seconds, or one token interval.
+    """
+
+    def __init__(self, rate: float = START_RATE, burst: float = 1.0, min_rate: float = MIN_RATE,
+                 max_rate: float = MAX_RATE, step: float = RATE_STEP, factor: float = THROTTLE_FACTOR):
+        self.rate, self.burst = rate, burst
+        self.min_rate, self.max_rate = min_rate, max_rate
+        self.step, self.factor = step, factor
+        self.tokens = burst
+        self._stamp = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self._paused_until - now, (1 - self.tokens) / self.rate)
+            sleep(wait)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.step)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.factor)
+            self.tokens = min(self.tokens, 0.0)
+            self._paused_until = max(self._paused_until, now + (retry_after or 1.0 / self.rate))
+
+
+@dataclass
+class FetchStats:
+    requests: int = 0
+    cache_hits: int = 0
+    throttled: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    failed: Dict[str, str] = field(default_factory=dict)   # geo -> last error
+    final_rate: float = 0.0
+
+    @property
+    def requests_per_sec(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    def add(self, other: "FetchStats") -> "FetchStats":
+        """Accumulate a later batch into this one."""
+        for name in ("requests", "cache_hits", "throttled", "errors", "seconds"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.failed.update(other.failed)
+        self.final_rate = other.final_rate
+        return self
+
+
+def _throttle_delay(exc: Exception) -> Optional[float]:
+    """None if `exc` is not an HTTP 429, else its Retry-After in seconds (0 if absent)."""
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) != 429:
+        return None
+    try:
+        return float(response.headers.get("Retry-After", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def fetch_iot_concurrent(
+    keywords: List[str],
+    timeframe: str,
+    countries: List[str],
+    workers: int = WORKERS,
+    limiter: Optional[TokenBucket] = None,
+    session_factory: Optional[Callable[[], object]] = None,
+    fetch: Callable = fetch_interest_over_time,
+    on_result: Optional[Callable[[str, pd.DataFrame], None]] = None,
+    tz_offset_minutes: int = TZ_OFFSET_MINUTES,
+    cache: Optional[ResponseCache] = None,
+):
+    """Fetch interest over time for every country with `workers` sessions sharing one limiter.
+
+    `fetch(session, keywords, timeframe, geo)` does one request; by default a
+    pytrends TrendReq per worker thread. Swap `session_factory` + `fetch` to run
+    against a local stand-in server. Each finished geo is handed to
+    `on_result(geo, df)` as soon as it arrives (completion order, possibly
+    empty). Geos found in `cache` cost no request.
+    Returns (concatenated frame in `countries` order, FetchStats).
+    """
+    limiter = limiter or TokenBucket()
+    session_factory = session_factory or (lambda: TrendReq(hl="en-US", tz=tz_offset_minutes))
+    local = threading.local()
+    stats = FetchStats()
+    stats_lock = threading.Lock()
+
+    def count(**kw):
+        with stats_lock:
+            for k, v in kw.items():
+                setattr(stats, k, getattr(stats, k) + v)
+
+    def fetch_geo(geo: str) -> pd.DataFrame:
+        cached = cache.get("iot", keywords, timeframe, geo, tz_offset_minutes) if cache is not None else None
+        if cached is not None:
+            count(cache_hits=1)
+            return cached
+        if not hasattr(local, "session"):
+            local.session = session_factory()
+        errors = throttles = 0
+        while True:
+            limiter.acquire()
+            count(requests=1)
             try:
-                df = fetch_interest_over_time(py, keywords, timeframe, geo=c)
-                if not df.empty:
-                    # Insert geo and tidy columns
-                    df.insert(0, "geo", c)
-                    rows.append(df)
-                break  # success
+                df = fetch(local.session, keywords, timeframe, geo)
             except Exception as e:
-                attempt += 1
-                if attempt >= MAX_RETRIES:
-                    # Record a minimal row with error info (optional)
-                    # print(f"[WARN] Failed for {c} after {MAX_RETRIES} retries: {e}")
-                    pass
+                delay = _throttle_delay(e)
+                if delay is not None:
+                    count(throttled=1)
+                    limiter.on_throttle(delay or None)
+                    throttles += 1
+                    if throttles < MAX_THROTTLED:
+                        continue
                 else:
-                    sleep(SLEEP_SECONDS * (RETRY_BACKOFF ** (attempt - 1)))
-        sleep(SLEEP_SECONDS)  # polite delay after each country
-    return pd.concat(rows, ignore_index=True) if rows else pd.DataFrame()
+                    count(errors=1)
+                    errors += 1
+                    if errors < MAX_RETRIES:
+                        sleep(SLEEP_SECONDS * (RETRY_BACKOFF ** (errors - 1)))
+                        continue
+                raise
+            limiter.on_success()
+            if not df.empty:
+                df.insert(0, "geo", geo)
+            if cache is not None:
+                cache.put("iot", keywords, timeframe, geo, tz_offset_minutes, df)
+            return df
+
+    results: Dict[str, pd.DataFrame] = {}
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch_geo, geo): geo for geo in countries}
+        for fut in as_completed(futures):
+            geo = futures[fut]
+            try:
+                df = fut.result()
+            except Exception as e:
+                stats.failed[geo] = repr(e)
+                continue
+            results[geo] = df
+            if on_result is not None:
+                on_result(geo, df)
+    stats.seconds = time.perf_counter() - t0
+    stats.final_rate = limiter.rate
+
+    frames = [results[g] for g in countries if g in results and not results[g].empty]
+    return (pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()), stats
+
+
+class CsvAppender:
+    """on_result callback that appends each geo's rows to one CSV as they arrive."""
+
+    def __init__(self, path: str, keywords: List[str]):
+        self.path, self.keywords = path, keywords
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, geo: str, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        cols = ["geo", "date"] + [c for c in df.columns if c not in ("geo", "date")]
+        with self._lock:
+            df[cols].to_csv(self.path, mode="a", header=self.rows == 0, index=False)
+            self.rows += len(df)
+
+
+# ---------------------------
+# Keyword batching
+# ---------------------------
+def plan_keyword_groups(keywords: List[str], anchor: Optional[str] = None, max_terms: int = MAX_TERMS) -> List[List[str]]:
+    """Pack `keywords` into requests of at most `max_terms` terms that all start with `anchor`.
+
+    Each request is normalized to its own 0-100, so the anchor repeated in
+    every group is what puts the groups on one scale. Pick a term with steady,
+    moderate interest: one that rounds to 0 next to a big term loses precision.
+    """
+    if len(keywords) <= max_terms:
+        return [list(keywords)]
+    anchor = anchor or keywords[0]
+    rest = [k for k in keywords if k != anchor]
+    n = max_terms - 1
+    return [[anchor] + rest[i:i + n] for i in range(0, len(rest), n)]
+
+
+def combine_groups(frames: List[pd.DataFrame], anchor: str, keywords: List[str]) -> pd.DataFrame:
+    """Rescale each group's frame onto the first through the anchor's total, join them, peak = 100.
+
+    Frames share their index (dates or regions). Where the anchor has no
+    interest at all in a group the scale is unknown and its terms are NaN;
+    with no anchor interest in the first group, every later group is NaN.
+    """
+    base = frames[0][anchor].sum()
+    out = frames[0][[c for c in frames[0].columns if c in keywords]]
+    for df in frames[1:]:
+        total = df[anchor].sum()
+        factor = base / total if base > 0 and total > 0 else float("nan")
+        out = out.join(df[[c for c in df.columns if c != anchor and c in keywords]] * factor, how="outer")
+    cols = [k for k in keywords if k in out.columns]
+    out = out[cols]
+    peak = out.max().max()
+    return (out * 100 / peak).round(2) if peak > 0 else out
+
+
+def join_groups(parts: List[pd.DataFrame], groups: List[List[str]], keywords: List[str], index) -> pd.DataFrame:
+    """combine_groups() for per-group fetch results keyed by the `index` column(s).
+
+    A group that came back empty keeps its terms as NaN (its scale is unknown).
+    """
+    if len(parts) == 1:
+        return parts[0]
+    if all(p.empty for p in parts):
+        return pd.DataFrame()
+    frames = [p.set_index(index) if not p.empty else None for p in parts]
+    rows = next(f.index for f in frames if f is not None)
+    frames = [f if f is not None else pd.DataFrame(float("nan"), index=rows, columns=g) for f, g in zip(frames, groups)]
+    return combine_groups(frames, groups[0][0], keywords).reset_index()
+
+
+def fetch_keyword_matrix(
+    keywords: List[str],
+    timeframe: str,
+    countries: List[str],
+    anchor: Optional[str] = ANCHOR,
+    on_result: Optional[Callable[[str, pd.DataFrame], None]] = None,
+    **fetch_kwargs,
+):
+    """Interest over time for any number of keywords: one request per keyword group per geo.
+
+    With up to MAX_TERMS keywords this is fetch_iot_concurrent(). Otherwise each
+    group is fetched for every geo and the groups are joined per geo into one
+    wide frame (geo, date, keywords...). All groups share one limiter, so a
+    throttled rate carries over to the next group.
+    Returns (frame, FetchStats summed over groups).
+    """
+    groups = plan_keyword_groups(keywords, anchor)
+    fetch_kwargs.setdefault("limiter", TokenBucket())
+    if len(groups) == 1:
+        return fetch_iot_concurrent(keywords, timeframe, countries, on_result=on_result, **fetch_kwargs)
+
+    total, parts = FetchStats(), []
+    for group in groups:
+        df, stats = fetch_iot_concurrent(group, timeframe, countries, **fetch_kwargs)
+        total.add(stats)
+        parts.append(df)
+
+    frames = []
+    for geo in countries:
+        if geo in total.failed:
+            continue
+        per_group = [p[p["geo"] == geo].drop(columns="geo") if not p.empty else p for p in parts]
+        df = join_groups(per_group, groups, keywords, "date")
+        if not df.empty:
+            df.insert(0, "geo", geo)
+            frames.append(df)
+        if on_result is not None:
+            on_result(geo, df)
+    return (pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()), total
+
+
+# ---------------------------
+# Incremental updates
+# ---------------------------
+def _parse_timeframe(timeframe: str):
+    start, end = timeframe.split()
+    return pd.Timestamp(start), pd.Timestamp(end)
+
+
+def _timeframe(start, end) -> str:
+    return f"{start:%Y-%m-%d} {end:%Y-%m-%d}"
+
+
+def missing_windows(dates: pd.Series, timeframe: str, overlap_days: int = OVERLAP_DAYS) -> List[str]:
+    """Timeframes still needed to cover `timeframe`, given the dates already stored for one geo.
+
+    Each window reaches `overlap_days` into the stored range so it can be
+    rescaled onto the stored normalization (Trends scales every request to its own 0-100).
+    """
+    start, end = _parse_timeframe(timeframe)
+    if dates.empty:
+        return [timeframe]
+    first, last = dates.min(), dates.max()
+    overlap = pd.Timedelta(days=overlap_days)
+    windows = []
+    if start < first:
+        windows.append(_timeframe(start, min(first + overlap, last)))
+    if end > last:
+        windows.append(_timeframe(max(last - overlap, first), end))
+    return windows
+
+
+def _snap_to_grid(new: pd.DataFrame, stored_dates: pd.Series) -> pd.DataFrame:
+    """Average a finer (e.g. daily) window onto the stored grid (e.g. weekly) so the points line up."""
+    if len(stored_dates) < 2 or len(new) < 2:
+        return new
+    step, new_step = stored_dates.sort_values().diff().median(), new["date"].diff().median()
+    if new_step >= step:
+        return new
+    anchor = stored_dates.min()
+    bucket = anchor + ((new["date"] - anchor) // step) * step
+    return new.drop(columns="date").groupby(bucket.rename("date")).mean(numeric_only=True).reset_index()
+
+
+def merge_window(stored: pd.DataFrame, new: pd.DataFrame, keywords: List[str]) -> pd.DataFrame:
+    """Rescale one geo's `new` window onto `stored` through their shared dates, then merge.
+
+    Stored values win on the overlap, except the last stored date, which may
+    have been a partial period when it was fetched.
+    """
+    if stored.empty:
+        return new.sort_values("date").reset_index(drop=True)
+    if new.empty:
+        return stored
+    new = _snap_to_grid(new, stored["date"])
+    shared = sorted(set(stored["date"]) & set(new["date"]))
+    last = stored["date"].max()
+    basis = [d for d in shared if d != last] or shared
+    if basis:
+        # Trends scales a whole request to one peak, so one factor maps every keyword:
+        # per-keyword factors would break the common scale (and zero out or skip a keyword
+        # that happens to be 0 on the overlap)
+        cols = [kw for kw in keywords if kw in stored.columns and kw in new.columns]
+        old_ix, new_ix = stored.set_index("date"), new.set_index("date")
+        old_sum, new_sum = old_ix.loc[basis, cols].to_numpy().sum(), new_ix.loc[basis, cols].to_numpy().sum()
+        if old_sum > 0 and new_sum > 0:
+            new = new.copy()
+            new[cols] = (new[cols] * (old_sum / new_sum)).round(2)
+    keep = stored[stored["date"] != last] if last in set(new["date"]) else stored
+    merged = pd.concat([keep, new[~new["date"].isin(keep["date"])]], ignore_index=True)
+    return merged.sort_values("date").reset_index(drop=True)
+
+
+def update_series(
+    keywords: List[str],
+    timeframe: str,
+    countries: List[str],
+    stored: pd.DataFrame,
+    overlap_days: int = OVERLAP_DAYS,
+    on_result: Optional[Callable[[str, pd.DataFrame], None]] = None,
+    anchor: Optional[str] = ANCHOR,
+    **fetch_kwargs,
+):
+    """Bring the stored per-country series (geo, date, keywords...) up to `timeframe`.
+
+    Only the missing windows are fetched (countries sharing a window go out as
+    one concurrent batch). `fetch_kwargs` pass through to fetch_iot_concurrent.
+    More than MAX_TERMS keywords are fetched in anchor-linked groups. All
+    windows share one limiter.
+    Returns (merged series, FetchStats summed over the batches).
+    """
+    fetch_kwargs.setdefault("limiter", TokenBucket())
+    by_geo = {geo: g.drop(columns="geo") for geo, g in stored.groupby("geo")} if not stored.empty else {}
+    plan: Dict[str, List[str]] = {}
+    for geo in countries:
+        dates = by_geo[geo]["date"] if geo in by_geo else pd.Series(dtype="datetime64[ns]")
+        for window in missing_windows(dates, timeframe, overlap_days):
+            plan.setdefault(window, []).append(geo)
+
+    total = FetchStats()
+    for window, geos in plan.items():
+        df, stats = fetch_keyword_matrix(keywords, window, geos, anchor=anchor, **fetch_kwargs)
+        total.add(stats)
+        for geo, g in df.groupby("geo") if not df.empty else []:
+            by_geo[geo] = merge_window(by_geo.get(geo, pd.DataFrame()), g.drop(columns="geo"), keywords)
+    for geo in countries:
+        if on_result is not None and geo in by_geo and geo not in total.failed:
+            on_result(geo, by_geo[geo])
+
+    frames = [g.assign(geo=geo) for geo, g in by_geo.items()]
+    if not frames:
+        return pd.DataFrame(), total
+    merged = pd.concat(frames, ignore_index=True)
+    return merged[["geo", "date"] + [c for c in merged.columns if c not in ("geo", "date")]], total
 
 
 # ---------------------------
 # Main execution
 # ---------------------------
+def stored_ibr(store: TrendStore, keywords: List[str], timeframe: str) -> pd.DataFrame:
+    """The region breakdown of `timeframe` as upserted by main(), back in its fetched layout."""
+    long = store.read("ibr_country", keywords=keywords)
+    long = long[long["timeframe"] == timeframe] if not long.empty else long
+    if long.empty:
+        return pd.DataFrame()
+    wide = long.pivot(index=["name", "geo"], columns="keyword", values="value")
+    wide.columns.name = None
+    return wide.reset_index().rename(columns={"name": "geoName", "geo": "geoCode"}).set_index("geoName")
+
+
 def main(
     kw_list: Optional[List[str]] = None,
     timeframe: str = TIMEFRAME,
     countries: Optional[List[str]] = None,
-    tz_offset_minutes: int = TZ_OFFSET_MINUTES
+    tz_offset_minutes: int = TZ_OFFSET_MINUTES,
+    workers: int = WORKERS,
+    cache_path: str = CACHE_PATH,
+    journal_path: str = JOURNAL_PATH,
+    resume: bool = True,
+    incremental: bool = False,
+    anchor: Optional[str] = ANCHOR,
+    store_dir: str = STORE_DIR,
+    export_csv: bool = False,
 ):
     kw_list = kw_list or KW_LIST
     countries = countries or COUNTRIES
+    groups = plan_keyword_groups(kw_list, anchor)
+    if len(groups) > 1:
+        print(f"{len(kw_list)} keywords in {len(groups)} groups anchored on '{groups[0][0]}': "
+              f"{len(groups)} requests per geo instead of {len(kw_list)} (one keyword per request)")
 
-    # Initialize pytrends
+    # Responses survive across runs; the journal lets a crashed run pick up where it stopped
+    cache = ResponseCache(cache_path)
+    journal = RunJournal(journal_path).open(
+        {"keywords": kw_list, "timeframe": timeframe, "countries": countries, "tz": tz_offset_minutes,
+         "incremental": incremental, "anchor": anchor}, resume=resume)
+    store = TrendStore(store_dir)
+    files = output_names(journal.stamp) if export_csv else {}
+    if journal.resumed:
+        print(f"Resuming run {journal.stamp}: {len(journal.done)} steps done, {len(journal.failed)} failed")
+
+    # Initialize pytrends; one limiter paces every batch of step 3, so what it learns
+    # about throttling carries across keyword groups and incremental windows
     pytrends = TrendReq(hl="en-US", tz=tz_offset_minutes)
+    limiter = TokenBucket()
+    start, end = _parse_timeframe(timeframe)
 
-    # 1) Worldwide Interest Over Time
-    iot_world = fetch_interest_over_time(pytrends, kw_list, timeframe, geo="")
-    if not iot_world.empty:
-        iot_world.to_csv(FN_WORLD_IOT, index=False)
+    # 1) Worldwide Interest Over Time (a resumed run reloads a finished step from the store)
+    if "world_iot" in journal.done:
+        iot_world = store.read("world_iot", geos=[WORLD], start=start, end=end, keywords=kw_list, wide=True)
+        iot_world = iot_world.drop(columns="geo") if not iot_world.empty else iot_world
+    else:
+        iot_world = join_groups([cache.get_or_fetch("iot", g, timeframe, "", tz_offset_minutes,
+                                                    lambda g=g: fetch_interest_over_time(pytrends, g, timeframe, geo=""))
+                                 for g in groups], groups, kw_list, "date")
+        if not iot_world.empty:
+            store.upsert("world_iot", to_long(iot_world, kw_list, geo=WORLD))
+        journal.record("world_iot")
+    if export_csv and not iot_world.empty:
+        iot_world.to_csv(files["world_iot"], index=False)
 
     # 2) Interest by Region (COUNTRY)
-    ibr_country = fetch_interest_by_region(pytrends, kw_list, timeframe, resolution="COUNTRY")
+    if "ibr_country" in journal.done:
+        ibr_country = stored_ibr(store, kw_list, timeframe)
+    else:
+        ibr_parts = [cache.get_or_fetch("ibr_country", g, timeframe, "", tz_offset_minutes,
+                                        lambda g=g: fetch_interest_by_region(pytrends, g, timeframe, resolution="COUNTRY"))
+                     for g in groups]
+        if len(groups) == 1:
+            ibr_country = ibr_parts[0]
+        else:
+            ibr_country = join_groups([p.reset_index() for p in ibr_parts], groups, kw_list, ["geoName", "geoCode"])
+            if not ibr_country.empty:   # empty (no geoName column) when every group's breakdown was empty
+                ibr_country = ibr_country.set_index("geoName")
+        if not ibr_country.empty:
+            store.upsert("ibr_country", ibr_to_long(ibr_country, kw_list, timeframe))
+        journal.record("ibr_country")
     if not ibr_country.empty:
         # Sort by first keyword descending
         sort_col = kw_list[0] if kw_list[0] in ibr_country.columns else ibr_country.columns[0]
         ibr_country = ibr_country.sort_values(sort_col, ascending=False)
-        ibr_country.to_csv(FN_IBR_COUNTRY, index=True)  # index includes region name
+        if export_csv:
+            ibr_country.to_csv(files["ibr_country"], index=True)  # index includes region name
+
+    # 3) Interest Over Time by Country list (concurrent; each geo is upserted as it arrives,
+    # rewriting only that geo's partitions). Incremental mode fetches only the windows
+    # missing from the stored series. Geos a resumed run already finished are read back.
+    done_geos = [geo for geo in countries if f"iot:{geo}" in journal.done]
+    todo = [geo for geo in countries if geo not in done_geos]
+    done_iot = store.read("iot_by_country", geos=done_geos, start=None if incremental else start,
+                          end=end, keywords=kw_list, wide=True) if done_geos else pd.DataFrame()
+    appender = None
+    if export_csv:
+        if os.path.exists(files["iot_by_country"]):
+            os.remove(files["iot_by_country"])
+        appender = CsvAppender(files["iot_by_country"], kw_list)
+        for geo, df in done_iot.groupby("geo", sort=False) if not done_iot.empty else []:
+            appender(geo, df)
+
+    def on_result(geo: str, df: pd.DataFrame) -> None:
+        if not df.empty:
+            store.upsert("iot_by_country", to_long(df, kw_list, geo=geo))
+        if appender is not None:
+            appender(geo, df)
+        if f"iot:{geo}" not in journal.done:
+            journal.record(f"iot:{geo}")
 
-    # 3) Interest Over Time by Country list
-    iot_by_country = fetch_iot_for_countries(pytrends, kw_list, timeframe, countries)
+    if incremental:
+        stored = store.read("iot_by_country", geos=countries, keywords=kw_list, wide=True)
+        if not stored.empty and set(kw_list) - set(stored.columns):
+            raise ValueError(f"the store has no {sorted(set(kw_list) - set(stored.columns))} series yet; "
+                             "run once without incremental=True")
+        iot_by_country, stats = update_series(kw_list, timeframe, todo, stored, on_result=on_result,
+                                              anchor=anchor, workers=workers, limiter=limiter,
+                                              tz_offset_minutes=tz_offset_minutes, cache=cache)
+    else:
+        iot_by_country, stats = fetch_keyword_matrix(kw_list, timeframe, todo, anchor=anchor,
+                                                     on_result=on_result, workers=workers, limiter=limiter,
+                                                     tz_offset_minutes=tz_offset_minutes, cache=cache)
+    for geo, err in stats.failed.items():
+        journal.record(f"iot:{geo}", error=err)
+    frames = [df for df in (done_iot, iot_by_country) if not df.empty]
+    iot_by_country = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
     if not iot_by_country.empty:
         # Ensure consistent column order: geo, date, keywords...
         cols = ["geo", "date"] + [c for c in iot_by_country.columns if c not in ("geo", "date")]
         iot_by_country = iot_by_country[cols]
-        iot_by_country.to_csv(FN_IOT_BY_COUNTRY, index=False)
+    print(f"Fetched {len(todo) - len(stats.failed)}/{len(todo)} countries "
+          f"({stats.cache_hits} from cache, {len(done_geos)} done before): {stats.requests} requests in {stats.seconds:.1f}s "
+          f"({stats.requests_per_sec:.2f} req/s, {stats.throttled} throttled, final rate {stats.final_rate:.2f}/s)")
+    if stats.failed:
+        # the run stays open in the journal, so the next run retries just these
+        print("Failed (rerun to retry):", ", ".join(sorted(stats.failed)))
+    else:
+        journal.finish(countries=len(countries))
+    cache.close()
 
     # Optional: return dataframes for interactive sessions
     return {
         "world_iot": iot_world,
         "ibr_country": ibr_country,
         "iot_by_country": iot_by_country,
-        "files": {
-            "world_iot": FN_WORLD_IOT if not iot_world.empty else None,
-            "ibr_country": FN_IBR_COUNTRY if not ibr_country.empty else None,
-            "iot_by_country": FN_IOT_BY_COUNTRY if not iot_by_country.empty else None,
-        },
+        "fetch_stats": stats,
+        "failed": dict(stats.failed),
+        "store": str(store.root),
+        "files": {name: path for name, path in files.items() if os.path.exists(path)},
     }
 
 
@@ -156,4 +788,4 @@ if __name__ == "__main__":
             print(df.tail())
         except Exception:
             print("(no data)")
-    print("\nSaved files:", out["files"])
\ No newline at end of file
+    print("\nStore:", out["store"], "| CSV exports:", out["files"] or "(none)")
\ No newline at end of file
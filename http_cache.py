@@ -0,0 +1,177 @@
+# ============================================
+# Squid Game - HTTP cache for scraped pages and images
+# ============================================
+# Re-scraping the wiki mostly re-downloads pages that did not change. This
+# cache keeps every body with its ETag / Last-Modified and sends them back as
+# If-None-Match / If-Modified-Since; a 304 is then answered from disk.
+#
+#   .http_cache/index.sqlite            url -> validators, blob digest, size, last used
+#   .http_cache/blobs/<ab>/<sha256>     bodies, content-addressed: an image used
+#                                        on many pages is stored once
+#
+# The blobs are size-bounded: least-recently-used URLs are dropped until they
+# fit in max_bytes, and a blob goes once no URL points at it.
+#
+# Usage:
+#   session = CachedSession(requests.Session())
+#   session.get(url, timeout=10)      # same Response API; .from_cache on 304s
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+CACHE_DIR = os.environ.get("SQUID_HTTP_CACHE", ".http_cache")
+CACHE_MAX_MB = float(os.environ.get("SQUID_HTTP_CACHE_MB", 1024))
+
+
+class HttpCache:
+    def __init__(self, root=CACHE_DIR, max_bytes=CACHE_MAX_MB * 2**20):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        (self.root / "blobs").mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+            " content_type TEXT, blob TEXT, size INTEGER, fetched REAL, used REAL)")
+
+    def _blob_path(self, digest):
+        return self.root / "blobs" / digest[:2] / digest
+
+    def lookup(self, url):
+        """(etag, last_modified, content_type, blob path) of a stored URL whose blob still exists, or None."""
+        with self._lock:
+            row = self._db.execute("SELECT etag, last_modified, content_type, blob FROM entries WHERE url = ?",
+                                   (url,)).fetchone()
+        if row is None or not self._blob_path(row[3]).is_file():
+            return None
+        return row[0], row[1], row[2], self._blob_path(row[3])
+
+    def touch(self, url):
+        with self._lock:
+            self._db.execute("UPDATE entries SET used = ? WHERE url = ?", (time.time(), url))
+
+    def store(self, url, body, etag=None, last_modified=None, content_type=None):
+        """Keep `body` for `url`; identical bodies share one blob. Returns the blob path."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+        if not path.is_file():
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)   # atomic: concurrent writers of one digest write the same bytes
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT blob FROM entries WHERE url = ?", (url,)).fetchone()
+            self._db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             (url, etag, last_modified, content_type, digest, len(body), now, now))
+            if old is not None and old[0] != digest:
+                self._drop_if_unused(old[0])   # the page changed: its previous body may be orphaned
+            self._evict()
+        return path
+
+    def _drop_if_unused(self, blob):
+        if self._db.execute("SELECT 1 FROM entries WHERE blob = ? LIMIT 1", (blob,)).fetchone() is None:
+            self._blob_path(blob).unlink(missing_ok=True)
+            return True
+        return False
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT blob, size FROM entries)"
+                                 ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, blob, size in self._db.execute("SELECT url, blob, size FROM entries ORDER BY used").fetchall():
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            if self._drop_if_unused(blob):
+                total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        with self._lock:
+            urls, = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()
+            blobs, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM "
+                                           "(SELECT DISTINCT blob, size FROM entries)").fetchone()
+        return {"urls": urls, "blobs": blobs, "bytes": size}
+
+    def close(self):
+        self._db.close()
+
+
+class CachedSession:
+    """Wraps a requests.Session: GETs revalidate against the cache and 304s come back as the stored 200."""
+
+    def __init__(self, session=None, cache=None):
+        self.session = session or requests.Session()
+        self.cache = cache if cache is not None else HttpCache()
+        self.counts = {"revalidated": 0, "downloaded": 0, "uncacheable": 0, "bytes_downloaded": 0, "bytes_saved": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, **kw):
+        with self._lock:
+            for k, v in kw.items():
+                self.counts[k] += v
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        stored = self.cache.lookup(full_url)
+        headers = dict(headers or {})
+        if stored is not None:
+            etag, last_modified, _, _ = stored
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        res = self.session.get(full_url, headers=headers, **kwargs)
+
+        if res.status_code == 304 and stored is not None:
+            try:
+                body = stored[3].read_bytes()
+            except FileNotFoundError:     # evicted meanwhile: ask again, unconditionally
+                return self.get(url, params=params, headers={k: v for k, v in headers.items()
+                                                             if k not in ("If-None-Match", "If-Modified-Since")},
+                                **kwargs)
+            self.cache.touch(full_url)
+            self._count(revalidated=1, bytes_saved=len(body))
+            return _from_cache(res, body, stored[2])
+        res.from_cache = False
+        if res.status_code == 200:
+            etag, last_modified = res.headers.get("ETag"), res.headers.get("Last-Modified")
+            if etag or last_modified:
+                self.cache.store(full_url, res.content, etag, last_modified, res.headers.get("Content-Type"))
+                self._count(downloaded=1, bytes_downloaded=len(res.content))
+            else:
+                self._count(uncacheable=1, bytes_downloaded=len(res.content))
+        return res
+
+    def blob_path(self, url):
+        """Where the cached body of `url` lives on disk (None if it is not cached)."""
+        stored = self.cache.lookup(url)
+        return stored[3] if stored is not None else None
+
+    def close(self):
+        self.session.close()
+        self.cache.close()
+
+
+def _from_cache(not_modified, body, content_type):
+    """The 304 response turned into the 200 it stands for."""
+    res = requests.Response()
+    res.status_code, res._content, res.url = 200, body, not_modified.url
+    res.headers.update(not_modified.headers)
+    res.headers.pop("Content-Encoding", None)   # the stored body is already decoded
+    if content_type:
+        res.headers["Content-Type"] = content_type
+    res.headers["Content-Length"] = str(len(body))
+    res.encoding = requests.utils.get_encoding_from_headers(res.headers)
+    res.request, res.from_cache = not_modified.request, True
+    return res
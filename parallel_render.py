@@ -0,0 +1,127 @@
+# ============================================
+# Squid Game - Parallel frame rendering (shared by all games)
+# ============================================
+# Every game script exposes the same pieces:
+#
+#   FPS                   frames per second of the output
+#   simulate()            -> state: plain dict of arrays/lists with state["n_frames"]
+#   build_figure(state)   -> (fig, draw); draw(i) sets every moving artist for
+#                            frame i from `state` alone and returns those artists
+#   BLIT = True           (optional) draw(i) only touches animated artists, so the
+#                            rest of the figure is rasterized once and restored
+#
+# render_game() computes the state once, splits range(n_frames) into chunks and
+# lets a process pool render + encode them. Each worker rebuilds the figure once;
+# the parent only appends the encoded frames to the output, in order. At most
+# MAX_PENDING_FRAMES frames are queued, rendering or waiting in the parent, so
+# memory stays flat however long the animation is (mp4 / webp payloads are raw RGBA).
+#
+# Usage:
+#   render_game(load_game("simulation game 5.py"), "game5.gif", workers=4)
+
+import importlib.util
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+MAX_PENDING_FRAMES = 64
+
+
+def load_game(path):
+    """Import a game script by file path (the script names contain spaces)."""
+    path = Path(path).resolve()
+    name = "squid_" + path.stem.replace(" ", "_")
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+def frame_images(fig, draw, frames, blit=False):
+    """Yield the RGBA buffer of every frame in `frames` (only valid until the next one)."""
+    canvas = fig.canvas
+    if blit:
+        canvas.draw()  # animated artists are skipped here
+        background = canvas.copy_from_bbox(fig.bbox)
+    for i in frames:
+        if blit:
+            canvas.restore_region(background)
+            for a in draw(i):
+                a.axes.draw_artist(a)
+        else:
+            draw(i)
+            canvas.draw()
+        yield np.asarray(canvas.buffer_rgba())
+
+
+# ----------------------
+# Worker side
+# ----------------------
+_worker = {}
+
+def _init_worker(path, state, fmt):
+    game = load_game(path)
+    fig, draw = game.build_figure(state)
+    _worker.update(fig=fig, draw=draw, fmt=fmt, blit=getattr(game, "BLIT", False))
+
+def _render_chunk(start, stop):
+    """Render + encode frames [start, stop); the first one is stored whole."""
+    from frame_writer import encode_payload
+    payloads, prev = [], None
+    for rgba in frame_images(_worker["fig"], _worker["draw"], range(start, stop), _worker["blit"]):
+        payloads.append(encode_payload(_worker["fmt"], rgba, prev))
+        prev = rgba.copy()
+    return payloads
+
+
+# ----------------------
+# Entry point
+# ----------------------
+def render_game(game, out, workers=None, state=None, chunk_size=None, max_pending_frames=MAX_PENDING_FRAMES):
+    """Render every frame of `game` (module or script path) into `out`.
+
+    workers=None uses every core; 1 renders in this process. Returns a dict
+    with the state that was drawn, the frame count and the wall time.
+    """
+    # the encoders (and matplotlib behind them) load here, so load_game() alone stays light
+    from frame_writer import format_for, open_encoder
+    if isinstance(game, (str, Path)):
+        game = load_game(game)
+    t0 = time.perf_counter()
+    state = game.simulate() if state is None else state
+    n = state["n_frames"]
+    workers = min(workers or os.cpu_count() or 1, n)
+    fmt = format_for(out)
+
+    with open_encoder(out, game.FPS) as enc:
+        if workers <= 1:
+            import matplotlib.pyplot as plt
+            fig, draw = game.build_figure(state)
+            for rgba in frame_images(fig, draw, range(n), getattr(game, "BLIT", False)):
+                enc.write(rgba)
+            plt.close(fig)
+        else:
+            # a few chunks per worker keeps the pool busy; chunks in flight never hold more
+            # than max_pending_frames frames (but always one chunk per worker)
+            chunk = chunk_size or max(1, min(-(-n // (4 * workers)), max_pending_frames // (2 * workers)))
+            depth = max(workers, max_pending_frames // chunk)
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(game.__file__, state, fmt)) as pool:
+                pending = deque()
+                for start in range(0, n, chunk):
+                    pending.append(pool.submit(_render_chunk, start, min(start + chunk, n)))
+                    if len(pending) >= depth:
+                        for payload in pending.popleft().result():
+                            enc.append(payload)
+                while pending:
+                    for payload in pending.popleft().result():
+                        enc.append(payload)
+
+    return {"state": state, "n_frames": n, "workers": workers, "seconds": time.perf_counter() - t0}
@@ -1,7 +1,44 @@
+import argparse
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from urllib.parse import unquote, urlsplit
+
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-from google.colab import files
+from lxml import etree, html as lxml_html
+from requests.adapters import HTTPAdapter
+
+from http_cache import CachedSession
+
+# ======================
+# Config
+# ======================
+N_PLAYERS = 456
+PAGE_URL = "https://squid-game.fandom.com/wiki/Player_{:03d}_(33rd_Squid_Game)"
+OUTPUT_CSV = "squid_game_players.csv"
+RECORDS_JSONL = "squid_game_players.jsonl"   # append-only, written while scraping
+FLUSH_EVERY = 20       # records between fsyncs of RECORDS_JSONL
+FLUSH_SECONDS = 5.0    # ... or seconds, whichever comes first
+API_URL = "https://squid-game.fandom.com/api.php"
+API_BATCH = 50         # titles per api.php request (the MediaWiki limit for normal users)
+
+CONCURRENCY = 8        # pages in flight at once (one pooled connection each)
+PER_HOST = 4           # of those, at most this many against the same host
+HOST_INTERVAL = 0.1    # seconds between request starts on one host
+TIMEOUT = 10
+MAX_RETRIES = 4        # on connection errors, 429 and 5xx
+BACKOFF = 0.5          # retry n waits uniform(0, BACKOFF * 2**n) seconds (full jitter)
+USER_AGENT = "squid-game-dashboard/1.0 (learning project)"
+
+PARSE_WORKERS = None   # parse processes in the pipeline (default: one per core)
+QUEUE_SIZE = 32        # fetched pages waiting for a parser; fetchers block when it is full
 
 # ======================
 # Scraper function
@@ -17,96 +54,697 @@ def generate_players(n: int = 200) -> pd.DataFrame:
 
     return df
 
-# Generate Player Number
-players_df = generate_players(200)
 
-def scrape_player(url):
-    """Scrape a single Squid Game player page and return dict with cleaned schema"""
-    try:
-        res = requests.get(url, timeout=10)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, "lxml")
-    except Exception as e:
-        print(f"❌ Error fetching {url}: {e}")
-        return None
+def generate_urls(players_df: pd.DataFrame) -> pd.DataFrame:
+    df = players_df.copy()
+    df["URL"] = df["Player Number"].astype(int).map(PAGE_URL.format)
+    return df
+
+
+def make_session(pool_size: int = CONCURRENCY) -> requests.Session:
+    """One Session for every page: keep-alive connections are reused instead of re-opened."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+class HostLimiter:
+    """Per-host politeness: at most `per_host` requests in flight, starts spaced by `interval`."""
+
+    def __init__(self, per_host=PER_HOST, interval=HOST_INTERVAL):
+        self.per_host, self.interval = per_host, interval
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_start = {}
+
+    def __call__(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            slots = self._slots.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        return _HostSlot(self, host, slots)
+
+    def _wait_turn(self, host):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.interval
+        time.sleep(max(0.0, start - now))
+
+
+class _HostSlot:
+    def __init__(self, limiter, host, slots):
+        self.limiter, self.host, self.slots = limiter, host, slots
+
+    def __enter__(self):
+        self.slots.acquire()
+        self.limiter._wait_turn(self.host)
+
+    def __exit__(self, *exc):
+        self.slots.release()
+
+
+def fetch_page(session, url, limiter=None, retries=MAX_RETRIES, timeout=TIMEOUT, params=None, binary=False):
+    """GET `url` and return the response text (bytes if `binary`), retrying transient failures with jittered backoff."""
+    for attempt in range(retries + 1):
+        wait = None
+        try:
+            if limiter is not None:
+                with limiter(url):
+                    res = session.get(url, params=params, timeout=timeout)
+            else:
+                res = session.get(url, params=params, timeout=timeout)
+            if res.status_code == 429 or res.status_code >= 500:
+                if attempt == retries:
+                    res.raise_for_status()
+                retry_after = res.headers.get("Retry-After", "")
+                wait = float(retry_after) if retry_after.replace(".", "", 1).isdigit() else None
+            else:
+                res.raise_for_status()   # other 4xx (e.g. a missing page) are final
+                return res.content if binary else res.text
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+        time.sleep(wait if wait is not None else random.uniform(0, BACKOFF * 2 ** attempt))
+
+
+# infobox data-source (= template parameter) -> record column
+FIELDS = {
+    "name": "name",
+    "aliases": "other_alias",
+    "relationships": "relationship",
+    "affiliation": "affiliation",
+    "status": "status_at_end_game",
+    "occupation": "Occupation",
+    "died": "Died",
+    "games": "Games",
+    "cause": "Cause of death",
+    "gender": "Gender",
+    "eyes": "Eye Color",
+    "hair": "Hair Color",
+}
+
+
+def build_record(values, url, image_url):
+    """The output row for one player from its infobox values (missing fields become "-")."""
+    # Extract player number from URL
+    player_number = url.split("Player_")[1].split("_")[0]
+    record = {
+        "character_type": "Background",  # default for wiki-only players
+        "name": values.get("name") or "-",
+        "player_number": f"Player {player_number}",
+    }
+    for source, column in list(FIELDS.items())[1:]:
+        record[column] = values.get(source) or "-"
+    record["Url"] = url
+    record["Image URL"] = image_url or "-"
+    return record
+
+
+def parse_player_soup(html, url):
+    """Extract the player record with one CSS query per field over the whole page (the fallback)."""
+    soup = BeautifulSoup(html, "lxml")
 
     def get_value(source):
         tag = soup.select_one(f'div[data-source="{source}"] .pi-data-value')
         return tag.get_text(strip=True) if tag else "-"
 
-    def get_text(selector):
-        tag = soup.select_one(selector)
-        return tag.get_text(strip=True) if tag else "-"
-
     def get_img():
         tag = soup.select_one("figure.pi-image img")
         return tag["src"] if tag else "-"
 
-    # Core fields
-    name           = get_value("name")
-    aliases        = get_value("aliases")
-    relationship   = get_value("relationships")
-    affiliation    = get_value("affiliation")
-    status         = get_value("status")
-    occupation     = get_value("occupation")
-    died           = get_value("died")
-    games          = get_value("games")
-    cause_of_death = get_value("cause")
-    gender         = get_value("gender")
-    eyes           = get_value("eyes")
-    hair           = get_value("hair")
+    return build_record({source: get_value(source) for source in FIELDS}, url, get_img())
 
-    # Extract player number from URL
-    player_number = url.split("Player_")[1].split("_")[0]
 
-    # Image
-    image_url = get_img()
+_INFOBOX = re.compile(r"<aside\b[^>]*\bportable-infobox\b", re.I)
+
+
+def _has_ancestor(el, tag, cls=None):
+    el = el.getparent()
+    while el is not None:
+        if el.tag == tag and (cls is None or cls in el.get("class", "").split()):
+            return el
+        el = el.getparent()
+    return None
 
-    return {
-        "character_type": "Background",  # default for wiki-only players
-        "name": name,
-        "player_number": f"Player {player_number}",
-        "other_alias": aliases,
-        "relationship": relationship,
-        "affiliation": affiliation,
-        "status_at_end_game": status,
-        "Occupation": occupation,
-        "Died": died,
-        "Games": games,
-        "Cause of death": cause_of_death,
-        "Gender": gender,
-        "Eye Color": eyes,
-        "Hair Color": hair,
-        "Url": url,
-        "Image URL": image_url
-    }
+
+def parse_infobox(html):
+    """({data-source: text}, image src) from the portable infoboxes, each walked once.
+
+    Only the <aside> slices are parsed, not the whole page. Returns None when an
+    infobox is not closed or does not parse.
+    """
+    values, image = {}, None
+    for m in _INFOBOX.finditer(html):
+        end = html.find("</aside>", m.start())
+        if end < 0:
+            return None
+        try:
+            root = lxml_html.fragment_fromstring(html[m.start():end + len("</aside>")])
+        except Exception:
+            return None
+        for el in root.iter(etree.Element):   # skips comments
+            if "pi-data-value" in el.get("class", "").split():
+                div = _has_ancestor(el, "div")
+                while div is not None and div.get("data-source") is None:
+                    div = _has_ancestor(div, "div")
+                if div is not None and div.get("data-source") not in values:
+                    values[div.get("data-source")] = "".join(t.strip() for t in el.itertext())
+            elif el.tag == "img" and image is None and _has_ancestor(el, "figure", "pi-image") is not None:
+                image = el.get("src")
+    return values, image
+
+
+def parse_player(html, url):
+    """Extract the player record from a wiki page's HTML (single pass over the infobox)."""
+    parsed = parse_infobox(html)
+    if not parsed or not parsed[0]:
+        return parse_player_soup(html, url)   # no usable infobox: try the page-wide selectors
+    values, image = parsed
+    return build_record(values, url, image)
+
+
+def scrape_player(url, session=None, limiter=None, save_html=None):
+    """Scrape a single Squid Game player page and return dict with cleaned schema"""
+    try:
+        html = fetch_page(session or requests, url, limiter)
+    except Exception as e:
+        print(f"❌ Error fetching {url}: {e}")
+        return None
+    if save_html:
+        save_page(save_html, url, html)
+    return parse_player(html, url)
+
+
+def save_page(directory, url, html):
+    with open(os.path.join(directory, url.rsplit("/wiki/", 1)[1] + ".html"), "w", encoding="utf-8") as f:
+        f.write(html)
 
 # ======================
 # Run on list of URLs
 # ======================
-def scrape_all_players(df_with_urls):
+def scrape_all_players(df_with_urls, concurrency=CONCURRENCY, session=None, limiter=None, save_html=None):
+    """Scrape every row's URL with `concurrency` pages in flight; records keep the input order.
+
+    `save_html` (a directory) keeps every fetched page, e.g. as a parse benchmark corpus.
+    """
+    if save_html:
+        os.makedirs(save_html, exist_ok=True)
+    session = session or make_session(concurrency)
+    limiter = limiter or HostLimiter()
+    urls = list(df_with_urls["URL"])
+    done = [0]
+    lock = threading.Lock()
+
+    def scrape(url):
+        data = scrape_player(url, session, limiter, save_html)
+        with lock:
+            done[0] += 1
+            print(f"🔎 [{done[0]}/{len(urls)}] {url}{'' if data else ' (failed)'}")
+        return data
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        records = [r for r in pool.map(scrape, urls) if r]
+    return pd.DataFrame(records)
+
+# ======================
+# Fetch -> parse pipeline
+# ======================
+# Fetching is network-bound and parsing is CPU-bound, so they run as two
+# stages: `concurrency` fetcher threads fill a bounded queue, and the main
+# thread feeds the pages from it to a pool of parse processes, keeping at most
+# 2 per process in flight. When parsing falls behind, the queue fills and the
+# fetchers wait (backpressure) instead of piling pages up in memory. The run
+# takes as long as the slower stage, not the sum of both.
+def _parse_timed(html, url):
+    t0 = time.perf_counter()
+    record = parse_player(html, url)
+    return record, time.perf_counter() - t0
+
+
+def scrape_pipeline(df_with_urls, concurrency=CONCURRENCY, parse_workers=PARSE_WORKERS, queue_size=QUEUE_SIZE,
+                    session=None, limiter=None, on_record=None, save_html=None):
+    """Fetch pages on threads and parse them in processes; returns (DataFrame in input order, stage stats).
+
+    Each record is handed to on_record(record) as soon as it is parsed; records
+    are then not kept in memory and the returned DataFrame is empty.
+    """
+    if save_html:
+        os.makedirs(save_html, exist_ok=True)
+    session = session or make_session(concurrency)
+    limiter = limiter or HostLimiter()
+    urls = list(df_with_urls["URL"])
+    parse_workers = parse_workers or os.cpu_count() or 1
+    pages = queue.Queue(maxsize=queue_size)
+    stats = {"pages": len(urls), "failed": 0, "fetch_busy": 0.0, "fetch_blocked": 0.0, "fetch_done": 0.0,
+             "parse_busy": 0.0, "parse_starved": 0.0, "parse_start": None, "parse_done": 0.0}
+    lock = threading.Lock()
+    stop = threading.Event()                      # set when the parse side gives up
+    t0 = time.perf_counter()
+
+    def fetch(i):
+        if stop.is_set():
+            return
+        url = urls[i]
+        t = time.perf_counter()
+        html = None
+        try:
+            html = fetch_page(session, url, limiter)
+            if save_html:
+                save_page(save_html, url, html)
+        except Exception as e:
+            print(f"❌ Error fetching {url}: {e}")
+        fetched = time.perf_counter()
+        while not stop.is_set():                  # blocks while the parsers are behind
+            try:
+                pages.put((i, html), timeout=0.2)
+                break
+            except queue.Full:
+                pass
+        with lock:
+            stats["fetch_busy"] += fetched - t
+            stats["fetch_blocked"] += time.perf_counter() - fetched
+            stats["fetch_done"] = max(stats["fetch_done"], fetched - t0)
+
+    records = [None] * len(urls) if on_record is None else None
+    parsed = [0]
+
+    def collect(futures):
+        for fut in futures:
+            i = in_flight.pop(fut)
+            try:
+                record, seconds = fut.result()
+            except Exception as e:
+                print(f"❌ Error parsing {urls[i]}: {e}")
+                stats["failed"] += 1
+                continue
+            stats["parse_busy"] += seconds
+            if on_record is not None:
+                on_record(record)
+            else:
+                records[i] = record
+            parsed[0] += 1
+            print(f"🔎 [{parsed[0]}/{len(urls)}] {urls[i]}")
+
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as fetchers, ProcessPoolExecutor(parse_workers) as parsers:
+        for i in range(len(urls)):
+            fetchers.submit(fetch, i)
+        try:
+            for _ in range(len(urls)):
+                t = time.perf_counter()
+                i, html = pages.get()
+                if stats["parse_start"] is None:
+                    stats["parse_start"] = time.perf_counter() - t0
+                else:
+                    stats["parse_starved"] += time.perf_counter() - t
+                if html is None:
+                    stats["failed"] += 1
+                    continue
+                in_flight[parsers.submit(_parse_timed, html, urls[i])] = i
+                done, _ = wait(in_flight, timeout=0)
+                collect(done)
+                while len(in_flight) >= 2 * parse_workers:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+            collect(list(in_flight))
+        finally:
+            stop.set()                            # on an error, fetchers blocked on the queue return
+    stats["parse_done"] = stats["wall"] = time.perf_counter() - t0
+    return pd.DataFrame([r for r in records or [] if r]), stats
+
+
+def print_stage_report(stats):
+    fetch_wall, parse_wall = stats["fetch_done"], stats["parse_done"] - (stats["parse_start"] or 0)
+    print(f"⏱  fetch: {fetch_wall:6.1f}s wall, {stats['fetch_busy']:6.1f}s in requests, "
+          f"{stats['fetch_blocked']:6.1f}s waiting on a full queue ({stats['failed']} failed)")
+    print(f"⏱  parse: {parse_wall:6.1f}s wall, {stats['parse_busy']:6.1f}s parsing, "
+          f"{stats['parse_starved']:6.1f}s waiting for pages")
+    print(f"⏱  total: {stats['wall']:6.1f}s for {stats['pages']} pages "
+          f"({stats['pages'] / stats['wall']:.1f} pages/s)")
+
+# ======================
+# Bulk api.php backend
+# ======================
+# One api.php request returns the wikitext of up to 50 pages (plus their lead
+# image URL), instead of one full rendered page - chrome, scripts and all - per
+# player. The infobox template parameters are the same names the rendered
+# infobox uses as data-source, so both backends fill the same fields.
+def page_title(url):
+    return unquote(url.rsplit("/wiki/", 1)[1]).replace("_", " ")
+
+
+def infobox_params(wikitext):
+    """Top-level `|key = value` parameters of the page's infobox template ({} if there is none)."""
+    for m in re.finditer(r"\{\{\s*([^|{}]*?infobox[^|{}]*)", wikitext, re.I):
+        params, depth, i, start = {}, 0, m.start(), None
+        while i < len(wikitext):
+            two = wikitext[i:i + 2]
+            if two in ("{{", "[["):
+                depth += 1; i += 2; continue
+            if two in ("}}", "]]"):
+                depth -= 1
+                if depth == 0:
+                    break
+                i += 2; continue
+            if wikitext[i] == "|" and depth == 1:
+                if start is not None:
+                    _add_param(params, wikitext[start:i])
+                start = i + 1
+            i += 1
+        if start is not None:
+            _add_param(params, wikitext[start:i])
+        return params
+    return {}
+
+
+def _add_param(params, text):
+    key, eq, value = text.partition("=")
+    if eq:
+        params[key.strip().lower()] = value.strip()
+
+
+_MARKUP = re.compile(
+    r"<!--.*?-->|<ref[^>]*/>|<ref[^>]*>.*?</ref>"              # dropped
+    r"|\[\[(?:File|Image):[^\]]*\]\]"                          # dropped
+    r"|\[\[(?:[^\]|]*\|)?([^\]]*)\]\]"                           # [[target|text]] -> text
+    r"|\[https?://\S+\s*([^\]]*)\]"                              # [url text] -> text
+    r"|\{\{[^{}|]*(?:\|([^{}|]*))?[^{}]*\}\}"                     # {{tpl|arg|...}} -> arg
+    r"|'{2,}|<[^>]+>",                                          # quotes / tags: a boundary
+    re.S | re.I)
+
+
+def clean_wikitext(value):
+    """Plain text of a wikitext value, split where markup was and joined like get_text(strip=True)."""
+    pieces, pos = [], 0
+    for m in _MARKUP.finditer(value):
+        pieces.append(value[pos:m.start()])
+        pieces.append(next((g for g in m.groups() if g is not None), ""))
+        pos = m.end()
+    pieces.append(value[pos:])
+    return "".join(p.strip() for p in pieces)
+
+
+def fetch_api_batch(session, titles, api_url=API_URL, limiter=None):
+    """{requested title: (wikitext or None, lead image URL or None)} for up to API_BATCH titles."""
+    params = {"action": "query", "format": "json", "formatversion": "2", "redirects": "1",
+              "prop": "revisions|pageimages", "rvprop": "content", "rvslots": "main", "piprop": "original",
+              "titles": "|".join(titles)}
+    pages, aliases, cont = {}, {}, {}
+    while True:
+        data = json.loads(fetch_page(session, api_url, limiter, params={**params, **cont}))
+        query = data.get("query", {})
+        for hop in query.get("normalized", []) + query.get("redirects", []):
+            aliases[hop["from"]] = hop["to"]
+        for page in query.get("pages", []):
+            entry = pages.setdefault(page["title"], [None, None])
+            revisions = page.get("revisions")
+            if revisions:
+                entry[0] = revisions[0]["slots"]["main"]["content"]
+            if "original" in page:
+                entry[1] = page["original"]["source"]
+        if "continue" not in data:
+            break
+        cont = data["continue"]
+
+    out = {}
+    for title in titles:
+        resolved = title
+        while resolved in aliases:
+            resolved = aliases[resolved]
+        out[title] = tuple(pages.get(resolved, (None, None)))
+    return out
+
+
+def fetch_image_urls(session, filenames, api_url=API_URL, limiter=None):
+    """{file name: URL} for infobox images the batch could not resolve (wikis without PageImages)."""
+    urls = {}
+    for i in range(0, len(filenames), API_BATCH):
+        chunk = filenames[i:i + API_BATCH]
+        params = {"action": "query", "format": "json", "formatversion": "2", "prop": "imageinfo",
+                  "iiprop": "url", "titles": "|".join(f"File:{f}" for f in chunk)}
+        data = json.loads(fetch_page(session, api_url, limiter, params=params))
+        normalized = {n["to"]: n["from"] for n in data.get("query", {}).get("normalized", [])}
+        for page in data.get("query", {}).get("pages", []):
+            if page.get("imageinfo"):
+                name = normalized.get(page["title"], page["title"]).split(":", 1)[1]
+                urls[name] = page["imageinfo"][0]["url"]
+    return urls
+
+
+def scrape_all_players_api(df_with_urls, api_url=API_URL, batch=API_BATCH, concurrency=2, session=None, limiter=None,
+                           on_record=None):
+    """scrape_all_players() through api.php: one request per `batch` pages instead of one per page.
+
+    With `on_record`, records are handed over one by one instead of returned.
+    """
+    session = session or make_session(concurrency)
+    limiter = limiter or HostLimiter()
+    urls = list(df_with_urls["URL"])
+    chunks = [urls[i:i + batch] for i in range(0, len(urls), batch)]
+
+    def run(chunk):
+        try:
+            return chunk, fetch_api_batch(session, [page_title(u) for u in chunk], api_url, limiter)
+        except Exception as e:
+            print(f"❌ Error fetching {len(chunk)} pages from {api_url}: {e}")
+            return chunk, {}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        fetched = list(pool.map(run, chunks))
+
+    found, missing_images = [], set()
+    for chunk, pages in fetched:
+        for url in chunk:
+            wikitext, image_url = pages.get(page_title(url), (None, None))
+            if wikitext is None:
+                print(f"❌ No page for {url}")
+                continue
+            params = infobox_params(wikitext)
+            image = params.pop("image", "").strip()
+            image = re.sub(r"^\[\[(?:File|Image):([^|\]]+).*", r"\1", image, flags=re.I).strip()
+            if image_url is None and image:
+                missing_images.add(image)
+            found.append((url, params, image_url, image))
+    resolved = fetch_image_urls(session, sorted(missing_images), api_url, limiter) if missing_images else {}
+
     records = []
-    for _, row in df_with_urls.iterrows():
-        url = row["URL"]
-        print(f"🔎 Scraping {url} ...")
-        data = scrape_player(url)
-        if data:
-            records.append(data)
+    for url, params, image_url, image in found:
+        values = {source: clean_wikitext(params[source]) for source in FIELDS if source in params}
+        record = build_record(values, url, image_url or resolved.get(image))
+        if on_record is not None:
+            on_record(record)
+        else:
+            records.append(record)
     return pd.DataFrame(records)
 
+# ======================
+# Streaming output
+# ======================
+class RecordWriter:
+    """Append-only JSONL of finished records, so a crash only loses the last unflushed few.
+
+    Lines are flushed and fsynced every `flush_every` records or `flush_seconds`.
+    Torn (no trailing newline) or unreadable lines are dropped on open, and
+    done_urls tells a restarted run which pages to skip. compact() writes the dashboard CSV.
+    """
+
+    def __init__(self, path=RECORDS_JSONL, flush_every=FLUSH_EVERY, flush_seconds=FLUSH_SECONDS):
+        self.path, self.flush_every, self.flush_seconds = path, flush_every, flush_seconds
+        self.done_urls = set()
+        if os.path.exists(path):
+            kept, dropped = [], 0
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("torn")   # crash mid-write, even if the JSON happens to be whole
+                        self.done_urls.add(json.loads(line)["Url"])
+                        kept.append(line)
+                    except (ValueError, KeyError):
+                        dropped += 1                    # skip it; the records after it stay
+            if dropped:
+                tmp = path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.writelines(kept)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, path)
+        self._fp = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._unflushed, self._last_flush = 0, time.monotonic()
+
+    def write(self, record):
+        with self._lock:
+            self._fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.done_urls.add(record["Url"])
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_seconds:
+                self._flush()
+
+    def _flush(self):
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self._unflushed, self._last_flush = 0, time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if not self._fp.closed:
+                self._flush()
+                self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def compact(self, csv_path=OUTPUT_CSV):
+        """Write every record (last one per URL, in player order) as the `;`-separated utf-8-sig CSV."""
+        df = pd.read_json(self.path, lines=True, dtype=False) if os.path.getsize(self.path) else pd.DataFrame()
+        if not df.empty:
+            df = df.drop_duplicates("Url", keep="last").sort_values("player_number", kind="stable")
+        tmp = csv_path + ".tmp"
+        df.to_csv(tmp, index=False, sep=";", encoding="utf-8-sig")
+        os.replace(tmp, csv_path)
+        return df
+
+# ======================
+# Image mirror
+# ======================
+def mirror_images(players_df, directory, session, limiter=None, concurrency=CONCURRENCY):
+    """Save every player's `Image URL` as <directory>/Player_XXX.<ext>; returns the number saved.
+
+    Through a CachedSession an unchanged image is only revalidated, and the file
+    is hard-linked to the cache blob, so an image shared by many players is on disk once.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rows = [(r["player_number"], r["Image URL"]) for _, r in players_df.iterrows() if r["Image URL"] not in ("-", "")]
+
+    def save(row):
+        player, url = row
+        ext = re.search(r"\.(png|jpe?g|gif|webp|svg)(?=[/?]|$)", urlsplit(url).path, re.I)
+        dest = os.path.join(directory, player.replace(" ", "_") + (ext.group(0).lower() if ext else ".img"))
+        try:
+            body = fetch_page(session, url, limiter, binary=True)
+        except Exception as e:
+            print(f"❌ Error fetching image {url}: {e}")
+            return False
+        blob = session.blob_path(requests.Request("GET", url).prepare().url) \
+            if isinstance(session, CachedSession) else None
+        try:
+            if os.path.exists(dest):
+                os.remove(dest)
+            if blob is not None:
+                try:
+                    os.link(blob, dest)
+                    return True
+                except OSError:   # no hard links here (other device, filesystem) or the blob was evicted
+                    pass
+            with open(dest, "wb") as f:
+                f.write(body)
+        except OSError as e:
+            print(f"❌ Error saving image {dest}: {e}")
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return sum(pool.map(save, rows))
+
+# ======================
+# Parse benchmark
+# ======================
+def load_corpus(directory):
+    """[(url, html)] of the pages saved with --save-html."""
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".html"):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                pages.append((PAGE_URL.rsplit("/wiki/", 1)[0] + "/wiki/" + name[:-5], f.read()))
+    return pages
+
+
+def benchmark_parsers(pages, repeat=3):
+    """Pages parsed per second by the page-wide selectors and by the single-pass parser (best of `repeat`)."""
+    rates = {}
+    for label, parse in (("selectors", parse_player_soup), ("single-pass", parse_player)):
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            records = [parse(html, url) for url, html in pages]
+            best = min(best, time.perf_counter() - t0)
+        rates[label] = (len(pages) / best, records)
+    same = sum(a == b for a, b in zip(rates["selectors"][1], rates["single-pass"][1]))
+    for label, (rate, _) in rates.items():
+        print(f"{label:>12}: {rate:8.1f} pages/s")
+    print(f"{'speed-up':>12}: {rates['single-pass'][0] / rates['selectors'][0]:8.1f}x "
+          f"({same}/{len(pages)} identical records)")
+    return {label: rate for label, (rate, _) in rates.items()}
+
 # ======================
 # Example run
 # ======================
-# Example DataFrame with URLs (replace with your df_with_urls)
-df_with_urls = generate_urls(players)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape the 33rd Squid Game player pages from the Fandom wiki")
+    parser.add_argument("--backend", choices=["html", "api"], default="html",
+                        help="html: one rendered page per player; api: api.php, 50 players per request")
+    parser.add_argument("--players", type=int, default=N_PLAYERS)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="pages fetched at once")
+    parser.add_argument("--parse-workers", type=int, default=PARSE_WORKERS,
+                        help="parse processes for the html backend (default: one per core)")
+    parser.add_argument("--save-html", metavar="DIR", help="keep every fetched page (html backend)")
+    parser.add_argument("--benchmark", metavar="DIR", help="only benchmark the parsers on pages saved in DIR")
+    parser.add_argument("--no-http-cache", action="store_true",
+                        help="always download in full (no conditional requests against .http_cache)")
+    parser.add_argument("--mirror-images", metavar="DIR", help="also save every player's image into DIR")
+    parser.add_argument("--fresh", action="store_true",
+                        help=f"start over instead of skipping the pages already in {RECORDS_JSONL}")
+    args = parser.parse_args()
+    if args.benchmark:
+        benchmark_parsers(load_corpus(args.benchmark))
+        raise SystemExit
+    if args.fresh and os.path.exists(RECORDS_JSONL):
+        os.remove(RECORDS_JSONL)
+    df_with_urls = generate_urls(generate_players(args.players))
 
-df_with_urls["URL"] = df_with_urls["Player Number"].apply(
-    lambda x: f"https://squid-game.fandom.com/wiki/Player_{str(x).zfill(3)}_(33rd_Squid_Game)"
-)
+    # Unchanged pages and images come back as 304s and are served from .http_cache
+    session = make_session(args.concurrency)
+    if not args.no_http_cache:
+        session = CachedSession(session)
 
-# Scrape
-players_df = scrape_all_players(df_with_urls)
+    # Scrape (records stream into RECORDS_JSONL; a rerun skips the pages already there)
+    t0 = time.perf_counter()
+    with RecordWriter() as writer:
+        before = len(writer.done_urls)
+        todo = df_with_urls[~df_with_urls["URL"].isin(writer.done_urls)]
+        if len(todo) < len(df_with_urls):
+            print(f"↩️  {len(df_with_urls) - len(todo)} pages already in {RECORDS_JSONL}, {len(todo)} to go")
+        if todo.empty:
+            pass
+        elif args.backend == "api":
+            scrape_all_players_api(todo, concurrency=min(args.concurrency, PER_HOST), session=session,
+                                   on_record=writer.write)
+        else:
+            _, stage_stats = scrape_pipeline(todo, concurrency=args.concurrency, parse_workers=args.parse_workers,
+                                             session=session, on_record=writer.write, save_html=args.save_html)
+            print_stage_report(stage_stats)
+    print(f"✅ {len(writer.done_urls) - before}/{len(todo)} pages in {time.perf_counter() - t0:.1f}s")
 
-# Save with semicolon separator
-players_df.to_csv("squid_game_players.csv", index=False, sep=";", encoding="utf-8-sig")
-files.download("squid_game_players.csv")
+    # Save with semicolon separator
+    players_df = writer.compact(OUTPUT_CSV)
+    print(f"💾 {len(players_df)} players -> {OUTPUT_CSV}")
+    if args.mirror_images and not players_df.empty:
+        saved = mirror_images(players_df, args.mirror_images, session, concurrency=args.concurrency)
+        print(f"🖼  {saved} images -> {args.mirror_images}")
+    if isinstance(session, CachedSession):
+        c = session.counts
+        print(f"🗄  http cache: {c['revalidated']} not modified ({c['bytes_saved'] / 2**20:.1f} MB saved), "
+              f"{c['downloaded'] + c['uncacheable']} downloaded ({c['bytes_downloaded'] / 2**20:.1f} MB)")
+        session.close()
+    try:
+        from google.colab import files
+        files.download(OUTPUT_CSV)
+    except ImportError:   # not running in Colab
+        pass
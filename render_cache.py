@@ -0,0 +1,155 @@
+# ============================================
+# Squid Game - Render cache (shared by all games)
+# ============================================
+# A game's GIF + CSV outputs only change when its input tables, its parameters
+# (FPS, frame counts, seeds) or the rendering code change. The cache key hashes
+# all three; on a hit the stored artifacts are copied back instead of
+# re-simulating, re-rendering and re-encoding.
+#
+#   .render_cache/<key>/manifest.json   file list, total size, creation time
+#   .render_cache/<key>/<artifact>      stored outputs
+#
+# The directory is size-bounded: entries are evicted least-recently-used first
+# (a hit touches the manifest) until the total fits in max_bytes.
+#
+# Usage (inside a game script):
+#   cached_render(sys.modules[__name__], ["game.gif", "game_log.csv"], produce)
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = os.environ.get("SQUID_RENDER_CACHE", ".render_cache")
+CACHE_MAX_MB = float(os.environ.get("SQUID_RENDER_CACHE_MB", 512))
+
+# Code that shapes every rendered frame besides the game script itself
+RENDERER_FILES = ["frame_writer.py", "parallel_render.py"]
+
+
+def fingerprint(obj, h=None):
+    """Feed a stable byte representation of tables/arrays/containers/scalars into a sha256."""
+    h = h if h is not None else hashlib.sha256()
+    if isinstance(obj, pd.DataFrame):
+        h.update(repr((list(obj.columns), [str(t) for t in obj.dtypes])).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(repr((obj.shape, str(obj.dtype))).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for k in sorted(obj, key=repr):
+            h.update(repr(k).encode()); fingerprint(obj[k], h)
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for v in obj:
+            fingerprint(v, h)
+        h.update(b"]")
+    else:
+        h.update(repr(obj).encode())
+    return h
+
+
+def renderer_version(game):
+    """Hash of the game script and the shared rendering modules."""
+    from frame_writer import ENCODER_VERSION
+    h = hashlib.sha256(f"encoder-{ENCODER_VERSION}".encode())
+    here = Path(__file__).resolve().parent
+    for path in [Path(game.__file__)] + [here / name for name in RENDERER_FILES]:
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def cache_key(game, outputs):
+    """Key of one game run: its cache_inputs(), the output names and the renderer version."""
+    h = fingerprint({"inputs": game.cache_inputs(), "outputs": [Path(p).name for p in outputs]})
+    h.update(renderer_version(game).encode())
+    return h.hexdigest()[:32]
+
+
+class RenderCache:
+    def __init__(self, root=CACHE_DIR, max_bytes=CACHE_MAX_MB * 2**20):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def _entries(self):
+        """(last_used, size, path) of every complete entry."""
+        out = []
+        if self.root.is_dir():
+            for d in self.root.iterdir():
+                manifest = d / "manifest.json"
+                if manifest.is_file():
+                    out.append((manifest.stat().st_mtime, json.loads(manifest.read_text())["bytes"], d))
+        return out
+
+    def get(self, key, outputs):
+        """Copy the cached artifacts to `outputs` and return True, or False on a miss."""
+        entry = self.root / key
+        manifest = entry / "manifest.json"
+        if not manifest.is_file() or not all((entry / Path(p).name).is_file() for p in outputs):
+            return False
+        for out in outputs:
+            shutil.copyfile(entry / Path(out).name, out)
+        os.utime(manifest)  # last used
+        return True
+
+    def put(self, key, outputs, meta=None):
+        """Store the freshly written `outputs` under `key`, then evict down to max_bytes."""
+        size = sum(Path(p).stat().st_size for p in outputs)
+        if size > self.max_bytes:
+            return False
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=self.root, prefix=".tmp-"))
+        for out in outputs:
+            shutil.copyfile(out, tmp / Path(out).name)
+        (tmp / "manifest.json").write_text(json.dumps(
+            {"files": [Path(p).name for p in outputs], "bytes": size, "created": time.time(), **(meta or {})},
+            indent=1))
+        try:
+            tmp.rename(self.root / key)  # atomic: readers never see half an entry
+        except OSError:
+            shutil.rmtree(tmp)           # a concurrent run stored the same key first
+        self.evict(keep=key)
+        return True
+
+    def evict(self, keep=None):
+        """Drop least-recently-used entries until the cache fits; returns the bytes freed."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path.name == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size; freed += size
+        return freed
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def cached_render(game, outputs, produce, cache=None, enabled=True):
+    """Restore `outputs` from the cache, or call produce() to write them and store them.
+
+    Returns True on a cache hit.
+    """
+    if not enabled:
+        produce()
+        return False
+    cache = cache if cache is not None else RenderCache()
+    key = cache_key(game, outputs)
+    if cache.get(key, outputs):
+        print(f"Cache hit ({key[:12]}): restored {', '.join(map(str, outputs))}")
+        return True
+    produce()
+    cache.put(key, outputs, meta={"game": Path(game.__file__).name})
+    return False
@@ -0,0 +1,95 @@
+# ============================================
+# Squid Game - Season 1 runner (all games, one entry point)
+# ============================================
+# Runs any subset of the five game scripts, independent games side by side in
+# a process pool. Every game script exposes:
+#
+#   GIF_OUTPUT, CSV_OUTPUTS   file names it produces
+#   simulate()                per-frame state (no drawing)
+#   save_logs(state)          writes CSV_OUTPUTS (games 2, 4, 5)
+#   cache_inputs()            what render_cache.py hashes
+#
+# --no-render only simulates and writes the CSV logs; matplotlib is never
+# imported on that path, so the nightly data refresh takes seconds.
+#
+# Usage:
+#   python season.py                      # render all five games (cached)
+#   python season.py 2 4 5 --no-render    # CSV logs only
+#   python season.py 3 --workers 4        # one game, 4 frame-rendering processes
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))  # the game scripts import the shared modules next to them
+
+from parallel_render import load_game
+
+GAMES = {n: HERE / f"simulation game {n}.py" for n in range(1, 6)}
+
+
+def run_game(n, render=True, workers=1, use_cache=True):
+    """Run one game; returns (game number, files written, cache hit, seconds)."""
+    t0 = time.perf_counter()
+    game = load_game(GAMES[n])
+
+    if not render:
+        state = game.simulate()
+        if game.CSV_OUTPUTS:
+            game.save_logs(state)
+        return n, list(game.CSV_OUTPUTS), False, time.perf_counter() - t0
+
+    from parallel_render import render_game
+    from render_cache import cached_render
+
+    def produce():
+        state = game.simulate()
+        render_game(game, game.GIF_OUTPUT, workers=workers, state=state)
+        if game.CSV_OUTPUTS:
+            game.save_logs(state)
+
+    outputs = [game.GIF_OUTPUT] + list(game.CSV_OUTPUTS)
+    hit = cached_render(game, outputs, produce, enabled=use_cache)
+    return n, outputs, hit, time.perf_counter() - t0
+
+
+def run_season(games=tuple(GAMES), render=True, jobs=None, workers=None, use_cache=True):
+    """Run `games` with up to `jobs` at once; frame workers are split between them."""
+    cores = os.cpu_count() or 1
+    jobs = max(1, min(jobs or cores, len(games)))
+    workers = workers or max(1, cores // jobs)
+    results = []
+    if jobs == 1:
+        for n in games:
+            results.append(run_game(n, render, workers, use_cache))
+    else:
+        with ProcessPoolExecutor(jobs) as pool:
+            futures = [pool.submit(run_game, n, render, workers, use_cache) for n in games]
+            for fut in as_completed(futures):
+                results.append(fut.result())
+    return sorted(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Squid Game Season 1 - run any subset of the five games")
+    parser.add_argument("games", nargs="*", type=int, metavar="GAME", help="game numbers 1-5 (default: all)")
+    parser.add_argument("--no-render", action="store_true",
+                        help="only simulate and write the CSV logs (matplotlib is not imported)")
+    parser.add_argument("--jobs", type=int, default=None, help="games run at once (default: one per core)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="frame rendering processes per game (default: cores / jobs)")
+    parser.add_argument("--no-cache", action="store_true", help="re-render even when inputs are unchanged")
+    args = parser.parse_args()
+    if set(args.games) - set(GAMES):
+        parser.error(f"unknown game(s): {sorted(set(args.games) - set(GAMES))} (choose from 1-5)")
+
+    t0 = time.perf_counter()
+    results = run_season(tuple(dict.fromkeys(args.games)) or tuple(GAMES), render=not args.no_render,
+                         jobs=args.jobs, workers=args.workers, use_cache=not args.no_cache)
+    for n, outputs, hit, seconds in results:
+        print(f"Game {n}: {seconds:6.2f}s{'  (cached)' if hit else ''}  {', '.join(outputs) or '(no logs)'}")
+    print(f"Season done in {time.perf_counter() - t0:.2f}s")
@@ -2,11 +2,14 @@
 # Squid Game - Game 1 (Redlight, Greenlight)
 # ============================================
 
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
-from matplotlib.patches import Patch
+from render_cache import cached_render
 
 # ------------------------
 # Manual Data Input
@@ -33,134 +36,336 @@ df = pd.DataFrame(data)
 total_players = 456
 field_length = 30   # Y-axis units
 field_width  = 40   # X-axis units
-np.random.seed(42)
+SEED = 42
+FPS = 4
+GIF_OUTPUT = "squidgame_redlight.gif"
+CSV_OUTPUTS = []   # the render itself writes no logs
+
+# Highlighted players: 324 sprints right, 250 sprints left
+PLAYER_250, PLAYER_324 = 250, 324
 
-# Spread players across width; start at y=0
-players_x = np.random.uniform(-field_width/2, field_width/2, total_players)
-players_y = np.zeros(total_players)
+# Status codes (int8)
+ALIVE, ELIMINATED = 0, 1
 
-# Colors / statuses
+# Color codes -> COLOR_NAMES
 # cyan = alive (generic), lime = player 250, orange = player 324, red = eliminated
-colors = ["cyan"] * total_players
-players_x[324] = +1.0  # 324 on the right
-players_x[250] = -1.0  # 250 on the left
-colors[324] = "orange"
-colors[250] = "lime"
+CYAN, LIME, ORANGE, RED = 0, 1, 2, 3
+COLOR_NAMES = ["cyan", "lime", "orange", "red"]
 
 # ------------------------
-# Plot Setup (Squid Game nuance)
+# State Engine (struct of arrays)
 # ------------------------
-fig, ax = plt.subplots(figsize=(10,6))
-ax.set_facecolor("black")
-ax.set_xlim(-field_width/2, field_width/2)
-ax.set_ylim(-2, field_length+2)
-
-# Title at bottom (no emoji -> no font warnings)
-fig.subplots_adjust(bottom=0.22)
-ax.set_title("Squid Game — Red Light, Green Light",
-             fontsize=14, weight="bold", y=-0.15, color="#ff007f")
-
-# Clean arena (no ticks/labels)
-ax.set_xticks([]); ax.set_yticks([])
-
-# Start/Finish lines in hot pink
-ax.axhline(0, color="#ff007f", linewidth=2)
-ax.text(-field_width/2+1, -1.5, "START", fontsize=12, color="#ff007f", weight="bold")
-ax.axhline(field_length, color="#ff007f", linewidth=2)
-ax.text(-field_width/2+1, field_length+0.5, "FINISH", fontsize=12, color="#ff007f", weight="bold")
-
-# Field length text (center)
-ax.text(0, field_length/2, f"{field_length} meters", fontsize=11, ha="center", va="center",
-        color="white", alpha=0.6, style="italic")
-
-# Scatter + status text
-scat = ax.scatter(players_x, players_y, c=colors, s=12, edgecolor="white", linewidth=0.3)
-status_text = ax.text(-field_width/2+1, field_length+1, "", fontsize=11, ha="left", color="white")
-
-# Legend (no emoji)
-legend_handles = [
-    Patch(facecolor="cyan",   edgecolor="white", label="Alive"),
-    Patch(facecolor="lime",   edgecolor="white", label="Player 250"),
-    Patch(facecolor="orange", edgecolor="white", label="Player 324"),
-    Patch(facecolor="red",    edgecolor="white", label="Eliminated"),
-]
-legend = ax.legend(handles=legend_handles, loc="lower center", ncol=4,
-                   bbox_to_anchor=(0.5, -0.28), frameon=False)
-for t in legend.get_texts():
-    t.set_color("white")
+class RedLightEngine:
+    """Player state as flat arrays; every round is a few vectorized mask ops.
+
+    `alive_idx` holds the survivor indices (ascending) and is compacted in place
+    on each elimination, so no round ever rescans the full roster.
+    """
+
+    def __init__(self, n_players=total_players, rng=None):
+        self.rng = rng if rng is not None else np.random.RandomState(SEED)
+        self.n_players = n_players
+
+        # Spread players across width; start at y=0
+        self.x = self.rng.uniform(-field_width/2, field_width/2, n_players).astype(np.float32)
+        self.y = np.zeros(n_players, dtype=np.float32)
+        self.status = np.full(n_players, ALIVE, dtype=np.int8)
+        self.base_color = np.full(n_players, CYAN, dtype=np.int8)
+        self.alive_idx = np.arange(n_players)
+
+        self.has_specials = n_players > PLAYER_324
+        if self.has_specials:
+            self.x[PLAYER_324] = +1.0  # 324 on the right
+            self.x[PLAYER_250] = -1.0  # 250 on the left
+            self.base_color[PLAYER_324] = ORANGE
+            self.base_color[PLAYER_250] = LIME
+
+    @property
+    def n_alive(self):
+        return len(self.alive_idx)
+
+    def eliminate(self, ids):
+        self.status[ids] = ELIMINATED
+        self.alive_idx = self.alive_idx[self.status[self.alive_idx] == ALIVE]
+
+    def advance(self, ids, low, high):
+        self.y[ids] = np.minimum(self.y[ids] + self.rng.uniform(low, high, len(ids)), field_length)
+
+    def apply_round(self, rnd, status, survived, final=False):
+        if status == "Backfacing":
+            if rnd == 1:
+                # First backfacing: 324 & 250 sprint; others tiny shuffle
+                if self.has_specials:
+                    self.y[PLAYER_324] = 8.0
+                    self.y[PLAYER_250] = 7.5
+                generic = self.alive_idx[self.base_color[self.alive_idx] == CYAN]
+                self.advance(generic, 0.1, 0.3)
+            else:
+                # Later backfacings: every survivor advances at least 5m
+                self.advance(self.alive_idx, 5.0, 7.0)
+
+        else:  # Facing
+            if rnd == 2 and self.has_specials:
+                # Only Player 324 eliminated at first facing
+                self.eliminate([PLAYER_324])
+            elif rnd != 2:
+                # Generic elimination to match target survivors for this row
+                to_eliminate = self.n_alive - survived
+                if to_eliminate > 0:
+                    self.eliminate(self.rng.choice(self.alive_idx, to_eliminate, replace=False))
+
+        # Special: Round 3 (mass panic) — eliminate Player 250 + place him near the group
+        if rnd == 3 and self.has_specials:
+            self.y[PLAYER_250] = self.rng.uniform(2.0, 4.0)  # behind 324, near front of group
+            self.eliminate([PLAYER_250])
 
-round_idx = [0]
+        # Final frame: ensure survivors reach finish line
+        if final:
+            self.y[self.alive_idx] = field_length
+
+    def offsets(self):
+        return np.column_stack([self.x, self.y])
+
+    def color_codes(self):
+        return np.where(self.status == ELIMINATED, RED, self.base_color)
+
+
+def scale_rounds(rounds, n_players):
+    """Rescale the survivor targets of the round table to `n_players`."""
+    scaled = rounds.copy()
+    factor = n_players / total_players
+    scaled["survived"] = (rounds["survived"] * factor).round().astype(int)
+    scaled["eliminated"] = n_players - scaled["survived"]
+    return scaled
+
+
+def run_rounds(engine, rounds):
+    last_round = rounds["round"].max()
+    for row in rounds.itertuples(index=False):
+        engine.apply_round(row.round, row.status, row.survived, final=row.round == last_round)
+    return engine
+
+
+def benchmark_engine(sizes=(456, 10_000, 100_000, 1_000_000), repeats=3):
+    """Time a full game (all rounds of `data`) for growing player counts."""
+    results = []
+    for n in sizes:
+        rounds = scale_rounds(df, n)
+        best = float("inf")
+        for r in range(repeats):
+            engine = RedLightEngine(n, rng=np.random.RandomState(SEED + r))
+            t0 = time.perf_counter()
+            run_rounds(engine, rounds)
+            best = min(best, time.perf_counter() - t0)
+        results.append({"players": n, "game_ms": best * 1e3,
+                        "round_ms": best * 1e3 / len(rounds),
+                        "ns_per_player_round": best * 1e9 / (n * len(rounds)),
+                        "survivors": engine.n_alive})
+    return pd.DataFrame(results)
 
 # ------------------------
-# Animation Update
+# Headless Monte Carlo (seed x player)
 # ------------------------
-def update(frame):
-    idx = round_idx[0]
-    if idx >= len(df):
-        return scat,
-
-    row = df.iloc[idx]
-    status = row["status"]
-    survived = row["survived"]
-
-    if status == "Backfacing":
-        if row["round"] == 1:
-            # First backfacing: 324 & 250 sprint; others tiny shuffle
-            players_y[324] = 8.0
-            players_y[250] = 7.5
-            for i, c in enumerate(colors):
-                if c == "cyan":
-                    players_y[i] += np.random.uniform(0.1, 0.3)
-        else:
-            # Later backfacings: every survivor advances at least 5m
-            for i, c in enumerate(colors):
-                if c in ["cyan", "lime", "orange"]:  # survivors
-                    players_y[i] += np.random.uniform(5.0, 7.0)
-                    if players_y[i] > field_length:
-                        players_y[i] = field_length
-
-    else:  # Facing
-        if row["round"] == 2:
-            # Only Player 324 eliminated at first facing
-            colors[324] = "red"
-        else:
-            # Generic elimination to match target survivors for this row
-            current_survivors = [i for i, c in enumerate(colors) if c in ["cyan", "lime", "orange"]]
-            to_eliminate = len(current_survivors) - survived
-            if to_eliminate > 0:
-                eliminate_ids = np.random.choice(current_survivors, to_eliminate, replace=False)
-                for eid in eliminate_ids:
-                    colors[eid] = "red"
-
-    # Special: Round 3 (mass panic) — eliminate Player 250 + place him near the group
-    if row["round"] == 3:
-        players_y[250] = np.random.uniform(2.0, 4.0)  # behind 324, near front of group
-        colors[250] = "red"
-
-    # Final frame: ensure survivors reach finish line
-    if row["round"] == df["round"].max():
-        for i, c in enumerate(colors):
-            if c in ["cyan", "lime", "orange"]:
-                players_y[i] = field_length
-
-    # Update plot elements
-    scat.set_offsets(np.c_[players_x, players_y])
-    scat.set_facecolor(colors)
-    status_text.set_text(
-        f"Round {row['round']}  |  {status}  |  Time left: {row['time']:.2f} min   "
-        f"Alive: {row['survived']}  |  Eliminated: {row['eliminated']}"
-    )
-
-    round_idx[0] += 1
-    return scat, status_text
+def simulate_batch(seeds, rounds=df, n_players=total_players):
+    """Play one game per seed at once as a 2-D (seed x player) array computation.
+
+    Every seed draws from its own stream, so its game does not depend on the
+    batch it runs in. Returns (survivors per round with shape seed x round,
+    final survivor count per player).
+    """
+    n_sims = len(seeds)
+    rngs = [np.random.default_rng(int(s)) for s in seeds]
+    rows = np.arange(n_sims)
+    has_specials = n_players > PLAYER_324
+
+    alive = np.ones((n_sims, n_players), dtype=bool)
+    survivors = np.zeros((n_sims, len(rounds)), dtype=np.int32)
+
+    for r, row in enumerate(rounds.itertuples(index=False)):
+        # Backfacing rounds only move players; positions never decide who is eliminated
+        if row.status == "Facing":
+            if row.round == 2 and has_specials:
+                alive[:, PLAYER_324] = False
+            elif row.round != 2:
+                # Per-seed random pick of (alive - target) players: the k smallest random keys
+                to_eliminate = alive.sum(axis=1) - row.survived
+                draws = np.stack([rng.random(n_players) for rng in rngs])   # every seed draws, needed or not
+                if (to_eliminate > 0).any():
+                    keys = np.where(alive, draws, 2.0)
+                    k = np.maximum(to_eliminate - 1, 0)
+                    kth = np.partition(keys, np.unique(k), axis=1)[rows, k]
+                    alive &= ~((keys <= kth[:, None]) & (to_eliminate > 0)[:, None])
+
+        if row.round == 3 and has_specials:
+            alive[:, PLAYER_250] = False
+
+        survivors[:, r] = alive.sum(axis=1)
+
+    return survivors, alive.sum(axis=0)
+
+
+def _simulate_batch_job(args):
+    seeds, rounds, n_players = args
+    return simulate_batch(seeds, rounds, n_players)
+
+
+def run_monte_carlo(n_sims=10_000, batch_size=1_000, workers=None, seed=0,
+                    rounds=df, n_players=total_players):
+    """Spread `n_sims` seeded games over a process pool in (batch x player) chunks.
+
+    Returns a dict with the per-round survivor distribution, the per-player
+    final-survival frequency and the achieved throughput.
+    """
+    seeds = np.arange(seed, seed + n_sims)
+    jobs = [(batch, rounds, n_players) for batch in np.array_split(seeds, max(1, -(-n_sims // batch_size)))]
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_simulate_batch_job, jobs))
+    elapsed = time.perf_counter() - t0
+
+    survivors = np.concatenate([s for s, _ in results])
+    final_counts = np.sum([c for _, c in results], axis=0)
+
+    by_round = pd.DataFrame({
+        "round": rounds["round"].values,
+        "status": rounds["status"].values,
+        "target_survived": rounds["survived"].values,
+        "mean": survivors.mean(axis=0),
+        "std": survivors.std(axis=0),
+        "min": survivors.min(axis=0),
+        "p05": np.percentile(survivors, 5, axis=0),
+        "p50": np.percentile(survivors, 50, axis=0),
+        "p95": np.percentile(survivors, 95, axis=0),
+        "max": survivors.max(axis=0),
+    })
+    by_player = pd.DataFrame({
+        "player": np.arange(n_players),
+        "final_survivals": final_counts,
+        "survival_rate": final_counts / n_sims,
+    })
+    return {"survivors_by_round": by_round, "player_survival": by_player,
+            "n_sims": n_sims, "seconds": elapsed, "sims_per_sec": n_sims / elapsed}
+
+# ------------------------
+# Per-frame state (one frame per round)
+# ------------------------
+def simulate():
+    """Play the scripted game once and keep positions/colors/HUD text for every round."""
+    engine = RedLightEngine(total_players)
+    last_round = df["round"].max()
+    xy = np.empty((len(df), total_players, 2), dtype=np.float32)
+    colors = np.empty((len(df), total_players), dtype=np.int8)
+    hud = []
+    for r, row in enumerate(df.itertuples(index=False)):
+        engine.apply_round(row.round, row.status, row.survived, final=row.round == last_round)
+        xy[r] = engine.offsets()
+        colors[r] = engine.color_codes()
+        hud.append(f"Round {row.round}  |  {row.status}  |  Time left: {row.time:.2f} min   "
+                   f"Alive: {row.survived}  |  Eliminated: {row.eliminated}")
+    return {"n_frames": len(df), "xy": xy, "colors": colors, "hud": hud}
+
+# ------------------------
+# Plot Setup (Squid Game nuance)
+# ------------------------
+def build_figure(state):
+    # matplotlib is only imported to draw; season.py --no-render never loads it
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import to_rgba_array
+    from matplotlib.patches import Patch
+
+    fig, ax = plt.subplots(figsize=(10,6))
+    ax.set_facecolor("black")
+    ax.set_xlim(-field_width/2, field_width/2)
+    ax.set_ylim(-2, field_length+2)
+
+    # Title at bottom (no emoji -> no font warnings)
+    fig.subplots_adjust(bottom=0.22)
+    ax.set_title("Squid Game — Red Light, Green Light",
+                 fontsize=14, weight="bold", y=-0.15, color="#ff007f")
+
+    # Clean arena (no ticks/labels)
+    ax.set_xticks([]); ax.set_yticks([])
+
+    # Start/Finish lines in hot pink
+    ax.axhline(0, color="#ff007f", linewidth=2)
+    ax.text(-field_width/2+1, -1.5, "START", fontsize=12, color="#ff007f", weight="bold")
+    ax.axhline(field_length, color="#ff007f", linewidth=2)
+    ax.text(-field_width/2+1, field_length+0.5, "FINISH", fontsize=12, color="#ff007f", weight="bold")
+
+    # Field length text (center)
+    ax.text(0, field_length/2, f"{field_length} meters", fontsize=11, ha="center", va="center",
+            color="white", alpha=0.6, style="italic")
+
+    # Scatter + status text
+    palette = to_rgba_array(COLOR_NAMES)
+    scat = ax.scatter(state["xy"][0, :, 0], state["xy"][0, :, 1], c=palette[state["colors"][0]], s=12,
+                      edgecolor="white", linewidth=0.3)
+    status_text = ax.text(-field_width/2+1, field_length+1, "", fontsize=11, ha="left", color="white")
+
+    # Legend (no emoji)
+    legend_handles = [
+        Patch(facecolor="cyan",   edgecolor="white", label="Alive"),
+        Patch(facecolor="lime",   edgecolor="white", label="Player 250"),
+        Patch(facecolor="orange", edgecolor="white", label="Player 324"),
+        Patch(facecolor="red",    edgecolor="white", label="Eliminated"),
+    ]
+    legend = ax.legend(handles=legend_handles, loc="lower center", ncol=4,
+                       bbox_to_anchor=(0.5, -0.28), frameon=False)
+    for t in legend.get_texts():
+        t.set_color("white")
+
+    # ------------------------
+    # Frame drawing (reads state only)
+    # ------------------------
+    def draw(i):
+        scat.set_offsets(state["xy"][i])
+        scat.set_facecolor(palette[state["colors"][i]])
+        status_text.set_text(state["hud"][i])
+        return scat, status_text
+
+    return fig, draw
+
+def cache_inputs():
+    """Everything the rendered GIF depends on besides the code (see render_cache.py)."""
+    return {"rounds": df, "players": total_players, "field": (field_length, field_width),
+            "seed": SEED, "fps": FPS}
 
 # ------------------------
 # Animate & Save
 # ------------------------
-ani = animation.FuncAnimation(fig, update, frames=len(df), interval=1200, repeat=False)
-ani.save("squidgame_redlight.gif", writer="pillow", fps=4)
+def render_gif(out_name=GIF_OUTPUT, workers=None):
+    from parallel_render import render_game
+    run = render_game(sys.modules[__name__], out_name, workers=workers)
+    print(f"Simulation complete. GIF saved as '{out_name}' "
+          f"({run['n_frames']} frames, {run['workers']} worker(s), {run['seconds']:.2f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Squid Game - Game 1 (Red Light, Green Light)")
+    parser.add_argument("--bench", action="store_true",
+                        help="benchmark the state engine from 456 to 1M players instead of rendering")
+    parser.add_argument("--monte-carlo", type=int, metavar="N",
+                        help="run N seeded games headless (no GIF) and save survival distributions")
+    parser.add_argument("--batch-size", type=int, default=1_000, help="seeds per (seed x player) batch")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="process pool size for Monte Carlo and frame rendering (default: all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="always re-render instead of reusing a cached GIF")
+    args = parser.parse_args()
 
-print("Simulation complete. GIF saved as 'squidgame_redlight.gif'")
+    if args.bench:
+        print(benchmark_engine().to_string(index=False))
+    elif args.monte_carlo:
+        mc = run_monte_carlo(args.monte_carlo, batch_size=args.batch_size, workers=args.workers)
+        mc["survivors_by_round"].to_csv("game1_redlight_mc_survivors_by_round.csv", index=False)
+        mc["player_survival"].to_csv("game1_redlight_mc_player_survival.csv", index=False)
+        print(mc["survivors_by_round"].to_string(index=False))
+        print(f"{mc['n_sims']} simulations in {mc['seconds']:.2f}s "
+              f"({mc['sims_per_sec']:,.0f} sims/sec)")
+        print("CSV saved: game1_redlight_mc_survivors_by_round.csv, game1_redlight_mc_player_survival.csv")
+    else:
+        cached_render(sys.modules[__name__], [GIF_OUTPUT], lambda: render_gif(workers=args.workers),
+                      enabled=not args.no_cache)
 
 # (Optional) for Colab User, download:
 # from google.colab import files
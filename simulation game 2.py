@@ -2,11 +2,12 @@
 # Squid Game - Game 2 (Sugar Honeycomb)
 # ============================================
 
+import argparse
+import sys
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import random
+from render_cache import cached_render
 
 # =========================
 # THEME (Squid Game)
@@ -41,21 +42,71 @@ shape_style = {
 # =========================
 # BUILD PLAYERS
 # =========================
-random.seed(42)
-np.random.seed(42)
+SEED = 42
+FPS = 5
+GIF_OUTPUT = "dalgona_step_blend_bottom_title.gif"
 
 line_x_positions = {sh: i*11 + 7 for i, sh in enumerate(shape_order)}
 
-players = []
-for sh in shape_order:
-    row = data[data["shape"]==sh].iloc[0]
-    for i in range(row["failed"]):
-        players.append({"shape": sh, "status": "fail_sched", "x": line_x_positions[sh]+np.random.uniform(-1,1), "y": 28 - i*0.25})
-    for i in range(row["survived"]):
-        players.append({"shape": sh, "status": "working",    "x": line_x_positions[sh]+np.random.uniform(-1,1), "y": 24 - i*0.25})
-
-players = pd.DataFrame(players)
-players["fail_mode"] = None  # "break" or "timeout" for those who will fail
+# Status / fail-mode codes (int8); shape codes index into shape_order
+WORKING, FAIL_SCHED, FAILED, FINISHED = 0, 1, 2, 3
+NO_FAIL, BREAK, TIMEOUT = 0, 1, 2
+FAILED_COLOR = "#8B0000"
+FAILED_FACE = len(shape_order)   # face code of eliminated players (last palette row)
+
+class PlayerStore:
+    """Array-backed player state: int8 codes plus float32 x/y/tx/ty/dx/dy columns.
+
+    Per-shape finished/eliminated counters are kept up to date by set_status(),
+    so reading them never rescans the players.
+    """
+
+    def __init__(self, shape, status, x, y):
+        n = len(shape)
+        self.shape     = np.asarray(shape, dtype=np.int8)
+        self.status    = np.asarray(status, dtype=np.int8)
+        self.finished_by_shape = self._count_by_shape(FINISHED)
+        self.failed_by_shape   = self._count_by_shape(FAILED)
+        self.fail_mode = np.full(n, NO_FAIL, dtype=np.int8)
+        self.x  = np.asarray(x, dtype=np.float32)
+        self.y  = np.asarray(y, dtype=np.float32)
+        self.tx = np.zeros(n, dtype=np.float32); self.ty = np.zeros(n, dtype=np.float32)
+        self.dx = np.zeros(n, dtype=np.float32); self.dy = np.zeros(n, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.shape)
+
+    def _count_by_shape(self, status, idx=slice(None)):
+        m = self.status[idx] == status
+        return np.bincount(self.shape[idx][m], minlength=len(shape_order))
+
+    def set_status(self, idx, status):
+        """Change the status of players `idx`; counter cost is O(len(idx))."""
+        idx = np.asarray(idx, dtype=int)
+        self.finished_by_shape -= self._count_by_shape(FINISHED, idx)
+        self.failed_by_shape   -= self._count_by_shape(FAILED, idx)
+        self.status[idx] = status
+        self.finished_by_shape += self._count_by_shape(FINISHED, idx)
+        self.failed_by_shape   += self._count_by_shape(FAILED, idx)
+
+    def where(self, status):
+        return np.flatnonzero(self.status == status)
+
+    def xy(self, idx=slice(None)):
+        return np.column_stack([self.x[idx], self.y[idx]])
+
+def build_players():
+    shape_codes, status_codes, start_x, start_y = [], [], [], []
+    for code, sh in enumerate(shape_order):
+        row = data[data["shape"]==sh].iloc[0]
+        for n, status, y0 in ((row["failed"], FAIL_SCHED, 28), (row["survived"], WORKING, 24)):
+            shape_codes.append(np.full(n, code))
+            status_codes.append(np.full(n, status))
+            start_x.append(line_x_positions[sh] + np.random.uniform(-1, 1, n))
+            start_y.append(y0 - np.arange(n)*0.25)
+
+    return PlayerStore(np.concatenate(shape_codes), np.concatenate(status_codes),
+                       np.concatenate(start_x), np.concatenate(start_y))
 
 # =========================
 # TIMELINE & POSITIONS
@@ -72,13 +123,15 @@ Y_MAX = 32
 
 scatter_x_range = (5, X_MAX-5)
 scatter_y_range = (7, 20)
-players["tx"] = np.random.uniform(*scatter_x_range, size=len(players))
-players["ty"] = np.random.uniform(*scatter_y_range, size=len(players))
 
 DOOR_Y = Y_MAX - 1
 door_pos = {sh: (line_x_positions[sh], DOOR_Y) for sh in shape_order}
-players["dx"] = players["shape"].map(lambda sh: door_pos[sh][0])
-players["dy"] = players["shape"].map(lambda sh: door_pos[sh][1])
+
+def place_targets(players):
+    players.tx[:] = np.random.uniform(*scatter_x_range, size=len(players))
+    players.ty[:] = np.random.uniform(*scatter_y_range, size=len(players))
+    players.dx[:] = np.array([door_pos[sh][0] for sh in shape_order])[players.shape]
+    players.dy[:] = DOOR_Y
 
 # =========================
 # FAILURE & COMPLETION SCHEDULING
@@ -86,42 +139,46 @@ players["dy"] = players["shape"].map(lambda sh: door_pos[sh][1])
 # Share of failures that should occur exactly at time-out (can't finish in time)
 TIMEOUT_FAIL_FRACTION = 0.20  # 20% at time-out, 80% during carving by break
 
-# Partition failed players into: break vs timeout failures
-fail_pool = players.index[players["status"]=="fail_sched"].tolist()
-random.shuffle(fail_pool)
-n_timeout = int(round(len(fail_pool) * TIMEOUT_FAIL_FRACTION))
-timeout_failers = fail_pool[:n_timeout]           # eliminated at time=0 (can't finish)
-break_failers   = fail_pool[n_timeout:]           # eliminated during carving
+def schedule_outcomes(players):
+    """Split failures into break vs time-out and spread breaks/finishes over the carving frames."""
+    # Partition failed players into: break vs timeout failures
+    fail_pool = players.where(FAIL_SCHED).tolist()
+    random.shuffle(fail_pool)
+    n_timeout = int(round(len(fail_pool) * TIMEOUT_FAIL_FRACTION))
+    timeout_failers = fail_pool[:n_timeout]           # eliminated at time=0 (can't finish)
+    break_failers   = fail_pool[n_timeout:]           # eliminated during carving
 
-# Mark modes
-players.loc[timeout_failers, "fail_mode"] = "timeout"
-players.loc[break_failers,   "fail_mode"] = "break"
+    # Mark modes
+    players.fail_mode[timeout_failers] = TIMEOUT
+    players.fail_mode[break_failers]   = BREAK
 
-# IMPORTANT: Show timeout failers as if they are "working" until time=0
-players.loc[timeout_failers, "status"] = "working"
+    # IMPORTANT: Show timeout failers as if they are "working" until time=0
+    players.set_status(timeout_failers, WORKING)
 
-# Spread break failures across the carving frames
-break_batches = np.array_split(np.array(break_failers), FRAMES_CARVE) if len(break_failers) else [[] for _ in range(FRAMES_CARVE)]
+    # Spread break failures across the carving frames
+    break_batches = np.array_split(np.array(break_failers, dtype=int), FRAMES_CARVE)
 
-# All true survivors must finish before time-out.
-# Workers eligible to finish during carving = everyone "working" EXCEPT timeout-failers
-finish_candidates = players.index[(players["status"]=="working") & (players["fail_mode"].isna())].tolist()
-random.shuffle(finish_candidates)
-finish_batches = np.array_split(np.array(finish_candidates), FRAMES_CARVE) if len(finish_candidates) else [[] for _ in range(FRAMES_CARVE)]
+    # All true survivors must finish before time-out.
+    # Workers eligible to finish during carving = everyone "working" EXCEPT timeout-failers
+    finish_candidates = np.flatnonzero((players.status == WORKING) & (players.fail_mode == NO_FAIL)).tolist()
+    random.shuffle(finish_candidates)
+    finish_batches = np.array_split(np.array(finish_candidates, dtype=int), FRAMES_CARVE)
+    return timeout_failers, break_batches, finish_batches
 
 # =========================
 # LOGGING SETUP
 # =========================
-logs_overall = []
-logs_by_shape = []
-timeout_elim_records = []  # exact players eliminated at time-out
-
-def phase_name(frame):
-    if frame < FRAMES_LINEUP: return "Lineup"
-    if frame < FRAMES_LINEUP + FRAMES_SCATTER: return "Scatter"
-    if frame < FRAMES_LINEUP + FRAMES_SCATTER + FRAMES_CARVE: return "Carving"
-    if frame < FRAMES_LINEUP + FRAMES_SCATTER + FRAMES_CARVE + FRAMES_TIMEOUT: return "Timeout"
-    return "Exit"
+# Columnar logs, one row per frame (x shape), written once after the simulation
+PHASES = ["Lineup", "Scatter", "Carving", "Timeout", "Exit"]
+PHASE_LABELS = ["Line up by shape", "Blending to tables (stepwise)", "Carving (breaks & finishers to doors)",
+                "Time-out: can't finish eliminated", "Finished exit"]
+
+def phase_code(frame):
+    if frame < FRAMES_LINEUP: return 0
+    if frame < FRAMES_LINEUP + FRAMES_SCATTER: return 1
+    if frame < FRAMES_LINEUP + FRAMES_SCATTER + FRAMES_CARVE: return 2
+    if frame < FRAMES_LINEUP + FRAMES_SCATTER + FRAMES_CARVE + FRAMES_TIMEOUT: return 3
+    return 4
 
 def compute_timeleft(frame):
     if frame < FRAMES_LINEUP:
@@ -138,196 +195,231 @@ def compute_timeleft(frame):
     else:
         return 0
 
-def log_frame_snapshot(frame):
-    tl = compute_timeleft(frame)
-    ph = phase_name(frame)
-
-    finished_total = int((players["status"] == "finished").sum())
-    eliminated_total = int((players["status"] == "failed").sum())
-
-    logs_overall.append({
-        "frame": frame, "timeleft": tl, "phase": ph,
-        "finished_total": finished_total, "eliminated_total": eliminated_total
-    })
-
-    for sh in shape_order:
-        m = (players["shape"] == sh)
-        fin_c = int((players.loc[m, "status"] == "finished").sum())
-        fail_c = int((players.loc[m, "status"] == "failed").sum())
-        logs_by_shape.append({
-            "frame": frame, "timeleft": tl, "phase": ph, "shape": sh,
-            "finished_cum": fin_c, "eliminated_cum": fail_c
-        })
-
 # =========================
-# ANIMATION
+# MOTION
 # =========================
-fig, ax = plt.subplots(figsize=(10,7))
-fig.patch.set_facecolor(BG); ax.set_facecolor(BG)
-ax.set_xlim(0, X_MAX+12); ax.set_ylim(0, Y_MAX)
-ax.set_xticks([]); ax.set_yticks([])
-
-fig.subplots_adjust(bottom=0.16)
-fig.text(0.5, 0.09, "Game 2: Sugar Honeycombs (Dalgona)",
-         ha="center", va="center", color=PINK, fontsize=15, fontweight="bold")
-
-subtitle = ax.text(0.5, 1.005, "", transform=ax.transAxes, ha="center", va="bottom", color=TXT, fontsize=11)
-timer_text = ax.text(2, Y_MAX-1.8, "", color=TXT, fontsize=10)
-
-ax.axhline(4, color=GRID, linestyle="--", linewidth=1)
-ax.text(1, 4.4, "Arena", color="#AAAAAA", fontsize=9)
-
-for sh, (dx, dy) in door_pos.items():
-    ax.plot([dx-1.2, dx+1.2], [dy, dy], color=PINK, linewidth=3, solid_capstyle="round")
-    ax.text(dx, dy+0.6, f"{sh} Exit", color=PINK, fontsize=8, ha="center")
-
-scatters = {}
-for sh in shape_order:
-    st = shape_style[sh]
-    scatters[sh] = ax.scatter([], [], s=46, marker=st["marker"], c=st["color"],
-                              alpha=0.95, edgecolor="white", linewidth=0.3, label=sh)
-leg = ax.legend(loc="upper right", facecolor="#1e1e1e", edgecolor="#444", labelcolor="white")
-for t in leg.get_texts(): t.set_color("white")
-
-def apply_offsets():
-    for sh in shape_order:
-        m = players["shape"]==sh
-        scatters[sh].set_offsets(players.loc[m, ["x","y"]].values)
-
-def move_step(ix, tx, ty, step=0.6, jitter=0.02):
+def move_step(players, ix, tx, ty, step=0.6, jitter=0.02):
+    """Move players `ix` at most `step` towards (tx, ty); closer ones snap onto the target."""
     if len(ix) == 0: return
-    idx = np.array(ix)
-    x = players.loc[idx, "x"].values; y = players.loc[idx, "y"].values
+    x = players.x[ix]; y = players.y[ix]
     dx = tx - x; dy = ty - y
     dist = np.hypot(dx, dy)
-    big = dist > step
-    nx = np.zeros_like(dx); ny = np.zeros_like(dy)
-    nx[big] = dx[big] / dist[big]; ny[big] = dy[big] / dist[big]
-    x[big] += nx[big] * step; y[big] += ny[big] * step
-    x[~big] = tx[~big]; y[~big] = ty[~big]
-    x += np.random.uniform(-0.02,0.02,len(x)); y += np.random.uniform(-0.02,0.02,len(y))
-    players.loc[idx, "x"] = x; players.loc[idx, "y"] = y
-
-def move_towards(ix, tx, ty, rate=0.15, jitter=0.02):
-    if len(ix) == 0: return
-    idx = np.array(ix)
-    x = players.loc[idx, "x"].values; y = players.loc[idx, "y"].values
-    x += (tx - x) * rate + np.random.uniform(-jitter, jitter, len(x))
-    y += (ty - y) * rate + np.random.uniform(-jitter, jitter, len(y))
-    players.loc[idx, "x"] = x; players.loc[idx, "y"] = y
-
-def update(frame):
-    if frame < FRAMES_LINEUP:
-        phase = "Line up by shape"; time_left = 600
-        players["x"] += np.random.uniform(-0.04, 0.04, len(players))
-        players["y"] += np.random.uniform(-0.04, 0.04, len(players))
+    k = np.where(dist > step, step / np.maximum(dist, 1e-9), 1.0)
+    players.x[ix] = x + dx*k + np.random.uniform(-jitter, jitter, len(x))
+    players.y[ix] = y + dy*k + np.random.uniform(-jitter, jitter, len(y))
 
-    elif frame < FRAMES_LINEUP + FRAMES_SCATTER:
-        phase = "Blending to tables (stepwise)"
-        f = frame - FRAMES_LINEUP
-        time_left = int(600 - (f / FRAMES_SCATTER) * 180)
-        move_step(players.index, players["tx"].values, players["ty"].values, step=0.6, jitter=0.03)
-
-    elif frame < FRAMES_LINEUP + FRAMES_SCATTER + FRAMES_CARVE:
-        phase = "Carving (breaks & finishers to doors)"
-        f = frame - (FRAMES_LINEUP + FRAMES_SCATTER)
-        time_left = int(420 - (f / FRAMES_CARVE) * 360)
-
-        # Break eliminations this frame
-        for idx in break_batches[f]:
-            players.loc[idx, "status"] = "failed"
-            players.loc[idx, "y"] -= np.random.uniform(0.35, 0.8)
-
-        # Some workers (true survivors) finish this frame
-        for idx in finish_batches[f]:
-            if players.loc[idx, "status"] == "working":
-                players.loc[idx, "status"] = "finished"
-
-        # Motion
-        fin = players.index[players["status"]=="finished"]
-        if len(fin): move_towards(fin, players.loc[fin,"dx"].values, players.loc[fin,"dy"].values, rate=0.15, jitter=0.02)
-        still = players.index[(players["status"]!="finished") & (players["status"]!="failed")]
-        if len(still):
-            players.loc[still, "x"] += np.random.uniform(-0.05, 0.05, len(still))
-            players.loc[still, "y"] += np.random.uniform(-0.05, 0.05, len(still))
+def move_towards(players, ix, tx, ty, rate=0.15, jitter=0.02):
+    if len(ix) == 0: return
+    x = players.x[ix]; y = players.y[ix]
+    players.x[ix] = x + (tx - x) * rate + np.random.uniform(-jitter, jitter, len(x))
+    players.y[ix] = y + (ty - y) * rate + np.random.uniform(-jitter, jitter, len(y))
 
-    elif frame < FRAMES_LINEUP + FRAMES_SCATTER + FRAMES_CARVE + FRAMES_TIMEOUT:
-        phase = "Time-out: can't finish eliminated"
-        f = frame - (FRAMES_LINEUP + FRAMES_SCATTER + FRAMES_CARVE)
-        time_left = max(0, int(60 - (f+1) * (60/FRAMES_TIMEOUT)))
+def move_finished_to_doors(players, rate):
+    fin = players.where(FINISHED)
+    move_towards(players, fin, players.dx[fin], players.dy[fin], rate=rate, jitter=0.02)
 
-        if f == 0:
-            # Eliminate ONLY the designated timeout-failers now
-            if len(timeout_failers):
-                players.loc[timeout_failers, "status"] = "failed"
-                players.loc[timeout_failers, "y"] -= np.random.uniform(0.25, 0.6, len(timeout_failers))
+# =========================
+# SIMULATION (every frame, no drawing)
+# =========================
+def simulate():
+    """Seeded run of the whole timeline; returns per-frame positions/colors plus the CSV logs."""
+    random.seed(SEED)
+    np.random.seed(SEED)
+    players = build_players()
+    place_targets(players)
+    timeout_failers, break_batches, finish_batches = schedule_outcomes(players)
+
+    n = len(players)
+    xy   = np.empty((TOTAL_FRAMES, n, 2), dtype=np.float32)
+    face = np.empty((TOTAL_FRAMES, n), dtype=np.int8)
+    log_timeleft = np.zeros(TOTAL_FRAMES, dtype=np.int32)
+    log_phase    = np.zeros(TOTAL_FRAMES, dtype=np.int8)
+    log_finished = np.zeros((TOTAL_FRAMES, len(shape_order)), dtype=np.int32)
+    log_failed   = np.zeros((TOTAL_FRAMES, len(shape_order)), dtype=np.int32)
+    timeout_elim_records = []  # exact players eliminated at time-out
+
+    for frame in range(TOTAL_FRAMES):
+        phase = phase_code(frame)
+        time_left = compute_timeleft(frame)
+
+        if phase == 0:
+            players.x += np.random.uniform(-0.04, 0.04, n)
+            players.y += np.random.uniform(-0.04, 0.04, n)
+
+        elif phase == 1:
+            move_step(players, np.arange(n), players.tx, players.ty, step=0.6, jitter=0.03)
+
+        elif phase == 2:
+            f = frame - (FRAMES_LINEUP + FRAMES_SCATTER)
+
+            # Break eliminations this frame
+            brk = break_batches[f]
+            players.set_status(brk, FAILED)
+            players.y[brk] -= np.random.uniform(0.35, 0.8, len(brk))
+
+            # Some workers (true survivors) finish this frame
+            fin_now = finish_batches[f]
+            players.set_status(fin_now[players.status[fin_now] == WORKING], FINISHED)
+
+            # Motion
+            move_finished_to_doors(players, rate=0.15)
+            still = np.flatnonzero((players.status != FINISHED) & (players.status != FAILED))
+            if len(still):
+                players.x[still] += np.random.uniform(-0.05, 0.05, len(still))
+                players.y[still] += np.random.uniform(-0.05, 0.05, len(still))
+
+        elif phase == 3:
+            f = frame - (FRAMES_LINEUP + FRAMES_SCATTER + FRAMES_CARVE)
+            if f == 0 and len(timeout_failers):
+                # Eliminate ONLY the designated timeout-failers now
+                players.set_status(timeout_failers, FAILED)
+                players.y[timeout_failers] -= np.random.uniform(0.25, 0.6, len(timeout_failers))
                 # Log who they are
                 for idx in timeout_failers:
                     timeout_elim_records.append({
                         "frame": frame,
                         "timeleft": time_left,
                         "player_index": int(idx),
-                        "shape": players.loc[idx, "shape"]
+                        "shape": shape_order[players.shape[idx]]
                     })
-        # Finished keep moving to doors
-        fin = players.index[players["status"]=="finished"]
-        if len(fin): move_towards(fin, players.loc[fin,"dx"].values, players.loc[fin,"dy"].values, rate=0.12, jitter=0.02)
+            # Finished keep moving to doors
+            move_finished_to_doors(players, rate=0.12)
 
-    else:
-        phase = "Finished exit"; time_left = 0
-        fin = players.index[players["status"]=="finished"]
-        if len(fin): move_towards(fin, players.loc[fin,"dx"].values, players.loc[fin,"dy"].values, rate=0.10, jitter=0.02)
+        else:
+            move_finished_to_doors(players, rate=0.10)
 
-    # Colors
-    face = []
-    for i in players.index:
-        sh = players.loc[i, "shape"]; base = shape_style[sh]["color"]
-        st = players.loc[i, "status"]
-        face.append("#8B0000" if st=="failed" else base)
+        xy[frame] = players.xy()
+        face[frame] = np.where(players.status == FAILED, FAILED_FACE, players.shape)
+        log_timeleft[frame] = time_left
+        log_phase[frame]    = phase
+        log_finished[frame] = players.finished_by_shape
+        log_failed[frame]   = players.failed_by_shape
 
-    for sh in shape_order:
-        m = players["shape"]==sh
-        scatters[sh].set_color(np.array(face)[m])
-        scatters[sh].set_offsets(players.loc[m, ["x","y"]].values)
+    return {"n_frames": TOTAL_FRAMES, "xy": xy, "face": face,
+            "shape_members": [np.flatnonzero(players.shape == code) for code in range(len(shape_order))],
+            "log_timeleft": log_timeleft, "log_phase": log_phase,
+            "log_finished": log_finished, "log_failed": log_failed,
+            "timeout_elim_records": timeout_elim_records}
+
+# =========================
+# ANIMATION
+# =========================
+def build_figure(state):
+    # matplotlib is only imported to draw; season.py --no-render never loads it
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import to_rgba_array
+
+    fig, ax = plt.subplots(figsize=(10,7))
+    fig.patch.set_facecolor(BG); ax.set_facecolor(BG)
+    ax.set_xlim(0, X_MAX+12); ax.set_ylim(0, Y_MAX)
+    ax.set_xticks([]); ax.set_yticks([])
+
+    fig.subplots_adjust(bottom=0.16)
+    fig.text(0.5, 0.09, "Game 2: Sugar Honeycombs (Dalgona)",
+             ha="center", va="center", color=PINK, fontsize=15, fontweight="bold")
+
+    subtitle = ax.text(0.5, 1.005, "", transform=ax.transAxes, ha="center", va="bottom", color=TXT, fontsize=11)
+    timer_text = ax.text(2, Y_MAX-1.8, "", color=TXT, fontsize=10)
+
+    ax.axhline(4, color=GRID, linestyle="--", linewidth=1)
+    ax.text(1, 4.4, "Arena", color="#AAAAAA", fontsize=9)
 
-    # HUD
-    finished = int((players["status"]=="finished").sum())
-    failed   = int((players["status"]=="failed").sum())
-    subtitle.set_text(f"Phase: {phase}   |   Finished (Survived): {finished}   Eliminated: {failed}")
-    timer_text.set_text(f"Time left: {time_left} sec")
+    for sh, (dx, dy) in door_pos.items():
+        ax.plot([dx-1.2, dx+1.2], [dy, dy], color=PINK, linewidth=3, solid_capstyle="round")
+        ax.text(dx, dy+0.6, f"{sh} Exit", color=PINK, fontsize=8, ha="center")
 
-    log_frame_snapshot(frame)
-    return list(scatters.values()) + [subtitle, timer_text]
+    # Face colors: one palette row per shape code, last row for eliminated players
+    face_palette = to_rgba_array([shape_style[sh]["color"] for sh in shape_order] + [FAILED_COLOR])
 
-ani = animation.FuncAnimation(fig, update, frames=TOTAL_FRAMES, interval=200, blit=False, repeat=False)
+    scatters = {}
+    for sh in shape_order:
+        st = shape_style[sh]
+        scatters[sh] = ax.scatter([], [], s=46, marker=st["marker"], c=st["color"],
+                                  alpha=0.95, edgecolor="white", linewidth=0.3, label=sh)
+    leg = ax.legend(loc="upper right", facecolor="#1e1e1e", edgecolor="#444", labelcolor="white")
+    for t in leg.get_texts(): t.set_color("white")
+
+    def draw(frame):
+        xy, face = state["xy"][frame], face_palette[state["face"][frame]]
+        for code, sh in enumerate(shape_order):
+            m = state["shape_members"][code]
+            scatters[sh].set_color(face[m])
+            scatters[sh].set_offsets(xy[m])
+
+        # HUD
+        finished = int(state["log_finished"][frame].sum())
+        failed   = int(state["log_failed"][frame].sum())
+        phase = PHASE_LABELS[state["log_phase"][frame]]
+        subtitle.set_text(f"Phase: {phase}   |   Finished (Survived): {finished}   Eliminated: {failed}")
+        timer_text.set_text(f"Time left: {state['log_timeleft'][frame]} sec")
+        return list(scatters.values()) + [subtitle, timer_text]
+
+    return fig, draw
+
+def cache_inputs():
+    """Everything the GIF and CSVs depend on besides the code (see render_cache.py)."""
+    return {"counts": data, "order": shape_order, "seed": SEED, "fps": FPS,
+            "frames": (FRAMES_LINEUP, FRAMES_SCATTER, FRAMES_CARVE, FRAMES_TIMEOUT, FRAMES_EXIT),
+            "timeout_fraction": TIMEOUT_FAIL_FRACTION}
 
 # Save GIF
-out_name = "dalgona_step_blend_bottom_title.gif"
-ani.save(out_name, writer="pillow", fps=5)
-print(f"Simulation complete. GIF saved as '{out_name}'")
+def render_gif(out_name=GIF_OUTPUT, workers=None, state=None):
+    from parallel_render import render_game
+    run = render_game(sys.modules[__name__], out_name, workers=workers, state=state)
+    print(f"Simulation complete. GIF saved as '{out_name}' "
+          f"({run['n_frames']} frames, {run['workers']} worker(s), {run['seconds']:.2f}s)")
+    return run["state"]
 
 # ---- BUILD & SAVE CSVs ----
-df_overall = pd.DataFrame(logs_overall)
-df_by_shape_cum = pd.DataFrame(logs_by_shape).sort_values(["frame","shape"]).reset_index(drop=True)
-
-# Per-step (diff) by shape — aligned & non-negative
-df_by_shape_step = df_by_shape_cum.copy()
-df_by_shape_step["finished_step"] = (
-    df_by_shape_step.groupby("shape")["finished_cum"].diff().fillna(df_by_shape_step["finished_cum"]).clip(lower=0).astype(int)
-)
-df_by_shape_step["eliminated_step"] = (
-    df_by_shape_step.groupby("shape")["eliminated_cum"].diff().fillna(df_by_shape_step["eliminated_cum"]).clip(lower=0).astype(int)
-)
-
-# Timeout eliminated players (exact list, will be used for vizualization)
-df_timeout_players = pd.DataFrame(timeout_elim_records)
-df_overall.to_csv("game2_dalgona_overall_by_frame.csv", index=False)
-df_by_shape_cum.to_csv("game2_dalgona_per_shape_cum.csv", index=False)
-df_by_shape_step.to_csv("game2_dalgona_per_shape_step.csv", index=False)
-df_timeout_players.to_csv("game2_dalgona_timeout_players.csv", index=False)
-
-print("CSV saved:",
-      "game2_dalgona_overall_by_frame.csv,",
-      "game2_dalgona_per_shape_cum.csv,",
-      "game2_dalgona_per_shape_step.csv,",
-      "game2_dalgona_timeout_players.csv")
+CSV_OUTPUTS = ["game2_dalgona_overall_by_frame.csv", "game2_dalgona_per_shape_cum.csv",
+               "game2_dalgona_per_shape_step.csv", "game2_dalgona_timeout_players.csv"]
+
+def save_logs(state):
+    log_timeleft, log_phase = state["log_timeleft"], state["log_phase"]
+    log_finished, log_failed = state["log_finished"], state["log_failed"]
+    frames = np.arange(TOTAL_FRAMES)
+    phases = np.array(PHASES, dtype=object)[log_phase]
+    df_overall = pd.DataFrame({
+        "frame": frames, "timeleft": log_timeleft, "phase": phases,
+        "finished_total": log_finished.sum(axis=1), "eliminated_total": log_failed.sum(axis=1),
+    })
+
+    # Long format (frame x shape), shapes in alphabetical order within each frame
+    by_name = np.argsort(shape_order)
+    n_shapes = len(shape_order)
+    df_by_shape_cum = pd.DataFrame({
+        "frame": np.repeat(frames, n_shapes),
+        "timeleft": np.repeat(log_timeleft, n_shapes),
+        "phase": np.repeat(phases, n_shapes),
+        "shape": np.tile(np.array(shape_order, dtype=object)[by_name], TOTAL_FRAMES),
+        "finished_cum": log_finished[:, by_name].ravel(),
+        "eliminated_cum": log_failed[:, by_name].ravel(),
+    })
+
+    # Per-step (diff) by shape — aligned & non-negative
+    df_by_shape_step = df_by_shape_cum.copy()
+    df_by_shape_step["finished_step"] = np.diff(log_finished[:, by_name], axis=0, prepend=0).clip(min=0).ravel()
+    df_by_shape_step["eliminated_step"] = np.diff(log_failed[:, by_name], axis=0, prepend=0).clip(min=0).ravel()
+
+    # Timeout eliminated players (exact list, will be used for vizualization)
+    df_timeout_players = pd.DataFrame(state["timeout_elim_records"])
+    df_overall.to_csv("game2_dalgona_overall_by_frame.csv", index=False)
+    df_by_shape_cum.to_csv("game2_dalgona_per_shape_cum.csv", index=False)
+    df_by_shape_step.to_csv("game2_dalgona_per_shape_step.csv", index=False)
+    df_timeout_players.to_csv("game2_dalgona_timeout_players.csv", index=False)
+
+    print("CSV saved:",
+          "game2_dalgona_overall_by_frame.csv,",
+          "game2_dalgona_per_shape_cum.csv,",
+          "game2_dalgona_per_shape_step.csv,",
+          "game2_dalgona_timeout_players.csv")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Squid Game - Game 2 (Sugar Honeycombs)")
+    parser.add_argument("--workers", type=int, default=None, help="frame rendering processes (default: all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="always re-render instead of reusing cached outputs")
+    args = parser.parse_args()
+
+    cached_render(sys.modules[__name__], [GIF_OUTPUT] + CSV_OUTPUTS,
+                  lambda: save_logs(render_gif(workers=args.workers)), enabled=not args.no_cache)
@@ -5,12 +5,14 @@
 # Modified: Use exact team order provided by user
 # ============================================
 
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 from io import StringIO
-from matplotlib.patches import Rectangle
+from render_cache import cached_render
 
 # ----------------------
 # THEME
@@ -125,10 +127,121 @@ team_to_players = {
     for t, df in roster_df.groupby("team_name", sort=False)
 }
 
+# ----------------------
+# STRENGTH MODEL (tournament simulation)
+# ----------------------
+GENDER_STRENGTH = {"Male": 1.00, "Female": 0.82}
+# Role by rope slot in roster order: first listed pulls at the front, last listed anchors
+ROLES = ["front", "middle", "anchor"]
+ROLE_STRENGTH  = np.array([1.05, 1.00, 1.15])
+ROLE_ENDURANCE = np.array([14.0, 20.0, 28.0])   # fatigue time constant (s)
+FATIGUE_FLOOR  = 0.55   # share of strength left when fully exhausted
+FORM_SIGMA     = 0.12   # match-day form (lognormal sigma per player)
+
+MATCH_DT, MATCH_SECONDS = 1.0, 60   # integration step & time limit
+ROPE_GAIN   = 1.5    # m/s of rope travel per unit of relative force difference
+ROPE_NOISE  = 0.25   # m/sqrt(s) random surges
+WIN_MARGIN  = 2.0    # m of rope travel that drags the loser into the gap
+
+def slot_roles(n=10):
+    roles = np.ones(n, dtype=int)
+    roles[0], roles[-1] = 0, 2
+    return roles
+
+TEAMS = list(team_to_players)
+team_strength = np.stack([
+    team_to_players[t]["gender"].map(GENDER_STRENGTH).values * ROLE_STRENGTH[slot_roles()]
+    for t in TEAMS
+])                                                     # (teams x 10) base strength
+team_roles = np.stack([slot_roles() for _ in TEAMS])   # (teams x 10) role codes
+
+# Fatigue curve per role over the match clock: (roles x steps)
+_t = np.arange(1, MATCH_SECONDS + 1) * MATCH_DT
+role_fatigue = (FATIGUE_FLOOR + (1 - FATIGUE_FLOOR) * np.exp(-_t / ROLE_ENDURANCE[:, None])).astype(np.float32)
+
+def play_matches(left, right, rng):
+    """Integrate rope travel for a batch of matchups (team ids); True where left wins.
+
+    Team force per step is sum(role strength x role fatigue curve), so the whole
+    batch is one (matchups x roles) @ (roles x steps) product plus a cumsum.
+    """
+    n = len(left)
+    form = rng.lognormal(0.0, FORM_SIGMA, size=(n, 2, team_strength.shape[1])).astype(np.float32)
+    force = []
+    for side, ids in enumerate((left, right)):
+        s = team_strength[ids] * form[:, side]
+        by_role = np.stack([(s * (team_roles[ids] == r)).sum(axis=1) for r in range(len(ROLES))], axis=1)
+        force.append(by_role.astype(np.float32) @ role_fatigue)          # (n x steps)
+    drift = ROPE_GAIN * (force[0] - force[1]) / (force[0] + force[1]) * MATCH_DT
+    noise = rng.standard_normal(drift.shape, dtype=np.float32) * (ROPE_NOISE * np.sqrt(MATCH_DT))
+    rope = np.cumsum(drift + noise, axis=1)                             # > 0: pulled to the left
+
+    crossed = np.abs(rope) >= WIN_MARGIN
+    first = np.where(crossed.any(axis=1), crossed.argmax(axis=1), rope.shape[1] - 1)
+    return rope[np.arange(n), first] > 0
+
+def simulate_brackets(n_brackets, seed=0):
+    """Run `n_brackets` single-elimination brackets with random pairings at once.
+
+    Returns per-team counts of (first-round wins, finals reached, titles).
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(TEAMS)
+    alive = rng.permuted(np.tile(np.arange(n_teams), (n_brackets, 1)), axis=1)
+    round_wins = np.zeros((int(np.log2(n_teams)), n_teams), dtype=np.int64)
+    for r in range(round_wins.shape[0]):
+        left, right = alive[:, 0::2], alive[:, 1::2]
+        left_wins = play_matches(left.ravel(), right.ravel(), rng).reshape(left.shape)
+        alive = np.where(left_wins, left, right)
+        round_wins[r] = np.bincount(alive.ravel(), minlength=n_teams)
+    return round_wins
+
+def _simulate_brackets_job(args):
+    return simulate_brackets(*args)
+
+def run_tournament(n_brackets=100_000, batch_size=20_000, workers=None, seed=0):
+    """Spread bracket batches over a process pool; return team & player win probabilities."""
+    n_batches = max(1, -(-n_brackets // batch_size))
+    seeds = np.random.SeedSequence(seed).spawn(n_batches)
+    sizes = np.diff(np.linspace(0, n_brackets, n_batches + 1).astype(int))
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        round_wins = sum(pool.map(_simulate_brackets_job, zip(sizes, seeds)))
+    elapsed = time.perf_counter() - t0
+
+    p = round_wins / n_brackets
+    teams = pd.DataFrame({"team_name": TEAMS, "team_strength": team_strength.sum(axis=1)})
+    for r, label in enumerate(["p_win_round1", "p_reach_final", "p_champion"]):
+        teams[label] = p[r]
+    teams = teams.sort_values("p_champion", ascending=False).reset_index(drop=True)
+
+    role = slot_roles()[roster_df.groupby("team_name", sort=False).cumcount().values]
+    players = roster_df.assign(
+        role=np.array(ROLES)[role],
+        strength=roster_df["gender"].map(GENDER_STRENGTH).values * ROLE_STRENGTH[role],
+    ).merge(teams, on="team_name", how="left")
+    return {"teams": teams, "players": players, "n_brackets": n_brackets,
+            "seconds": elapsed, "brackets_per_sec": n_brackets / elapsed}
+
+def matchup_odds(trials=100_000, seed=0):
+    """Left-team win probability for each scripted matchup in rounds_df."""
+    rng = np.random.default_rng(seed)
+    left = np.repeat([TEAMS.index(t) for t in rounds_df["left"]], trials)
+    right = np.repeat([TEAMS.index(t) for t in rounds_df["right"]], trials)
+    left_wins = play_matches(left, right, rng).reshape(len(rounds_df), trials)
+    odds = rounds_df.copy()
+    odds["p_left_wins"] = left_wins.mean(axis=1)
+    return odds
+
 # ----------------------
 # ANIMATION PARAMS
 # ----------------------
 FPS = 3  
+SEED = 42
+GIF_OUTPUT = "game3_rounds_gap_fall_ordered.gif"
+CSV_OUTPUTS = []   # the render itself writes no logs
+BLIT = True   # draw() only touches the ropes, players and labels
 FRAMES_LINEUP, FRAMES_PULL, FRAMES_DROP = 12, 30, 22
 TOTAL_FRAMES = FRAMES_LINEUP + FRAMES_PULL + FRAMES_DROP
 
@@ -154,104 +267,172 @@ def side_x_positions(side="left", n=10, jitter=0.008):
     xs += np.random.uniform(-jitter, jitter, n)
     return xs
 
-# ----------------------
-# FIGURE
-# ----------------------
-fig = plt.figure(figsize=(8, 6.7), facecolor=BG)
-fig.text(0.5, 0.965, "Game 3: Tug of War — 4 Rounds (Top-Down, Gap & Fall)",
-         color=PINK, ha="center", va="center", fontsize=14, fontweight="bold")
-fig.text(0.5, 0.025, "Gender by color (Female = pink, Male = steel-gray)",
-         color=TXT, ha="center", va="center", fontsize=9)
-
-row_h = 1.0 / (len(rounds_df) + 0.4)
-round_art = []
-
-for _, match in rounds_df.iterrows():
-    r = int(match["round"])
-    left_team, right_team, winner = match["left"], match["right"], match["winner"]
-    loser = right_team if winner == left_team else left_team
-
-    top, bottom = 0.90 - (r-1)*row_h, 0.90 - (r-1)*row_h - (row_h*0.80)
-    ax = fig.add_axes([0.07, bottom, 0.86, (top-bottom)], facecolor=BG)
-    ax.set_xlim(0, 1); ax.set_ylim(0, 1)
-    ax.set_xticks([]); ax.set_yticks([])
-
-    ax.add_patch(Rectangle((PLAT_L_X0, PLAT_Y0), PLAT_L_X1 - PLAT_L_X0, PLAT_Y1 - PLAT_Y0,
-                           facecolor="#1f1f1f", edgecolor="#444444", linewidth=1.0))
-    ax.add_patch(Rectangle((PLAT_R_X0, PLAT_Y0), PLAT_R_X1 - PLAT_R_X0, PLAT_Y1 - PLAT_Y0,
-                           facecolor="#1f1f1f", edgecolor="#444444", linewidth=1.0))
-
-    rope_line = ax.plot([LEFT_ANCHOR_X, RIGHT_ANCHOR_X], [ROPE_Y, ROPE_Y],
-                        color=ROPE_COLOR, lw=6, solid_capstyle="round")[0]
-
-    ax.text(0.02, ROPE_Y + 0.07, f"Round {r}", color=TXT, fontsize=10, va="bottom")
-    ax.text(0.12, ROPE_Y + 0.18, left_team,  ha="center", color=TXT, fontsize=11, weight="bold")
-    ax.text(0.88, ROPE_Y + 0.18, right_team, ha="center", color=TXT, fontsize=11, weight="bold")
-    ax.text(0.12 if winner==left_team else 0.88, ROPE_Y + 0.24, "WINNER",
-            ha="center", color=PINK, fontsize=9, weight="bold")
-
-    pull_dir = -1 if winner == left_team else +1
-
-    left_df, right_df = team_to_players[left_team], team_to_players[right_team]
-    lx, ly = side_x_positions("left", 10), np.full(10, ROPE_Y) + alt_offsets(10)
-    rx, ry = side_x_positions("right", 10), np.full(10, ROPE_Y) + alt_offsets(10)
-
-    left_pts, right_pts, left_txt, right_txt = [], [], [], []
-    for i in range(10):
-        g = str(left_df.loc[i,"gender"])
-        color = PINK if g=="Female" else MALE
-        p=ax.scatter(lx[i], ly[i], s=90, marker="o", c=color, edgecolor="white", lw=0.5, zorder=3)
-        t=ax.text(lx[i], ly[i]+0.022, str(left_df.loc[i,"player_number"]).zfill(3),
-                  ha="center", fontsize=9, color=TXT)
-        left_pts.append(p); left_txt.append(t)
-
-        g = str(right_df.loc[i,"gender"])
-        color = PINK if g=="Female" else MALE
-        p=ax.scatter(rx[i], ry[i], s=90, marker="o", c=color, edgecolor="white", lw=0.5, zorder=3)
-        t=ax.text(rx[i], ry[i]+0.022, str(right_df.loc[i,"player_number"]).zfill(3),
-                  ha="center", fontsize=9, color=TXT)
-        right_pts.append(p); right_txt.append(t)
-
-    round_art.append({"ax":ax,"rope_line":rope_line,"left_team":left_team,"right_team":right_team,
-                      "winner":winner,"loser":loser,"pull_dir":pull_dir,
-                      "L":{"x":lx,"y":ly,"pts":left_pts,"txt":left_txt},
-                      "R":{"x":rx,"y":ry,"pts":right_pts,"txt":right_txt}})
+LABEL_DY = 0.022
 
-# ----------------------
-# UPDATE FUNCTION
-# ----------------------
-def update(frame):
-    if frame < FRAMES_LINEUP: phase, pull_k, drop_k = "LINEUP",0,0
-    elif frame < FRAMES_LINEUP+FRAMES_PULL: phase, pull_k, drop_k="PULL",(frame-FRAMES_LINEUP)/FRAMES_PULL,0
-    else: phase, pull_k, drop_k="DROP",1,(frame-(FRAMES_LINEUP+FRAMES_PULL))/FRAMES_DROP; drop_k=np.clip(drop_k,0,1)
-
-    for art in round_art:
-        dx_rope = art["pull_dir"]*ROPE_PULL_SHIFT_MAX*pull_k
-        art["rope_line"].set_xdata([LEFT_ANCHOR_X+dx_rope, RIGHT_ANCHOR_X+dx_rope])
-        for side_key in ["L","R"]:
-            arr, x, y = art[side_key], art[side_key]["x"].copy(), art[side_key]["y"].copy()
-            is_left=(side_key=="L")
-            is_winner=(is_left and art["winner"]==art["left_team"]) or ((not is_left) and art["winner"]==art["right_team"])
-            is_loser=(is_left and art["loser"]==art["left_team"]) or ((not is_left) and art["loser"]==art["right_team"])
-            if phase in ("LINEUP","PULL"):
-                x+=np.random.uniform(-0.002,0.002,len(x)); y+=np.random.uniform(-0.002,0.002,len(y))
-                if is_winner: x+=((-WINNER_RETREAT_MAX) if is_left else WINNER_RETREAT_MAX)*pull_k
-                else: x+=((+LOSER_RESIST) if is_left else -LOSER_RESIST)*pull_k
-            if phase=="DROP" and is_loser:
-                gap_target_x=CENTER_X-(GAP_W/4) if is_left else CENTER_X+(GAP_W/4)
-                x=x+(gap_target_x-x)*(0.25+0.50*drop_k); y=y-DROP_FALL_Y*(0.25+0.75*drop_k)
-                x+=np.random.uniform(-0.01,0.01,len(x))
-            elif phase=="DROP" and is_winner:
-                y=y+(ROPE_Y-y)*0.08
-            art[side_key]["x"], art[side_key]["y"]=x,y
-            for i,pt in enumerate(arr["pts"]): pt.set_offsets([x[i],y[i]])
-            for i,txt in enumerate(arr["txt"]): txt.set_position((x[i],y[i]+0.022))
-    return []
+def label_collection(ax, labels, x, y, fontsize=9, color=TXT):
+    """Draw all `labels` as one PathCollection of glyph paths centred above (x, y)."""
+    from matplotlib.collections import PathCollection
+    from matplotlib.textpath import TextPath
+    from matplotlib.transforms import Affine2D, IdentityTransform
+
+    paths = []
+    for s in labels:
+        tp = TextPath((0, 0), s, size=fontsize)
+        bb = tp.get_extents()
+        paths.append(tp.transformed(Affine2D().translate(-(bb.x0 + bb.x1)/2, 0)))
+    # paths are in points; sizes=[1] scales them by dpi/72 like a scatter marker
+    coll = PathCollection(paths, sizes=[1.0], offsets=np.column_stack([x, y + LABEL_DY]),
+                          offset_transform=ax.transData, transform=IdentityTransform(),
+                          facecolors=color, edgecolors="none", zorder=3, clip_on=False)
+    return ax.add_collection(coll, autolim=False)
 
 # ----------------------
-# RENDER
+# PER-FRAME STATE
 # ----------------------
-ani=animation.FuncAnimation(fig, update, frames=TOTAL_FRAMES, interval=1000/FPS, blit=False, repeat=False)
-out_name="game3_rounds_gap_fall_ordered.gif"
-ani.save(out_name, writer="pillow", fps=FPS)
-print(f"Saved GIF: {out_name}")
+def frame_phase(frame):
+    if frame < FRAMES_LINEUP: return "LINEUP", 0, 0
+    if frame < FRAMES_LINEUP+FRAMES_PULL: return "PULL", (frame-FRAMES_LINEUP)/FRAMES_PULL, 0
+    return "DROP", 1, np.clip((frame-(FRAMES_LINEUP+FRAMES_PULL))/FRAMES_DROP, 0, 1)
+
+def simulate():
+    """Seeded lineup and motion of every player; xy is (frames x rounds x side L/R x 10 x 2)."""
+    np.random.seed(SEED)
+    n_rounds = len(rounds_df)
+    xy = np.empty((TOTAL_FRAMES, n_rounds, 2, 10, 2))
+    rope_dx = np.empty((TOTAL_FRAMES, n_rounds))
+
+    sides = []
+    for _, match in rounds_df.iterrows():
+        lx, ly = side_x_positions("left", 10), np.full(10, ROPE_Y) + alt_offsets(10)
+        rx, ry = side_x_positions("right", 10), np.full(10, ROPE_Y) + alt_offsets(10)
+        sides.append([[lx, ly], [rx, ry]])
+
+    for frame in range(TOTAL_FRAMES):
+        phase, pull_k, drop_k = frame_phase(frame)
+        for r, match in rounds_df.iterrows():
+            loser = match["right"] if match["winner"] == match["left"] else match["left"]
+            pull_dir = -1 if match["winner"] == match["left"] else +1
+            rope_dx[frame, r] = pull_dir*ROPE_PULL_SHIFT_MAX*pull_k
+            for k, is_left in enumerate((True, False)):
+                x, y = sides[r][k][0].copy(), sides[r][k][1].copy()
+                team = match["left"] if is_left else match["right"]
+                is_winner, is_loser = team == match["winner"], team == loser
+                if phase in ("LINEUP","PULL"):
+                    x+=np.random.uniform(-0.002,0.002,len(x)); y+=np.random.uniform(-0.002,0.002,len(y))
+                    if is_winner: x+=((-WINNER_RETREAT_MAX) if is_left else WINNER_RETREAT_MAX)*pull_k
+                    else: x+=((+LOSER_RESIST) if is_left else -LOSER_RESIST)*pull_k
+                if phase=="DROP" and is_loser:
+                    gap_target_x=CENTER_X-(GAP_W/4) if is_left else CENTER_X+(GAP_W/4)
+                    x=x+(gap_target_x-x)*(0.25+0.50*drop_k); y=y-DROP_FALL_Y*(0.25+0.75*drop_k)
+                    x+=np.random.uniform(-0.01,0.01,len(x))
+                elif phase=="DROP" and is_winner:
+                    y=y+(ROPE_Y-y)*0.08
+                sides[r][k] = [x, y]
+                xy[frame, r, k] = np.column_stack([x, y])
+
+    return {"n_frames": TOTAL_FRAMES, "xy": xy, "rope_dx": rope_dx}
+
+def build_figure(state):
+    # matplotlib is only imported to draw; season.py --no-render never loads it
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Rectangle
+
+    # ----------------------
+    # FIGURE
+    # ----------------------
+    fig = plt.figure(figsize=(8, 6.7), facecolor=BG)
+    fig.text(0.5, 0.965, "Game 3: Tug of War — 4 Rounds (Top-Down, Gap & Fall)",
+             color=PINK, ha="center", va="center", fontsize=14, fontweight="bold")
+    fig.text(0.5, 0.025, "Gender by color (Female = pink, Male = steel-gray)",
+             color=TXT, ha="center", va="center", fontsize=9)
+
+    row_h = 1.0 / (len(rounds_df) + 0.4)
+    round_art = []
+
+    for _, match in rounds_df.iterrows():
+        r = int(match["round"])
+        left_team, right_team, winner = match["left"], match["right"], match["winner"]
+
+        top, bottom = 0.90 - (r-1)*row_h, 0.90 - (r-1)*row_h - (row_h*0.80)
+        ax = fig.add_axes([0.07, bottom, 0.86, (top-bottom)], facecolor=BG)
+        ax.set_xlim(0, 1); ax.set_ylim(0, 1)
+        ax.set_xticks([]); ax.set_yticks([])
+
+        ax.add_patch(Rectangle((PLAT_L_X0, PLAT_Y0), PLAT_L_X1 - PLAT_L_X0, PLAT_Y1 - PLAT_Y0,
+                               facecolor="#1f1f1f", edgecolor="#444444", linewidth=1.0))
+        ax.add_patch(Rectangle((PLAT_R_X0, PLAT_Y0), PLAT_R_X1 - PLAT_R_X0, PLAT_Y1 - PLAT_Y0,
+                               facecolor="#1f1f1f", edgecolor="#444444", linewidth=1.0))
+
+        rope_line = ax.plot([LEFT_ANCHOR_X, RIGHT_ANCHOR_X], [ROPE_Y, ROPE_Y],
+                            color=ROPE_COLOR, lw=6, solid_capstyle="round")[0]
+
+        ax.text(0.02, ROPE_Y + 0.07, f"Round {r}", color=TXT, fontsize=10, va="bottom")
+        ax.text(0.12, ROPE_Y + 0.18, left_team,  ha="center", color=TXT, fontsize=11, weight="bold")
+        ax.text(0.88, ROPE_Y + 0.18, right_team, ha="center", color=TXT, fontsize=11, weight="bold")
+        ax.text(0.12 if winner==left_team else 0.88, ROPE_Y + 0.24, "WINNER",
+                ha="center", color=PINK, fontsize=9, weight="bold")
+
+        sides = []
+        for k, team in enumerate((left_team, right_team)):
+            side_df = team_to_players[team]
+            x, y = state["xy"][0, r-1, k].T
+            colors = np.where(side_df["gender"].astype(str).values == "Female", PINK, MALE)
+            pts = ax.scatter(x, y, s=90, marker="o", c=colors, edgecolor="white", lw=0.5, zorder=3)
+            txt = label_collection(ax, side_df["player_number"].astype(str).str.zfill(3), x, y)
+            sides.append((pts, txt))
+
+        round_art.append((rope_line, sides))
+
+    # Everything that moves per frame; the rest of the figure is the cached background
+    animated_artists = [a for rope_line, sides in round_art for a in (rope_line, *sides[0], *sides[1])]
+    for a in animated_artists:
+        a.set_animated(True)
+
+    # ----------------------
+    # DRAW FUNCTION (reads state only)
+    # ----------------------
+    def draw(frame):
+        for r, (rope_line, sides) in enumerate(round_art):
+            dx_rope = state["rope_dx"][frame, r]
+            rope_line.set_xdata([LEFT_ANCHOR_X+dx_rope, RIGHT_ANCHOR_X+dx_rope])
+            for k, (pts, txt) in enumerate(sides):
+                xy = state["xy"][frame, r, k]
+                pts.set_offsets(xy)
+                txt.set_offsets(xy+[0,LABEL_DY])
+        return animated_artists
+
+    return fig, draw
+
+def cache_inputs():
+    """Everything the rendered GIF depends on besides the code (see render_cache.py)."""
+    return {"rounds": rounds_df, "roster": roster_df, "seed": SEED, "fps": FPS,
+            "frames": (FRAMES_LINEUP, FRAMES_PULL, FRAMES_DROP)}
+
+def render_gif(out_name=GIF_OUTPUT, workers=None):
+    from parallel_render import render_game
+    run = render_game(sys.modules[__name__], out_name, workers=workers)
+    print(f"Saved GIF: {out_name} ({run['n_frames']} frames, {run['workers']} worker(s), {run['seconds']:.2f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Squid Game - Game 3 (Tug of War)")
+    parser.add_argument("--tournament", type=int, metavar="N",
+                        help="simulate N random-pairing brackets instead of rendering the GIF")
+    parser.add_argument("--batch-size", type=int, default=20_000, help="brackets per vectorized batch")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="process pool size for the tournament and frame rendering (default: all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="always re-render instead of reusing a cached GIF")
+    args = parser.parse_args()
+
+    if args.tournament:
+        print(matchup_odds().to_string(index=False))
+        sim = run_tournament(args.tournament, batch_size=args.batch_size, workers=args.workers)
+        sim["teams"].to_csv("game3_tug_team_odds.csv", index=False)
+        sim["players"].to_csv("game3_tug_player_odds.csv", index=False)
+        print(sim["teams"].to_string(index=False))
+        print(f"{sim['n_brackets']} brackets in {sim['seconds']:.2f}s "
+              f"({sim['brackets_per_sec']:,.0f} brackets/sec)")
+        print("Saved CSVs: game3_tug_team_odds.csv, game3_tug_player_odds.csv")
+    else:
+        cached_render(sys.modules[__name__], [GIF_OUTPUT], lambda: render_gif(workers=args.workers),
+                      enabled=not args.no_cache)
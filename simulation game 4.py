@@ -8,13 +8,13 @@
 # - Exports GIF + CSV logs
 # ============================================
 
+import argparse
+import sys
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 from io import StringIO
 import math
-import random
+from render_cache import cached_render
 
 # ----------------------
 # THEME
@@ -26,10 +26,6 @@ WIN  = "#41C37A"   # winner green
 LOS  = "#D9534F"   # loser red
 MARBLE = "#c7a76c" # marble color
 
-plt.rcParams["figure.facecolor"] = BG
-plt.rcParams["axes.facecolor"] = BG
-plt.rcParams["savefig.facecolor"] = BG
-
 # ----------------------
 # Manual Data Input
 # ----------------------
@@ -72,41 +68,10 @@ FRAMES_INTRO   = 2   # show names & sub-game
 FRAMES_PLAY    = 3   # marble transfers
 FRAMES_RESOLVE = 1   # winner celebration / loser fade
 TOTAL_PER_MATCH = FRAMES_INTRO + FRAMES_PLAY + FRAMES_RESOLVE
+GIF_OUTPUT = "game4_marbles.gif"
 
 START_MARBLES = 10  # each player starts with 10
 
-def make_transfer_schedule(winner_target=20, steps=16, style="generic", rng=None):
-    if rng is None:
-        rng = random.Random(0)
-    remaining = winner_target - START_MARBLES  # amount to gain
-    gains = []
-    if remaining <= 0:
-        return [0]*steps
-    if style == "odd_even":
-        for _ in range(steps-1):
-            gains.append(rng.choice([1,2,3]))
-        gains.append(max(1, remaining - sum(gains)))
-    elif style == "throw_wall":
-        for _ in range(steps-1):
-            gains.append(rng.choice([0,2,2,4]))
-        gains.append(max(1, remaining - sum(gains)))
-    elif style == "hit_out":
-        for _ in range(steps-1):
-            gains.append(rng.choice([1,2,3,4]))
-        gains.append(max(1, remaining - sum(gains)))
-    else:
-        for _ in range(steps-1):
-            gains.append(rng.choice([1,1,2,2,3]))
-        gains.append(max(1, remaining - sum(gains)))
-
-    s = sum(gains)
-    if s != remaining and s > 0:
-        gains = [max(0, round(g * remaining / s)) for g in gains]
-        delta = remaining - sum(gains)
-        for i in range(abs(delta)):
-            gains[i % len(gains)] += 1 if delta > 0 else -1
-    return gains
-
 def subgame_style(subgame_text):
     s = str(subgame_text).lower()
     if "odd or even" in s: return "odd_even"
@@ -114,230 +79,352 @@ def subgame_style(subgame_text):
     if "hit the marbles out" in s: return "hit_out"
     return "generic"
 
-# Precompute schedules per match
-rng = random.Random(42)
+# ----------------------
+# SUB-GAME MODELS (bet by bet, many matches at once)
+# ----------------------
+MAX_TURNS = 400
+WALL_MAX_STAKE = 3      # marbles wagered per throw at the wall
+HIT_ANTE, HIT_P = 3, 0.5  # marbles each side puts in the ring; chance each one is knocked out
+GENERIC_MAX_STAKE = 3
+
+def _bet_delta(style, a, b, turn, rng):
+    """Marbles moving to player A on this bet (negative: A pays B)."""
+    n = len(a)
+    both = np.maximum(np.minimum(a, b), 1)
+    if style == "odd_even":
+        # holder hides marbles, guesser wagers up to the smaller stack on a coin-flip guess
+        stake = rng.integers(1, both + 1)
+        return np.where(rng.random(n) < 0.5, stake, -stake)
+    if style == "throw_wall":
+        # closest throw to the wall takes the wager
+        stake = np.minimum(rng.integers(1, WALL_MAX_STAKE + 1, n), both)
+        return np.where(rng.random(n) < 0.5, stake, -stake)
+    if style == "hit_out":
+        # both ante into the ring, the shooter keeps what he knocks out (shooters alternate)
+        ante = np.minimum(HIT_ANTE, both)
+        gain = rng.binomial(2*ante, HIT_P) - ante
+        return gain if turn % 2 == 0 else -gain
+    stake = np.minimum(rng.integers(1, GENERIC_MAX_STAKE + 1, n), both)
+    return np.where(rng.random(n) < 0.5, stake, -stake)
+
+def simulate_matches(style, n_matches, start=(START_MARBLES, START_MARBLES), max_turns=MAX_TURNS, rng=None):
+    """Play `n_matches` full matches of one sub-game side by side.
+
+    Returns A's marble count after every bet (matches x turns+1), the match
+    length in bets and whether A ended with every marble.
+    """
+    rng = rng if rng is not None else np.random.default_rng(0)
+    a = np.full(n_matches, start[0], dtype=np.int16)
+    b = np.full(n_matches, start[1], dtype=np.int16)
+    traj = np.zeros((n_matches, max_turns + 1), dtype=np.int16)
+    traj[:, 0] = a
+    length = np.full(n_matches, max_turns)
+    active = np.ones(n_matches, dtype=bool)
+
+    for turn in range(max_turns):
+        delta = np.where(active, _bet_delta(style, a, b, turn, rng), 0).astype(np.int16)
+        a += delta; b -= delta
+        traj[:, turn + 1] = a
+        done = active & ((a <= 0) | (b <= 0))
+        length[done] = turn + 1
+        active &= ~done
+        if not active.any():
+            traj = traj[:, :turn + 2]
+            break
+
+    return {"traj": traj, "length": length, "a_wins": b <= 0}
+
+def subgame_odds(styles=("odd_even", "throw_wall", "hit_out", "generic"),
+                 starts=((10, 10), (10, 5), (15, 5), (5, 15)), n_matches=20_000, seed=0):
+    """Win probability and match-length distribution per sub-game and starting counts."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for style in styles:
+        for sa, sb in starts:
+            sim = simulate_matches(style, n_matches, start=(sa, sb), rng=rng)
+            decided = sim["length"] < MAX_TURNS
+            rows.append({
+                "style": style, "start_a": sa, "start_b": sb,
+                "p_a_wins": sim["a_wins"].mean(),
+                "p_undecided": 1 - decided.mean(),
+                "bets_mean": sim["length"].mean(),
+                "bets_p10": np.percentile(sim["length"], 10),
+                "bets_p50": np.percentile(sim["length"], 50),
+                "bets_p90": np.percentile(sim["length"], 90),
+            })
+    return pd.DataFrame(rows)
+
+def make_transfer_schedule(batch, rng):
+    """Pick one simulated match the winner takes all 20 in; return the winner's gain per bet."""
+    won = np.flatnonzero(batch["a_wins"])
+    i = rng.choice(won)
+    return np.diff(batch["traj"][i, :batch["length"][i] + 1]).astype(int).tolist()
+
+# Precompute schedules per match: one batch per sub-game style, then a lookup per match
+SCHEDULE_BATCH = 4096
+SEED = 42
+rng = np.random.default_rng(SEED)
+ordered = df.sort_values("Order Finished")
+styles = ordered.loc[~ordered["is_bye"], "Sub-Game Played"].map(subgame_style)
+subgame_batches = {style: simulate_matches(style, SCHEDULE_BATCH, rng=rng) for style in styles.unique()}
 schedules = []
-for _, row in df.sort_values("Order Finished").iterrows():
+for _, row in ordered.iterrows():
     if row["is_bye"]:
         schedules.append([0]*16)  # harmless placeholder
         continue
-    style = subgame_style(row["Sub-Game Played"])
-    gains = make_transfer_schedule(winner_target=20, steps=16, style=style, rng=rng)
-    schedules.append(gains)
+    schedules.append(make_transfer_schedule(subgame_batches[subgame_style(row["Sub-Game Played"])], rng))
 
 # ----------------------
-# ANIMATION SETUP
+# PER-FRAME STATE
 # ----------------------
-fig, ax = plt.subplots(figsize=(9,6))
-ax.set_xlim(0, 1); ax.set_ylim(0, 1); ax.axis("off")
-
-title = ax.text(0.5, 0.96, "Game 4: Marbles", ha="center", va="top", color=ACC, fontsize=18, weight="bold")
-subtitle = ax.text(0.5, 0.91, "", ha="center", va="top", color=TXT, fontsize=12)
-
 # Arena elements
 L_TILE = (0.12, 0.35, 0.26, 0.30)  # x,y,w,h
 R_TILE = (0.62, 0.35, 0.26, 0.30)
 LANE   = (0.41, 0.30, 0.18, 0.40)
-
-ltile = plt.Rectangle(L_TILE[:2], L_TILE[2], L_TILE[3], fc="#1f1f1f", ec="#444444", lw=1.2)
-rtile = plt.Rectangle(R_TILE[:2], R_TILE[2], R_TILE[3], fc="#1f1f1f", ec="#444444", lw=1.2)
-lane  = plt.Rectangle(LANE[:2],   LANE[2],   LANE[3],   fc="#101010", ec="#333333", lw=1.0)
-ax.add_patch(ltile); ax.add_patch(rtile); ax.add_patch(lane)
-
-# Labels & counters
-left_name  = ax.text(L_TILE[0]+L_TILE[2]/2, L_TILE[1]+L_TILE[3]+0.06, "", ha="center", color=TXT, fontsize=12, weight="bold")
-right_name = ax.text(R_TILE[0]+R_TILE[2]/2, R_TILE[1]+R_TILE[3]+0.06, "", ha="center", color=TXT, fontsize=12, weight="bold")
-left_num   = ax.text(L_TILE[0]+L_TILE[2]/2, L_TILE[1]-0.03, "", ha="center", color=TXT, fontsize=11)
-right_num  = ax.text(R_TILE[0]+R_TILE[2]/2, R_TILE[1]-0.03, "", ha="center", color=TXT, fontsize=11)
-
-left_count  = ax.text(L_TILE[0]+L_TILE[2]/2, 0.50, "", ha="center", color=TXT, fontsize=22, weight="bold")
-right_count = ax.text(R_TILE[0]+R_TILE[2]/2, 0.50, "", ha="center", color=TXT, fontsize=22, weight="bold")
-
-result_text = ax.text(0.5, 0.10, "", ha="center", color=TXT, fontsize=13)
-
-# moving marbles (use Line2D points; ALWAYS pass sequences to set_data)
 MARBLE_N = 12
-marbles = [ax.plot([], [], "o", ms=10, color=MARBLE, markeredgecolor="white", markeredgewidth=0.6, alpha=0.95)[0]
-           for _ in range(MARBLE_N)]
-
-# ----------------------
-# LOGGING
-# ----------------------
-step_logs = []   # per-frame transfer log
-match_logs = []  # final outcome
-
-# ----------------------
-# FRAME UPDATE
-# ----------------------
-matches = df.sort_values("Order Finished").reset_index(drop=True)
+IDLE_EDGE = "#555555"
 
 def interp(a, b, t): return a + (b-a)*t
 
-def set_point(m, x, y, visible=True):
-    """Helper to move/hide a Line2D point safely (expects sequences)."""
-    if visible:
-        m.set_data([x], [y])
-        m.set_alpha(0.95)
-    else:
-        m.set_data([np.nan], [np.nan])
-        m.set_alpha(0.0)
-
-def update(global_frame):
-    # determine which match we're on
-    match_idx = min(global_frame // TOTAL_PER_MATCH, len(matches)-1)
-    frame_in_match = global_frame % TOTAL_PER_MATCH
-    row = matches.loc[match_idx]
-
-    # Winner (left), Loser (right) visuals
-    winner_id   = str(row["Winning Player No."])
-    winner_name = "" if pd.isna(row.get("Winning Player Name", "")) else str(row.get("Winning Player Name", ""))
-    loser_id    = None if row["is_bye"] else str(row["Losing Player No."])
-    loser_name  = "" if row["is_bye"] else ("" if pd.isna(row.get("Losing Player Name","")) else str(row.get("Losing Player Name","")))
-    subgame = str(row.get("Sub-Game Played",""))
-    notes   = "" if pd.isna(row.get("Notes","")) else str(row.get("Notes",""))
-
-    # Arena header
-    if row["is_bye"]:
-        subtitle.set_text(f"Order {row['Order Finished']} • BYE (odd player): auto-advance")
-    else:
-        subtitle.set_text(f"Order {row['Order Finished']} • Sub-game: {subgame if subgame!='N/A' else '—'}")
-
-    # Labels
-    left_label  = (winner_name + " " if winner_name else "") + f"#{winner_id}"
-    right_label = "" if row["is_bye"] else ((loser_name + " " if loser_name else "") + f"#{loser_id}")
-    left_name.set_text(left_label.strip())
-    right_name.set_text(right_label.strip())
-    left_num.set_text("Winner side")
-    right_num.set_text("" if row["is_bye"] else "Loser side")
-
-    # Counts
-    if row["is_bye"]:
-        w_cnt = START_MARBLES
-        l_cnt = 0
-    else:
-        gains = schedules[match_idx]
-        steps = len(gains)
-
-        # map FRAMES_PLAY frames → 'steps' transfer steps
-        if frame_in_match < FRAMES_INTRO:
-            step_idx = 0
-            prog_in_step = 0.0
-        elif frame_in_match < FRAMES_INTRO + FRAMES_PLAY:
-            t = (frame_in_match - FRAMES_INTRO) / FRAMES_PLAY  # 0..1
-            fpos = t * steps
-            step_idx = int(min(steps-1, math.floor(fpos)))
-            prog_in_step = fpos - step_idx
+def simulate(seed=SEED):
+    """Every frame's texts, counters, tile edges and marble positions, plus the CSV logs."""
+    jitter = np.random.default_rng(seed)
+    matches = df.sort_values("Order Finished").reset_index(drop=True)
+    total_frames = TOTAL_PER_MATCH * len(matches)
+
+    texts = {k: [] for k in ("subtitle", "left_name", "right_name", "left_num", "right_num",
+                             "left_count", "right_count", "result")}
+    right_edge = []
+    marbles = np.full((total_frames, MARBLE_N, 2), np.nan)  # NaN = hidden
+    step_logs = []   # per-frame transfer log
+    match_logs = []  # final outcome
+
+    for global_frame in range(total_frames):
+        # determine which match we're on
+        match_idx = min(global_frame // TOTAL_PER_MATCH, len(matches)-1)
+        frame_in_match = global_frame % TOTAL_PER_MATCH
+        row = matches.loc[match_idx]
+
+        # Winner (left), Loser (right) visuals
+        winner_id   = str(row["Winning Player No."])
+        winner_name = "" if pd.isna(row.get("Winning Player Name", "")) else str(row.get("Winning Player Name", ""))
+        loser_id    = None if row["is_bye"] else str(row["Losing Player No."])
+        loser_name  = "" if row["is_bye"] else ("" if pd.isna(row.get("Losing Player Name","")) else str(row.get("Losing Player Name","")))
+        subgame = str(row.get("Sub-Game Played",""))
+        notes   = "" if pd.isna(row.get("Notes","")) else str(row.get("Notes",""))
+
+        # Arena header
+        if row["is_bye"]:
+            texts["subtitle"].append(f"Order {row['Order Finished']} • BYE (odd player): auto-advance")
         else:
-            step_idx = steps-1
-            prog_in_step = 1.0
-
-        gain_cum_before = sum(gains[:step_idx])
-        gain_this       = gains[step_idx] if steps>0 else 0
-        gain_progress   = gain_cum_before + gain_this * prog_in_step
-
-        w_cnt = START_MARBLES + int(round(gain_progress))
-        l_cnt = START_MARBLES - int(round(gain_progress))
-        w_cnt = max(0, min(20, w_cnt))
-        l_cnt = max(0, min(20, l_cnt))
-
-        if FRAMES_INTRO <= frame_in_match < FRAMES_INTRO + FRAMES_PLAY:
-            step_logs.append({
-                "order": int(row["Order Finished"]),
-                "winner_id": winner_id,
-                "loser_id": loser_id,
-                "frame": int(global_frame),
-                "step_index": int(step_idx),
-                "winner_count": int(w_cnt),
-                "loser_count": int(l_cnt),
-                "subgame": subgame
-            })
+            texts["subtitle"].append(f"Order {row['Order Finished']} • Sub-game: {subgame if subgame!='N/A' else '—'}")
 
-    left_count.set_text(str(w_cnt))
-    right_count.set_text("" if row["is_bye"] else str(l_cnt))
+        # Labels
+        left_label  = (winner_name + " " if winner_name else "") + f"#{winner_id}"
+        right_label = "" if row["is_bye"] else ((loser_name + " " if loser_name else "") + f"#{loser_id}")
+        texts["left_name"].append(left_label.strip())
+        texts["right_name"].append(right_label.strip())
+        texts["left_num"].append("Winner side")
+        texts["right_num"].append("" if row["is_bye"] else "Loser side")
 
-    # Tile colors by phase
-    if frame_in_match < FRAMES_INTRO:
-        ltile.set_edgecolor("#555555"); rtile.set_edgecolor("#555555")
-    elif frame_in_match < FRAMES_INTRO + FRAMES_PLAY:
-        ltile.set_edgecolor(WIN); rtile.set_edgecolor(LOS if not row["is_bye"] else "#444444")
-    else:
-        ltile.set_edgecolor(WIN); rtile.set_edgecolor(LOS if not row["is_bye"] else "#444444")
-
-    # Result banner
-    if frame_in_match >= FRAMES_INTRO + FRAMES_PLAY:
+        # Counts
         if row["is_bye"]:
-            result_text.set_text(f"{left_label} advances by BYE")
-            result_text.set_color(ACC)
+            w_cnt = START_MARBLES
+            l_cnt = 0
         else:
-            result_text.set_text(f"WIN: {left_label}   •   ELIMINATED: {right_label}")
-            result_text.set_color(ACC)
-            if frame_in_match == FRAMES_INTRO + FRAMES_PLAY:
-                match_logs.append({
+            gains = schedules[match_idx]
+            steps = len(gains)
+
+            # map FRAMES_PLAY frames → 'steps' transfer steps
+            if frame_in_match < FRAMES_INTRO:
+                step_idx = 0
+                prog_in_step = 0.0
+            elif frame_in_match < FRAMES_INTRO + FRAMES_PLAY:
+                t = (frame_in_match - FRAMES_INTRO) / FRAMES_PLAY  # 0..1
+                fpos = t * steps
+                step_idx = int(min(steps-1, math.floor(fpos)))
+                prog_in_step = fpos - step_idx
+            else:
+                step_idx = steps-1
+                prog_in_step = 1.0
+
+            gain_cum_before = sum(gains[:step_idx])
+            gain_this       = gains[step_idx] if steps>0 else 0
+            gain_progress   = gain_cum_before + gain_this * prog_in_step
+
+            w_cnt = START_MARBLES + int(round(gain_progress))
+            l_cnt = START_MARBLES - int(round(gain_progress))
+            w_cnt = max(0, min(20, w_cnt))
+            l_cnt = max(0, min(20, l_cnt))
+
+            if FRAMES_INTRO <= frame_in_match < FRAMES_INTRO + FRAMES_PLAY:
+                step_logs.append({
                     "order": int(row["Order Finished"]),
                     "winner_id": winner_id,
-                    "winner_name": winner_name,
                     "loser_id": loser_id,
-                    "loser_name": loser_name,
-                    "subgame": subgame,
-                    "notes": notes,
-                    "winner_final_marbles": 20,
-                    "loser_final_marbles": 0
+                    "frame": int(global_frame),
+                    "step_index": int(step_idx),
+                    "winner_count": int(w_cnt),
+                    "loser_count": int(l_cnt),
+                    "subgame": subgame
                 })
-    else:
-        result_text.set_text("")
 
-    # Animate marbles
-    # Reset (hide) all
-    for m in marbles:
-        set_point(m, 0, 0, visible=False)
+        texts["left_count"].append(str(w_cnt))
+        texts["right_count"].append("" if row["is_bye"] else str(l_cnt))
 
-    if row["is_bye"]:
-        # idle swirl over left tile
-        cx = L_TILE[0]+L_TILE[2]*0.5
-        cy = L_TILE[1]+L_TILE[3]*0.5
-        for i, m in enumerate(marbles):
-            ang = (i/len(marbles))*2*np.pi + (frame_in_match/10)
-            set_point(m, cx + 0.06*np.cos(ang), cy + 0.04*np.sin(ang), visible=True)
-    else:
-        if FRAMES_INTRO <= frame_in_match < FRAMES_INTRO + FRAMES_PLAY:
+        # Tile colors by phase (left tile: idle until play starts, then winner green)
+        if frame_in_match < FRAMES_INTRO:
+            right_edge.append(IDLE_EDGE)
+        else:
+            right_edge.append(LOS if not row["is_bye"] else "#444444")
+
+        # Result banner
+        if frame_in_match >= FRAMES_INTRO + FRAMES_PLAY:
+            if row["is_bye"]:
+                texts["result"].append(f"{left_label} advances by BYE")
+            else:
+                texts["result"].append(f"WIN: {left_label}   •   ELIMINATED: {right_label}")
+                if frame_in_match == FRAMES_INTRO + FRAMES_PLAY:
+                    match_logs.append({
+                        "order": int(row["Order Finished"]),
+                        "winner_id": winner_id,
+                        "winner_name": winner_name,
+                        "loser_id": loser_id,
+                        "loser_name": loser_name,
+                        "subgame": subgame,
+                        "notes": notes,
+                        "winner_final_marbles": 20,
+                        "loser_final_marbles": 0
+                    })
+        else:
+            texts["result"].append("")
+
+        # Marbles
+        if row["is_bye"]:
+            # idle swirl over left tile
+            cx = L_TILE[0]+L_TILE[2]*0.5
+            cy = L_TILE[1]+L_TILE[3]*0.5
+            ang = (np.arange(MARBLE_N)/MARBLE_N)*2*np.pi + (frame_in_match/10)
+            marbles[global_frame] = np.column_stack([cx + 0.06*np.cos(ang), cy + 0.04*np.sin(ang)])
+        elif FRAMES_INTRO <= frame_in_match < FRAMES_INTRO + FRAMES_PLAY:
             t_local = (frame_in_match - FRAMES_INTRO) / FRAMES_PLAY  # 0..1
             sx = R_TILE[0] + R_TILE[2]*0.50
             sy = R_TILE[1] + R_TILE[3]*0.55
             tx = L_TILE[0] + L_TILE[2]*0.52
             ty = L_TILE[1] + L_TILE[3]*0.55
 
-            for i, m in enumerate(marbles):
-                start = (i / len(marbles)) * 0.8
+            for i in range(MARBLE_N):
+                start = (i / MARBLE_N) * 0.8
                 tt = np.clip((t_local - start) / 0.2, 0, 1)
-                x = interp(sx, tx, tt) + np.random.uniform(-0.005, 0.005)
-                y = interp(sy, ty, tt) + np.random.uniform(-0.005, 0.005)
+                x = interp(sx, tx, tt) + jitter.uniform(-0.005, 0.005)
+                y = interp(sy, ty, tt) + jitter.uniform(-0.005, 0.005)
                 if tt > 0:
-                    set_point(m, x, y, visible=True)
-                else:
-                    set_point(m, 0, 0, visible=False)
+                    marbles[global_frame, i] = x, y
 
-    return [
-        left_name, right_name, left_num, right_num,
-        left_count, right_count, result_text, ltile, rtile, lane, subtitle, title,
-        *marbles
-    ]
+    return {"n_frames": total_frames, "texts": texts, "right_edge": right_edge, "marbles": marbles,
+            "step_logs": step_logs, "match_logs": match_logs}
 
 # ----------------------
-# RENDER
+# ANIMATION SETUP
 # ----------------------
-total_frames = TOTAL_PER_MATCH * len(df)
-ani = animation.FuncAnimation(fig, update, frames=total_frames, interval=1000/FPS, blit=False, repeat=False)
+def build_figure(state):
+    # matplotlib is only imported to draw; season.py --no-render never loads it
+    import matplotlib.pyplot as plt
+
+    plt.rcParams["figure.facecolor"] = BG
+    plt.rcParams["axes.facecolor"] = BG
+    plt.rcParams["savefig.facecolor"] = BG
+
+    fig, ax = plt.subplots(figsize=(9,6))
+    ax.set_xlim(0, 1); ax.set_ylim(0, 1); ax.axis("off")
+
+    ax.text(0.5, 0.96, "Game 4: Marbles", ha="center", va="top", color=ACC, fontsize=18, weight="bold")
+    subtitle = ax.text(0.5, 0.91, "", ha="center", va="top", color=TXT, fontsize=12)
+
+    ltile = plt.Rectangle(L_TILE[:2], L_TILE[2], L_TILE[3], fc="#1f1f1f", ec="#444444", lw=1.2)
+    rtile = plt.Rectangle(R_TILE[:2], R_TILE[2], R_TILE[3], fc="#1f1f1f", ec="#444444", lw=1.2)
+    lane  = plt.Rectangle(LANE[:2],   LANE[2],   LANE[3],   fc="#101010", ec="#333333", lw=1.0)
+    ax.add_patch(ltile); ax.add_patch(rtile); ax.add_patch(lane)
 
-out_gif = "game4_marbles.gif"
-ani.save(out_gif, writer="pillow", fps=FPS)
-print(f"Saved GIF: {out_gif}")
+    # Labels & counters
+    left_name  = ax.text(L_TILE[0]+L_TILE[2]/2, L_TILE[1]+L_TILE[3]+0.06, "", ha="center", color=TXT, fontsize=12, weight="bold")
+    right_name = ax.text(R_TILE[0]+R_TILE[2]/2, R_TILE[1]+R_TILE[3]+0.06, "", ha="center", color=TXT, fontsize=12, weight="bold")
+    left_num   = ax.text(L_TILE[0]+L_TILE[2]/2, L_TILE[1]-0.03, "", ha="center", color=TXT, fontsize=11)
+    right_num  = ax.text(R_TILE[0]+R_TILE[2]/2, R_TILE[1]-0.03, "", ha="center", color=TXT, fontsize=11)
+
+    left_count  = ax.text(L_TILE[0]+L_TILE[2]/2, 0.50, "", ha="center", color=TXT, fontsize=22, weight="bold")
+    right_count = ax.text(R_TILE[0]+R_TILE[2]/2, 0.50, "", ha="center", color=TXT, fontsize=22, weight="bold")
+
+    result_text = ax.text(0.5, 0.10, "", ha="center", color=ACC, fontsize=13)
+
+    # moving marbles (use Line2D points; ALWAYS pass sequences to set_data)
+    marbles = [ax.plot([], [], "o", ms=10, color=MARBLE, markeredgecolor="white", markeredgewidth=0.6, alpha=0.95)[0]
+               for _ in range(MARBLE_N)]
+
+    text_artists = {"subtitle": subtitle, "left_name": left_name, "right_name": right_name,
+                    "left_num": left_num, "right_num": right_num, "left_count": left_count,
+                    "right_count": right_count, "result": result_text}
+
+    # ----------------------
+    # FRAME DRAW (reads state only)
+    # ----------------------
+    def draw(global_frame):
+        for key, artist in text_artists.items():
+            artist.set_text(state["texts"][key][global_frame])
+
+        redge = state["right_edge"][global_frame]
+        ltile.set_edgecolor(IDLE_EDGE if redge == IDLE_EDGE else WIN)
+        rtile.set_edgecolor(redge)
+
+        for m, (x, y) in zip(marbles, state["marbles"][global_frame]):
+            m.set_data([x], [y])
+            m.set_alpha(0.0 if np.isnan(x) else 0.95)
+
+        return [*text_artists.values(), ltile, rtile, *marbles]
+
+    return fig, draw
+
+def cache_inputs():
+    """Everything the GIF and CSVs depend on besides the code (see render_cache.py)."""
+    return {"matches": raw_csv, "fps": FPS, "frames": (FRAMES_INTRO, FRAMES_PLAY, FRAMES_RESOLVE),
+            "start_marbles": START_MARBLES, "schedule_batch": SCHEDULE_BATCH, "seed": SEED}
 
 # ----------------------
-# SAVE LOGS
+# RENDER
 # ----------------------
-df_steps = pd.DataFrame(step_logs)
-df_out   = pd.DataFrame(match_logs)
+def render_gif(out_gif=GIF_OUTPUT, workers=None):
+    from parallel_render import render_game
+    run = render_game(sys.modules[__name__], out_gif, workers=workers)
+    print(f"Saved GIF: {out_gif} ({run['n_frames']} frames, {run['workers']} worker(s), {run['seconds']:.2f}s)")
+    return run["state"]
 
-df_steps.to_csv("game4_marbles_per_frame_steps.csv", index=False)
-df_out.to_csv("game4_marbles_outcomes.csv", index=False)
-print("Saved CSVs: game4_marbles_per_frame_steps.csv, game4_marbles_outcomes.csv")
+# ----------------------
+# SAVE LOGS
+# ----------------------
+CSV_OUTPUTS = ["game4_marbles_per_frame_steps.csv", "game4_marbles_outcomes.csv"]
+
+def save_logs(state):
+    df_steps = pd.DataFrame(state["step_logs"])
+    df_out   = pd.DataFrame(state["match_logs"])
+
+    df_steps.to_csv("game4_marbles_per_frame_steps.csv", index=False)
+    df_out.to_csv("game4_marbles_outcomes.csv", index=False)
+    print("Saved CSVs: game4_marbles_per_frame_steps.csv, game4_marbles_outcomes.csv")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Squid Game - Game 4 (Marbles)")
+    parser.add_argument("--odds", action="store_true",
+                        help="tabulate sub-game win odds and match lengths instead of rendering")
+    parser.add_argument("--workers", type=int, default=None, help="frame rendering processes (default: all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="always re-render instead of reusing cached outputs")
+    args = parser.parse_args()
+
+    if args.odds:
+        odds = subgame_odds()
+        odds.to_csv("game4_marbles_subgame_odds.csv", index=False)
+        print(odds.to_string(index=False))
+        print("Saved CSV: game4_marbles_subgame_odds.csv")
+    else:
+        cached_render(sys.modules[__name__], [GIF_OUTPUT] + CSV_OUTPUTS,
+                      lambda: save_logs(render_gif(workers=args.workers)), enabled=not args.no_cache)
@@ -3,11 +3,14 @@
 # ============================================
 
 
+import argparse
+import sys
+import time
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.patches import Rectangle
+from render_cache import cached_render
 
 # ---------- Theme ----------
 BG   = "#121212"
@@ -18,8 +21,6 @@ FAIL = "#e55353"
 PANE = "#1f1f1f"
 EDGE = "#444444"
 
-plt.rcParams.update({"figure.facecolor": BG, "axes.facecolor": BG, "savefig.facecolor": BG})
-
 # ---------- Safe path ----------
 safe_side = {
      1:'L',  2:'R',  3:'R',  4:'R',  5:'R',  6:'L',
@@ -94,43 +95,6 @@ def pane_center(step, side):
     sy = left_y if side=='L' else right_y
     return sx, sy
 
-# ---------- Board ----------
-fig, ax = plt.subplots(figsize=(12,6))
-ax.set_xlim(0,1); ax.set_ylim(0,1); ax.axis("off")
-ax.text(0.5, 0.95, "Game 5: Glass Stepping Stones", ha="center", va="top",
-        color=ACC, fontsize=16, weight="bold")
-ax.text(0.5, 0.91, "The simulation has been simplified for clarity.",
-        ha="center", va="top", color=TXT, fontsize=11)
-
-# platforms
-start_rect = Rectangle((X0, right_y-0.12), col_w*0.8, 0.24, fc="#2a2a2a", ec=EDGE, lw=1.2)
-end_rect   = Rectangle((X1-col_w*0.8, right_y-0.12), col_w*0.8, 0.24, fc="#2a2a2a", ec=EDGE, lw=1.2)
-ax.add_patch(start_rect); ax.add_patch(end_rect)
-ax.text(X0+col_w*0.4, Ymid, "Start", color=TXT, ha="center", va="center", fontsize=10)
-ax.text(X1-col_w*0.4, Ymid, "End",   color=TXT, ha="center", va="center", fontsize=10)
-
-# panes
-pane_patches = {}
-for i, sx in enumerate(col_x, start=1):
-    pL = Rectangle((sx-col_w*0.35, left_y - pane_h/2),  col_w*0.7, pane_h, fc=PANE, ec=EDGE, lw=1.0)
-    pR = Rectangle((sx-col_w*0.35, right_y - pane_h/2), col_w*0.7, pane_h, fc=PANE, ec=EDGE, lw=1.0)
-    ax.add_patch(pL); ax.add_patch(pR)
-    pane_patches[(i,'L')] = pL
-    pane_patches[(i,'R')] = pR
-    ax.text(sx, Ymid+0.17, str(i), color="#9aa0a6", fontsize=9, ha="center", va="center")
-
-# players
-pids = [pid for _,pid,_ in turn_order]
-dots, labels = {}, {}
-for pid in pids:
-    d, = ax.plot([], [], marker="o", ms=12, color="#B0BEC5",
-                 markeredgecolor="white", markeredgewidth=0.8, zorder=5)
-    t = ax.text(0,0,"", color=TXT, fontsize=12, weight="bold", ha="center")
-    dots[pid] = d; labels[pid] = t
-
-status_text = ax.text(0.02, 0.06, "", ha="left", color=TXT, fontsize=11)
-cause_text  = ax.text(0.98, 0.06, "", ha="right", color=ACC, fontsize=11, style="italic")
-
 # ---------- Timing (your request) ----------
 FPS = 1
 FRAMES_HOP_SYNC = 1
@@ -138,28 +102,90 @@ FRAMES_FALL     = 2
 FRAMES_PAUSE    = 1
 FRAMES_EXIT     = 1
 FRAMES_PUSH     = 2
+GIF_OUTPUT = "game5_queue_validated.gif"
 
 def lerp(a, b, t): return a + (b - a) * t
 
 # ---------- State ----------
 state = {}
 for _, pid, _ in turn_order:
-    state[pid] = dict(place=("start", 0), pos=start_pos, alive=True, finished=False, visible=True)
+    state[pid] = dict(place=("start", 0), alive=True, finished=False)
+
+# positions & visibility live in arrays, one slot per player (turn order)
+pids    = [pid for _,pid,_ in turn_order]
+slot    = {pid: k for k, pid in enumerate(pids)}
+pos     = np.tile(np.array(start_pos, dtype=np.float32), (len(pids), 1))
+visible = np.ones(len(pids), dtype=bool)
+
+SIDES = {'L': 0, 'R': 1}
+broken_panes       = np.zeros((N_STEPS+1, 2), dtype=bool)   # [step, side]
+revealed_safe_draw = np.zeros(N_STEPS+1, dtype=bool)        # [step]
+
+# ---------- Storyboard ----------
+class Storyboard:
+    """Preallocated per-frame buffers instead of one dict per frame.
+
+    Positions are (frames x players x 2) float32, visibility (frames x players),
+    pane state one packed bitmask per frame (revealed safe | broken L | broken R)
+    and status/cause texts are interned to integer codes.
+    """
 
-broken_panes = set()
-revealed_safe_draw = {s: False for s in range(1, N_STEPS+1)}
+    def __init__(self, n_players, n_steps, capacity):
+        self.n_steps = n_steps
+        self.pos     = np.empty((capacity, n_players, 2), dtype=np.float32)
+        self.visible = np.empty((capacity, n_players), dtype=bool)
+        self.panes   = np.zeros((capacity, (3*n_steps + 7) // 8), dtype=np.uint8)
+        self.status  = np.zeros(capacity, dtype=np.int32)
+        self.cause   = np.zeros(capacity, dtype=np.int32)
+        self.texts, self._text_ids = [""], {"": 0}
+        self.n_frames = 0
+
+    def __len__(self):
+        return self.n_frames
+
+    def _text_id(self, text):
+        if text not in self._text_ids:
+            self._text_ids[text] = len(self.texts)
+            self.texts.append(text)
+        return self._text_ids[text]
+
+    def _grow(self):
+        for name in ("pos", "visible", "panes", "status", "cause"):
+            buf = getattr(self, name)
+            setattr(self, name, np.concatenate([buf, np.zeros_like(buf)]))
+
+    def capture(self, pos, visible, safe, broken, status="", cause=""):
+        if self.n_frames == len(self.pos):
+            self._grow()
+        i = self.n_frames
+        self.pos[i] = pos
+        self.visible[i] = visible
+        self.panes[i] = np.packbits(np.concatenate([safe, broken[:, 0], broken[:, 1]]))
+        self.status[i] = self._text_id(status)
+        self.cause[i] = self._text_id(cause)
+        self.n_frames += 1
+
+    def pane_state(self, i):
+        """(revealed safe steps, broken (step x side)) for frame i, 0-based steps."""
+        return unpack_panes(self.panes[i], self.n_steps)
+
+    def as_state(self):
+        """Trimmed buffers as a plain dict (what the renderer and its workers draw from)."""
+        n = self.n_frames
+        return {"n_frames": n, "n_steps": self.n_steps, "pos": self.pos[:n], "visible": self.visible[:n],
+                "panes": self.panes[:n], "status": self.status[:n], "cause": self.cause[:n],
+                "texts": list(self.texts)}
+
+def unpack_panes(packed, n_steps):
+    bits = np.unpackbits(packed, count=3*n_steps).astype(bool)
+    return bits[:n_steps], np.column_stack([bits[n_steps:2*n_steps], bits[2*n_steps:]])
+
+# upper bound: every turn pauses, hops the whole bridge, falls and exits
+frame_budget = 1 + len(turn_order) * (FRAMES_PAUSE + N_STEPS + FRAMES_FALL + FRAMES_EXIT + FRAMES_PUSH)
+frames = Storyboard(len(pids), N_STEPS, frame_budget)
 
-# storyboard frames
-frames = []
 def snapshot(status_note="", cause_note=""):
-    players_pos = {pid: (state[pid]["pos"][0], state[pid]["pos"][1], state[pid]["visible"]) for pid in pids}
-    frames.append({
-        "players": players_pos,
-        "pane_safe": set([s for s,v in revealed_safe_draw.items() if v]),
-        "pane_broken": set(broken_panes),
-        "status": status_note,
-        "cause": cause_note
-    })
+    frames.capture(pos, visible, revealed_safe_draw[1:], broken_panes[1:], status_note, cause_note)
 
 # ---------- Helpers ----------
 def alive_queue():
@@ -186,7 +212,7 @@ def plan_followers_after_leader_arrival(leader_step, leader_pid):
     for s, pid in followers_on_pane:
         target = s + 1
         if target <= leader_step - 1 and target not in occupied:
-            start_xy = state[pid]["pos"]
+            start_xy = pos[slot[pid]]
             end_xy   = pane_center(target, safe_side[target])
             planned.append((pid, start_xy, end_xy, ("pane", target)))
             occupied.add(target)
@@ -195,7 +221,7 @@ def plan_followers_after_leader_arrival(leader_step, leader_pid):
 
     if leader_step >= 2 and 1 not in occupied and followers_at_start:
         pid = followers_at_start[0]
-        start_xy = state[pid]["pos"]
+        start_xy = pos[slot[pid]]
         end_xy   = pane_center(1, safe_side[1])
         planned.append((pid, start_xy, end_xy, ("pane", 1)))
         occupied.add(1)
@@ -204,14 +230,14 @@ def plan_followers_after_leader_arrival(leader_step, leader_pid):
     return planned
 
 def hop_with_queue(pid, step, capture=True):
-    leader_start = state[pid]["pos"]
+    leader_start = pos[slot[pid]]
     leader_end   = pane_center(step, safe_side[step])
     planned_followers = plan_followers_after_leader_arrival(step, pid)
 
     # single-frame hop (FRAMES_HOP_SYNC == 1)
-    state[pid]["pos"] = leader_end
+    pos[slot[pid]] = leader_end
     for fpid, _fs, fend, _np in planned_followers:
-        state[fpid]["pos"] = fend
+        pos[slot[fpid]] = fend
 
     state[pid]["place"] = ("pane", step)
     revealed_safe_draw[step] = True
@@ -228,9 +254,9 @@ def leader_break_and_fall(pid, break_step, break_side, cause_note=""):
     planned_followers = plan_followers_after_leader_arrival(break_step, pid)
 
     # leader to wrong pane (single frame)
-    state[pid]["pos"] = pane_center(break_step, break_side)
+    pos[slot[pid]] = pane_center(break_step, break_side)
     for fpid, _fs, fend, _np in planned_followers:
-        state[fpid]["pos"] = fend
+        pos[slot[fpid]] = fend
     for fpid, _s, _e, new_place in planned_followers:
         state[fpid]["place"] = new_place
         if new_place[0] == "pane":
@@ -238,30 +264,30 @@ def leader_break_and_fall(pid, break_step, break_side, cause_note=""):
     snapshot(f"WRONG {break_step}{break_side} • Leader {pid}", cause_note)
 
     # pane breaks & fall
-    broken_panes.add((break_step, break_side))
-    x0, y0 = state[pid]["pos"]
+    broken_panes[break_step, SIDES[break_side]] = True
+    x0, y0 = pos[slot[pid]]
     for k in range(FRAMES_FALL):
         t = (k+1)/FRAMES_FALL
-        state[pid]["pos"] = (x0, y0 - 0.40*t)
+        pos[slot[pid]] = (x0, y0 - 0.40*t)
         snapshot(f"Leader {pid} FELL at {break_step}{break_side}", cause_note)
     state[pid]["alive"] = False
-    state[pid]["visible"] = False
+    visible[slot[pid]] = False
 
 def leader_fall_no_glass(pid, cause_note="ELIMINATED"):
-    x0, y0 = state[pid]["pos"]
+    x0, y0 = pos[slot[pid]]
     for k in range(FRAMES_FALL):
         t = (k+1)/FRAMES_FALL
-        state[pid]["pos"] = (x0, y0 - 0.40*t)
+        pos[slot[pid]] = (x0, y0 - 0.40*t)
         snapshot(f"Leader {pid} {cause_note}", cause_note)
     state[pid]["alive"] = False
-    state[pid]["visible"] = False
+    visible[slot[pid]] = False
 
 def leader_push_out(pid, cause_note="PUSHED OUT"):
     # push from Start only
-    state[pid]["pos"] = (X0 - 0.10, Ymid)
+    pos[slot[pid]] = (X0 - 0.10, Ymid)
     snapshot(f"Leader {pid} {cause_note}", cause_note)
     state[pid]["alive"]   = False
-    state[pid]["visible"] = False
+    visible[slot[pid]] = False
 
 # ---------- VALIDATION: ensure leader already on a pane before capturing ----------
 def ensure_ready_for_capture(pid):
@@ -290,7 +316,7 @@ def run_turn(pid, idx, result):
         for s in range(cur_step+1, N_STEPS+1):
             hop_with_queue(pid, s, capture=True)
         # exit (single frame per setting)
-        state[pid]["pos"] = end_pos
+        pos[slot[pid]] = end_pos
         snapshot(f"Turn {idx+1} • {pid} exit")
         state[pid]["finished"] = True
         state[pid]["place"]    = ("end", None)
@@ -322,36 +348,182 @@ for idx, (turn, pid, result) in enumerate(turn_order):
         continue
     outcomes.append(run_turn(pid, idx, result))
 
+# ---------- CSV outputs ----------
+CSV_OUTPUTS = ["game5_broken_panes.csv", "game5_outcomes.csv"]
+
+def save_logs(state):
+    pd.DataFrame(state["broken_panes"], columns=["step","side"]).to_csv("game5_broken_panes.csv", index=False)
+    pd.DataFrame(state["outcomes"]).to_csv("game5_outcomes.csv", index=False)
+    print("Saved CSVs: game5_broken_panes.csv, game5_outcomes.csv")
+
+# ---------- Survival analysis (any bridge size) ----------
+@lru_cache(maxsize=64)
+def death_distribution(n_steps, n_players, p_wrong=0.5):
+    """P(D = d) for d = 0..n_players deaths after `n_steps` unrevealed steps.
+
+    Every unrevealed step is guessed by the current leader and costs exactly one
+    life with probability `p_wrong`; once all players are gone nobody else dies.
+    Memoized per (steps, players, p) so dashboard queries reuse the table; the
+    returned array is read-only because every caller shares it.
+    """
+    dist = np.zeros(n_players + 1)
+    dist[0] = 1.0
+    for _ in range(n_steps):
+        nxt = dist * (1 - p_wrong)
+        nxt[1:] += dist[:-1] * p_wrong
+        nxt[-1] += dist[-1] * p_wrong   # nobody left to fall
+        dist = nxt
+    dist.flags.writeable = False
+    return dist
+
+def bridge_survival_exact(n_steps=N_STEPS, n_players=len(turn_order), p_wrong=0.5):
+    """Exact survival probability per turn position: player k survives iff fewer than k deaths."""
+    dist = death_distribution(n_steps, n_players, p_wrong)
+    p_survive = np.cumsum(dist)[:-1]
+    return pd.DataFrame({"position": np.arange(1, n_players + 1), "p_survive": p_survive})
+
+def bridge_survival_mc(n_steps=N_STEPS, n_players=len(turn_order), n_bridges=1_000_000,
+                       p_wrong=0.5, seed=0, chunk=1 << 20):
+    """Monte Carlo cross-check: walk `n_bridges` bridges turn by turn, `chunk` bridges at once.
+
+    The DP only counts wrong guesses; here the crossing itself is played out. The
+    leader (first player still on the bridge, in turn order) guesses the first
+    unrevealed step and falls with probability `p_wrong`; either way that step is
+    known from then on, so the followers cross it safely and the next leader
+    starts one step further. Falls are tallied by the turn position that fell.
+    """
+    rng = np.random.default_rng(seed)
+    falls = np.zeros(n_players, dtype=np.int64)
+    done = 0
+    while done < n_bridges:
+        b = min(chunk, n_bridges - done)
+        leader = np.zeros(b, dtype=np.int64)      # turn position of each bridge's leader
+        active = np.arange(b)                     # bridges with someone left to guess
+        for _ in range(n_steps):                  # one step revealed per iteration
+            fell = active[rng.random(len(active), dtype=np.float32) < p_wrong]
+            falls += np.bincount(leader[fell], minlength=n_players)
+            leader[fell] += 1                     # the next player in line takes the lead
+            if (leader[fell] == n_players).any():
+                active = active[leader[active] < n_players]
+                if len(active) == 0:
+                    break
+        done += b
+
+    p_survive = 1 - falls / n_bridges
+    return pd.DataFrame({"position": np.arange(1, n_players + 1), "p_survive": p_survive})
+
+def bridge_report(n_steps=N_STEPS, n_players=len(turn_order), n_bridges=1_000_000, p_wrong=0.5, seed=0):
+    exact = bridge_survival_exact(n_steps, n_players, p_wrong)
+    mc = bridge_survival_mc(n_steps, n_players, n_bridges, p_wrong, seed)
+    report = exact.assign(p_survive_mc=mc["p_survive"].values,
+                          abs_err=(mc["p_survive"] - exact["p_survive"]).abs().values)
+    return report, exact["p_survive"].sum(), mc["p_survive"].sum()
+
 # ---------- Draw / Animate ----------
-def refresh_panes(pane_safe, pane_broken):
-    for rect in pane_patches.values():
-        rect.set_facecolor(PANE); rect.set_alpha(1.0); rect.set_edgecolor(EDGE); rect.set_linewidth(1.0)
-    for s in pane_safe:
-        pane_patches[(s, safe_side[s])].set_facecolor(SAFE); pane_patches[(s, safe_side[s])].set_alpha(0.9)
-    for (s, side) in pane_broken:
-        pane_patches[(s, side)].set_facecolor(FAIL); pane_patches[(s, side)].set_alpha(0.9)
-
-def update(i):
-    fr = frames[i]
-    refresh_panes(fr["pane_safe"], fr["pane_broken"])
-    status_text.set_text(fr["status"])
-    cause_text.set_text(fr["cause"])
+def simulate():
+    """The storyboard is scripted (no randomness) and already built at import."""
+    return {**frames.as_state(), "outcomes": outcomes,
+            "broken_panes": [(int(s), "LR"[k]) for s, k in np.argwhere(broken_panes)]}
+
+def build_figure(state):
+    # matplotlib is only imported to draw; season.py --no-render never loads it
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Rectangle
+
+    plt.rcParams.update({"figure.facecolor": BG, "axes.facecolor": BG, "savefig.facecolor": BG})
+
+    # ---------- Board ----------
+    fig, ax = plt.subplots(figsize=(12,6))
+    ax.set_xlim(0,1); ax.set_ylim(0,1); ax.axis("off")
+    ax.text(0.5, 0.95, "Game 5: Glass Stepping Stones", ha="center", va="top",
+            color=ACC, fontsize=16, weight="bold")
+    ax.text(0.5, 0.91, "The simulation has been simplified for clarity.",
+            ha="center", va="top", color=TXT, fontsize=11)
+
+    # platforms
+    start_rect = Rectangle((X0, right_y-0.12), col_w*0.8, 0.24, fc="#2a2a2a", ec=EDGE, lw=1.2)
+    end_rect   = Rectangle((X1-col_w*0.8, right_y-0.12), col_w*0.8, 0.24, fc="#2a2a2a", ec=EDGE, lw=1.2)
+    ax.add_patch(start_rect); ax.add_patch(end_rect)
+    ax.text(X0+col_w*0.4, Ymid, "Start", color=TXT, ha="center", va="center", fontsize=10)
+    ax.text(X1-col_w*0.4, Ymid, "End",   color=TXT, ha="center", va="center", fontsize=10)
+
+    # panes
+    pane_patches = {}
+    for i, sx in enumerate(col_x, start=1):
+        pL = Rectangle((sx-col_w*0.35, left_y - pane_h/2),  col_w*0.7, pane_h, fc=PANE, ec=EDGE, lw=1.0)
+        pR = Rectangle((sx-col_w*0.35, right_y - pane_h/2), col_w*0.7, pane_h, fc=PANE, ec=EDGE, lw=1.0)
+        ax.add_patch(pL); ax.add_patch(pR)
+        pane_patches[(i,'L')] = pL
+        pane_patches[(i,'R')] = pR
+        ax.text(sx, Ymid+0.17, str(i), color="#9aa0a6", fontsize=9, ha="center", va="center")
+
+    # players
+    dots, labels = {}, {}
     for pid in pids:
-        x, y, vis = fr["players"][pid]
-        dots[pid].set_data([x],[y])
-        labels[pid].set_position((x, y+0.035))
-        labels[pid].set_text(str(pid))
-        dots[pid].set_visible(vis); labels[pid].set_visible(vis)
-    return list(dots.values()) + list(labels.values()) + list(pane_patches.values()) + [status_text, cause_text]
-
-FPS = 1
-ani = animation.FuncAnimation(fig, update, frames=len(frames), interval=1000/FPS, blit=False, repeat=False)
-out_gif = "game5_queue_validated.gif"
-ani.save(out_gif, writer="pillow", fps=FPS)
-print("Saved GIF:", out_gif)
-
-# ---------- CSV outputs ----------
-broken_list = sorted([(s, side) for (s, side) in broken_panes], key=lambda x:x[0])
-pd.DataFrame(broken_list, columns=["step","side"]).to_csv("game5_broken_panes.csv", index=False)
-pd.DataFrame(outcomes).to_csv("game5_outcomes.csv", index=False)
-print("Saved CSVs: game5_broken_panes.csv, game5_outcomes.csv")
+        d, = ax.plot([], [], marker="o", ms=12, color="#B0BEC5",
+                     markeredgecolor="white", markeredgewidth=0.8, zorder=5)
+        t = ax.text(0,0,"", color=TXT, fontsize=12, weight="bold", ha="center")
+        dots[pid] = d; labels[pid] = t
+
+    status_text = ax.text(0.02, 0.06, "", ha="left", color=TXT, fontsize=11)
+    cause_text  = ax.text(0.98, 0.06, "", ha="right", color=ACC, fontsize=11, style="italic")
+
+
+    def refresh_panes(pane_safe, pane_broken):
+        for rect in pane_patches.values():
+            rect.set_facecolor(PANE); rect.set_alpha(1.0); rect.set_edgecolor(EDGE); rect.set_linewidth(1.0)
+        for s in np.flatnonzero(pane_safe) + 1:
+            pane_patches[(s, safe_side[s])].set_facecolor(SAFE); pane_patches[(s, safe_side[s])].set_alpha(0.9)
+        for s, k in np.argwhere(pane_broken):
+            side = "LR"[k]
+            pane_patches[(s+1, side)].set_facecolor(FAIL); pane_patches[(s+1, side)].set_alpha(0.9)
+
+    def draw(i):
+        refresh_panes(*unpack_panes(state["panes"][i], state["n_steps"]))
+        status_text.set_text(state["texts"][state["status"][i]])
+        cause_text.set_text(state["texts"][state["cause"][i]])
+        xy, vis = state["pos"][i], state["visible"][i]
+        for k, pid in enumerate(pids):
+            x, y = xy[k]
+            dots[pid].set_data([x],[y])
+            labels[pid].set_position((x, y+0.035))
+            labels[pid].set_text(str(pid))
+            dots[pid].set_visible(vis[k]); labels[pid].set_visible(vis[k])
+        return list(dots.values()) + list(labels.values()) + list(pane_patches.values()) + [status_text, cause_text]
+
+    return fig, draw
+
+def cache_inputs():
+    """Everything the GIF and CSVs depend on besides the code (see render_cache.py)."""
+    return {"safe_side": safe_side, "turn_order": turn_order, "broken": broken_by_pid, "causes": cause_by_pid,
+            "fps": FPS, "frames": (FRAMES_HOP_SYNC, FRAMES_FALL, FRAMES_PAUSE, FRAMES_EXIT, FRAMES_PUSH)}
+
+def render_gif(out_gif=GIF_OUTPUT, workers=None):
+    from parallel_render import render_game
+    run = render_game(sys.modules[__name__], out_gif, workers=workers)
+    print(f"Saved GIF: {out_gif} ({run['n_frames']} frames, {run['workers']} worker(s), {run['seconds']:.2f}s)")
+    return run["state"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Squid Game - Game 5 (Glass Stepping Stones)")
+    parser.add_argument("--analyze", nargs=2, type=int, metavar=("STEPS", "PLAYERS"),
+                        help="survival odds by turn position for any bridge size (no GIF)")
+    parser.add_argument("--bridges", type=int, default=1_000_000, help="Monte Carlo bridges for --analyze")
+    parser.add_argument("--p-wrong", type=float, default=0.5, help="chance a blind guess picks the wrong pane")
+    parser.add_argument("--workers", type=int, default=None, help="frame rendering processes (default: all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="always re-render instead of reusing cached outputs")
+    args = parser.parse_args()
+
+    if args.analyze:
+        n_steps, n_players = args.analyze
+        t0 = time.perf_counter()
+        report, exp_exact, exp_mc = bridge_report(n_steps, n_players, args.bridges, args.p_wrong)
+        report.to_csv("game5_survival_by_position.csv", index=False)
+        print(report.to_string(index=False, max_rows=40))
+        print(f"Expected survivors: exact {exp_exact:.4f} | Monte Carlo {exp_mc:.4f} "
+              f"({args.bridges:,} bridges, {time.perf_counter() - t0:.2f}s)")
+        print("Saved CSV: game5_survival_by_position.csv")
+    else:
+        cached_render(sys.modules[__name__], [GIF_OUTPUT] + CSV_OUTPUTS,
+                      lambda: save_logs(render_gif(workers=args.workers)), enabled=not args.no_cache)
@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))  # the scripts and shared modules live at the repository root
+
+from parallel_render import load_game
+
+
+@pytest.fixture(scope="session")
+def scraper():
+    return load_game(REPO / "player info scrapper.py")
+
+
+@pytest.fixture(scope="session")
+def trends():
+    return load_game(REPO / "get google trend data.py")
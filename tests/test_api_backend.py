@@ -0,0 +1,82 @@
+import contextlib
+import io
+
+import pytest
+
+from benchmarks.wiki_standin import WikiStandin, image_name, make_page, players_df
+
+N_PLAYERS = 120
+REDIRECTS, MISSING, NO_PAGEIMAGE = {7}, {13}, {3, 6, 9, 60, 61}
+
+
+@pytest.fixture(scope="module")
+def wiki():
+    with WikiStandin(N_PLAYERS, redirects=REDIRECTS, missing=MISSING, no_pageimage=NO_PAGEIMAGE) as wiki:
+        yield wiki
+
+
+@pytest.fixture
+def session(scraper):
+    with scraper.make_session(4) as session:
+        yield session
+
+
+def test_infobox_params_keeps_nested_pipes_inside_values(scraper):
+    text = ("Intro {{Quote|not this}}\n{{Character Infobox\n|name = Player 001\n"
+            "|aliases = [[Player 001|Number 1]]\n|cause = {{Game|Red Light|x=1}} [[File:a.png|20px]]\n"
+            "|Gender=Male|empty =\n}}\nStory")
+    assert scraper.infobox_params(text) == {"name": "Player 001", "aliases": "[[Player 001|Number 1]]",
+                                            "cause": "{{Game|Red Light|x=1}} [[File:a.png|20px]]",
+                                            "gender": "Male", "empty": ""}
+    assert scraper.infobox_params("no template here {{Quote|x}}") == {}
+
+
+@pytest.mark.parametrize("wikitext, text", [
+    ("Taxi driver", "Taxi driver"),
+    ("[[Guards|a guard]] and [[Player 007]]", "a guardandPlayer 007"),
+    ("Shot<ref>Ep 1</ref> in {{Game|Red Light, Green Light}}", "ShotinRed Light, Green Light"),
+    ("'''Bold''' <!-- hidden --> ''it''<br/>end", "Bolditend"),
+    ("[https://example.org the site] [[File:x.png|thumb]]", "the site"),
+])
+def test_clean_wikitext(scraper, wikitext, text):
+    assert scraper.clean_wikitext(wikitext) == text
+
+
+def test_fetch_api_batch_follows_continuation_redirects_and_missing(scraper, wiki, session):
+    titles = [f"Player {n:03d} (33rd Squid Game)" for n in range(1, 51)] + ["Player_051_(33rd_Squid_Game)"]
+    before = wiki.count("/api.php")
+    pages = scraper.fetch_api_batch(session, titles, wiki.api_url)
+    assert wiki.count("/api.php") - before == 2            # 30 pages per response: one continuation
+    assert set(pages) == set(titles)
+    assert pages["Player 013 (33rd Squid Game)"] == (None, None)
+    wikitext, image = pages["Player 007 (33rd Squid Game)"]   # redirected to "Player 007"
+    assert "Player 007" in wikitext and image == wiki.image_url(7)
+    assert pages["Player_051_(33rd_Squid_Game)"][0] is not None   # normalized title
+    assert pages["Player 003 (33rd Squid Game)"][1] is None        # no PageImages entry
+    assert sum(w is not None for w, _ in pages.values()) == 50
+
+
+def test_fetch_image_urls_batches_by_50_and_skips_unknown_files(scraper, wiki, session):
+    names = [image_name(n) for n in range(1, 61)] + ["unknown.png"]
+    before = wiki.count("/api.php")
+    urls = scraper.fetch_image_urls(session, names, wiki.api_url)
+    assert wiki.count("/api.php") - before == 2
+    assert urls == {image_name(n): wiki.image_url(n) for n in range(1, 61)}
+
+
+def test_api_records_match_the_html_parser(scraper, wiki):
+    df = players_df(N_PLAYERS, wiki)
+    before = wiki.count("/api.php")
+    with contextlib.redirect_stdout(io.StringIO()):
+        records = scraper.scrape_all_players_api(df, api_url=wiki.api_url, limiter=scraper.HostLimiter(interval=0))
+    # batches of 50 + 50 + 20 titles (the full ones continued once), plus one imageinfo lookup
+    assert wiki.count("/api.php") - before == 6
+    assert len(records) == N_PLAYERS - len(MISSING)
+    by_url = {r["Url"]: r for r in records.to_dict("records")}
+    for n, url in zip(range(1, N_PLAYERS + 1), df["URL"]):
+        if n in MISSING:
+            assert url not in by_url
+            continue
+        expected = scraper.parse_player(make_page(n, wiki.base_url + "/images"), url)
+        assert by_url[url] == expected
+        assert expected["status_at_end_game"] != "-" and expected["Image URL"] == wiki.image_url(n)
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from parallel_render import load_game
+
+
+@pytest.fixture(scope="module")
+def game5():
+    return load_game(Path(__file__).resolve().parent.parent / "simulation game 5.py")
+
+
+@pytest.mark.parametrize("n_steps, n_players, p_wrong", [(18, 16, 0.5), (5, 8, 0.5), (30, 12, 0.3), (40, 3, 0.5)])
+def test_walked_bridges_agree_with_the_exact_dp(game5, n_steps, n_players, p_wrong):
+    exact = game5.bridge_survival_exact(n_steps, n_players, p_wrong)["p_survive"].to_numpy()
+    mc = game5.bridge_survival_mc(n_steps, n_players, 200_000, p_wrong, seed=1, chunk=50_000)["p_survive"].to_numpy()
+    assert np.abs(mc - exact).max() < 0.01
+
+
+def test_later_positions_never_do_worse(game5):
+    mc = game5.bridge_survival_mc(18, 16, 100_000)["p_survive"].to_numpy()
+    assert (np.diff(mc) >= 0).all() and mc[0] < 0.001
+
+
+def test_cached_death_distribution_is_read_only(game5):
+    dist = game5.death_distribution(18, 16, 0.5)
+    with pytest.raises(ValueError):
+        dist[0] = 1.0
+    assert game5.death_distribution(18, 16, 0.5) is dist and dist.sum() == pytest.approx(1.0)
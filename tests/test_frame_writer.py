@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from frame_writer import encode_payload, format_for, open_encoder
+
+
+def solid(value, size=(6, 8)):
+    rgba = np.full((*size, 4), 255, dtype=np.uint8)
+    rgba[..., :3] = value
+    return rgba
+
+
+def frames_of(path):
+    """[(rgb array, duration ms)] of every frame in an animated GIF / APNG."""
+    out = []
+    with Image.open(path) as im:
+        for i in range(getattr(im, "n_frames", 1)):
+            im.seek(i)
+            out.append((np.asarray(im.convert("RGB")), im.info["duration"]))
+    return out
+
+
+@pytest.mark.parametrize("suffix", [".apng", ".gif"])
+def test_repeated_frames_merge_into_one_longer_frame(tmp_path, suffix):
+    path = tmp_path / f"out{suffix}"
+    a, b = solid(10), solid(200)
+    with open_encoder(path, fps=10) as enc:
+        for rgba in (a, a, a, b):
+            enc.write(rgba)
+    frames = frames_of(path)
+    assert [d for _, d in frames] == [300, 100]
+    assert (frames[0][0] == a[..., :3]).all() and (frames[1][0] == b[..., :3]).all()
+
+
+@pytest.mark.parametrize("suffix", [".apng", ".gif"])
+def test_payloads_from_workers_merge_too(tmp_path, suffix):
+    # render_game's worker path: encode_payload() per frame, then append() in the parent
+    path = tmp_path / f"out{suffix}"
+    fmt = format_for(path)
+    a, b = solid(10), solid(200)
+    with open_encoder(path, fps=4) as enc:
+        prev = None
+        for rgba in (a, b, b, a):
+            enc.append(encode_payload(fmt, rgba, prev))
+            prev = rgba
+    assert [d for _, d in frames_of(path)] == [250, 500, 250]
+
+
+@pytest.mark.parametrize("suffix, repeats", [(".apng", 70), (".gif", 700)])
+def test_holds_longer_than_the_delay_field_are_split(tmp_path, suffix, repeats):
+    path = tmp_path / f"out{suffix}"
+    a = solid(10)
+    with open_encoder(path, fps=1) as enc:
+        for _ in range(repeats):
+            enc.write(a)
+        enc.write(solid(200))
+    durations = [d for _, d in frames_of(path)]
+    assert len(durations) == 3 and sum(durations[:2]) == repeats * 1000
+    assert all(d <= 655_350 for d in durations)
@@ -0,0 +1,50 @@
+import contextlib
+import io
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.wiki_standin import WikiStandin
+from http_cache import CachedSession, HttpCache
+
+
+@pytest.fixture(scope="module")
+def wiki():
+    with WikiStandin(10) as wiki:
+        yield wiki
+
+
+def players(wiki, n=4):
+    return pd.DataFrame({"player_number": [f"Player {i:03d}" for i in range(1, n + 1)],
+                         "Image URL": [wiki.image_url(i) for i in range(1, n + 1)]})
+
+
+def mirror(scraper, wiki, directory, session):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return scraper.mirror_images(players(wiki), str(directory), session,
+                                     limiter=scraper.HostLimiter(interval=0))
+
+
+def test_plain_session_writes_files(scraper, wiki, tmp_path):
+    assert mirror(scraper, wiki, tmp_path / "img", scraper.make_session(4)) == 4
+    assert (tmp_path / "img" / "Player_001.png").read_bytes() == wiki._image(1)
+
+
+def test_cached_session_links_blobs_and_falls_back_to_writing(scraper, wiki, tmp_path, monkeypatch):
+    session = CachedSession(scraper.make_session(4), HttpCache(tmp_path / "cache"))
+    assert mirror(scraper, wiki, tmp_path / "img", session) == 4
+    assert os.stat(tmp_path / "img" / "Player_002.png").st_nlink == 2
+
+    def no_links(src, dst):
+        raise OSError("cross-device link")
+    monkeypatch.setattr(os, "link", no_links)
+    assert mirror(scraper, wiki, tmp_path / "copy", session) == 4
+    assert (tmp_path / "copy" / "Player_002.png").read_bytes() == wiki._image(2)
+    session.close()
+
+
+def test_unwritable_destination_is_reported_not_raised(scraper, wiki, tmp_path):
+    (tmp_path / "img").mkdir()
+    (tmp_path / "img" / "Player_003.png").mkdir()       # a directory where the file should go
+    assert mirror(scraper, wiki, tmp_path / "img", scraper.make_session(4)) == 3
@@ -0,0 +1,45 @@
+import sys
+import types
+from contextlib import contextmanager
+
+import parallel_render
+
+
+class InlinePool:
+    """ProcessPoolExecutor stand-in: runs each chunk on submit, counts the frames not yet collected."""
+    held = peak = 0
+
+    def __init__(self, workers, initializer=None, initargs=()):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def submit(self, fn, start, stop):
+        pool = InlinePool
+        pool.held += stop - start
+        pool.peak = max(pool.peak, pool.held)
+
+        def result():
+            pool.held -= stop - start
+            return list(range(start, stop))
+        return types.SimpleNamespace(result=result)
+
+
+def test_render_game_holds_at_most_max_pending_frames(monkeypatch):
+    written = []
+
+    @contextmanager
+    def open_encoder(out, fps):
+        yield types.SimpleNamespace(append=written.append)
+
+    monkeypatch.setitem(sys.modules, "frame_writer", types.SimpleNamespace(format_for=lambda out: "mp4",
+                                                                           open_encoder=open_encoder))
+    monkeypatch.setattr(parallel_render, "ProcessPoolExecutor", InlinePool)
+    game = types.SimpleNamespace(FPS=10, __file__="game.py", simulate=lambda: {"n_frames": 5000})
+    run = parallel_render.render_game(game, "out.mp4", workers=4, max_pending_frames=48)
+    assert run["n_frames"] == 5000 and written == list(range(5000))
+    assert InlinePool.peak <= 48
@@ -0,0 +1,34 @@
+import json
+
+
+def record(n):
+    return {"Url": f"https://wiki.example/wiki/Player_{n:03d}", "player_number": f"Player {n:03d}"}
+
+
+def urls(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["Url"][-3:] for line in f]
+
+
+def test_whole_record_without_newline_is_torn(scraper, tmp_path):
+    path = str(tmp_path / "records.jsonl")
+    with scraper.RecordWriter(path) as w:
+        w.write(record(1)); w.write(record(2))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record(3)))                  # crash before the newline
+    with scraper.RecordWriter(path) as w:
+        assert len(w.done_urls) == 2
+        for n in (4, 5, 6):
+            w.write(record(n))
+    with scraper.RecordWriter(path) as w:
+        assert len(w.done_urls) == 5
+    assert urls(path) == ["001", "002", "004", "005", "006"]
+
+
+def test_bad_line_in_the_middle_keeps_the_records_after_it(scraper, tmp_path):
+    path = str(tmp_path / "records.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(record(1)) + "\n" + '{"Url": "trunc\n' + json.dumps(record(2)) + "\n")
+    with scraper.RecordWriter(path) as w:
+        w.write(record(3))
+    assert urls(path) == ["001", "002", "003"]
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from parallel_render import load_game
+
+
+@pytest.fixture(scope="module")
+def game1():
+    return load_game(Path(__file__).resolve().parent.parent / "simulation game 1.py")
+
+
+def test_a_seed_plays_the_same_game_in_any_batch(game1):
+    alone, _ = game1.simulate_batch(np.array([13]))
+    batched, _ = game1.simulate_batch(np.arange(10, 20))
+    other_batch, _ = game1.simulate_batch(np.arange(0, 40, 13)[::-1])
+    assert (batched[3] == alone[0]).all() and (other_batch[2] == alone[0]).all()
+    _, alive_alone = game1.simulate_batch(np.array([13]))
+    _, alive_pair = game1.simulate_batch(np.array([13, 14]))
+    _, alive_other = game1.simulate_batch(np.array([14]))
+    assert (alive_pair == alive_alone + alive_other).all()
+
+
+def test_batched_games_hit_every_facing_round_target(game1):
+    survivors, final = game1.simulate_batch(np.arange(50))
+    facing = (game1.df["status"] == "Facing").to_numpy()
+    assert (survivors[:, facing] == game1.df["survived"].to_numpy()[facing]).all()
+    assert final.sum() == 50 * game1.df["survived"].iloc[-1]
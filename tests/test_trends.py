@@ -0,0 +1,177 @@
+import pandas as pd
+import pytest
+
+WEEKS = pd.date_range("2025-01-05", periods=6, freq="W")
+
+
+def window(dates, **columns):
+    return pd.DataFrame({"geo": "US", "date": dates, **columns})
+
+
+def test_merge_window_rescales_every_keyword_by_one_factor(trends):
+    stored = window(WEEKS[:4], A=[50.0, 40, 30, 20], B=[0.0, 0, 0, 0])
+    new = window(WEEKS[2:], A=[100.0, 60, 50, 40], B=[10.0, 20, 100, 5])
+    merged = trends.merge_window(stored, new, ["A", "B"]).set_index("date")
+    # basis is the shared week before the (possibly partial) last stored one: 30 + 0 vs 100 + 10
+    factor = 30 / 110
+    assert merged.loc[WEEKS[:3], "A"].tolist() == [50, 40, 30]
+    assert merged.loc[WEEKS[3:], "A"].tolist() == pytest.approx([60 * factor, 50 * factor, 40 * factor], abs=0.01)
+    assert merged.loc[WEEKS[3:], "B"].tolist() == pytest.approx([20 * factor, 100 * factor, 5 * factor], abs=0.01)
+
+
+def test_merge_window_keeps_the_new_scale_when_the_overlap_is_all_zero(trends):
+    stored = window(WEEKS[:4], A=[0.0, 0, 0, 0])
+    new = window(WEEKS[2:], A=[0.0, 80, 100, 40])
+    merged = trends.merge_window(stored, new, ["A"]).set_index("date")
+    assert merged.loc[WEEKS[3:], "A"].tolist() == [80, 100, 40]
+
+
+def test_main_keeps_the_region_breakdown_of_the_groups_that_came_back(trends, monkeypatch, tmp_path):
+    def iot(py, keywords, timeframe, geo=""):
+        return pd.DataFrame({"date": WEEKS[:4], **{k: [10.0, 50, 100, 20] for k in keywords}})
+
+    def ibr(py, keywords, timeframe, resolution="COUNTRY"):
+        if "K6" in keywords:          # the second group comes back empty
+            return pd.DataFrame()
+        return pd.DataFrame({"geoName": ["US", "KR"], "geoCode": ["US", "KR"],
+                             **{k: [100.0, 40] for k in keywords}}).set_index("geoName")
+
+    monkeypatch.setattr(trends, "TrendReq", lambda **kw: None)
+    monkeypatch.setattr(trends, "fetch_interest_over_time", iot)
+    monkeypatch.setattr(trends, "fetch_interest_by_region", ibr)
+    monkeypatch.setattr(trends, "fetch_keyword_matrix", lambda *a, **kw: (pd.DataFrame(), trends.FetchStats()))
+    out = trends.main(kw_list=[f"K{i}" for i in range(1, 8)], countries=["US"], cache_path=str(tmp_path / "c.sqlite"),
+                      journal_path=str(tmp_path / "j.jsonl"), store_dir=str(tmp_path / "store"))
+    ibr = out["ibr_country"]
+    assert ibr.loc["US", "K1"] == 100 and ibr.loc["KR", "K5"] == 40
+    assert ibr[["K6", "K7"]].isna().all().all()              # the empty group's terms are unknown, not dropped
+    assert not out["world_iot"].empty
+
+
+def test_combine_groups_is_nan_when_the_first_anchor_has_no_interest(trends):
+    first = pd.DataFrame({"A": [0.0, 0], "B": [10.0, 20]}, index=WEEKS[:2])
+    second = pd.DataFrame({"A": [5.0, 5], "C": [50.0, 100]}, index=WEEKS[:2])
+    out = trends.combine_groups([first, second], "A", ["A", "B", "C"])
+    assert out["C"].isna().all()                             # not 50 * 0 / 10 = 0 interest
+    assert out["B"].tolist() == [50, 100]
+
+
+def test_join_groups_nan_fills_an_empty_group(trends):
+    groups = [["A", "B"], ["A", "C"], ["A", "D"]]
+    parts = [pd.DataFrame({"date": WEEKS[:2], "A": [10.0, 20], "B": [40.0, 50]}),
+             pd.DataFrame(),
+             pd.DataFrame({"date": WEEKS[:2], "A": [20.0, 40], "D": [80.0, 100]})]
+    out = trends.join_groups(parts, groups, ["A", "B", "C", "D"], "date").set_index("date")
+    assert out["C"].isna().all()
+    assert out["D"].tolist() == [80, 100]                    # 100 * 30/60 = 50 is the peak: 50 -> 100
+    assert out["A"].tolist() == [20, 40]
+
+
+def test_resumed_main_reloads_finished_steps_instead_of_fetching(trends, monkeypatch, tmp_path):
+    calls, failing = [], {"KR"}
+
+    def iot(py, keywords, timeframe, geo=""):
+        calls.append("world_iot")
+        return pd.DataFrame({"date": WEEKS[:4], "A": [10.0, 50, 100, 20]})
+
+    def ibr(py, keywords, timeframe, resolution="COUNTRY"):
+        calls.append("ibr_country")
+        return pd.DataFrame({"geoName": ["United States", "South Korea"], "geoCode": ["US", "KR"],
+                             "A": [100.0, 40]}).set_index("geoName")
+
+    def matrix(keywords, timeframe, countries, on_result=None, **kw):
+        calls.extend(countries)
+        stats, frames = trends.FetchStats(), []
+        for geo in countries:
+            if geo in failing:
+                stats.failed[geo] = "boom"
+                continue
+            df = pd.DataFrame({"geo": geo, "date": WEEKS[:4], "A": [1.0, 2, 3, 4]})
+            on_result(geo, df.drop(columns="geo"))
+            frames.append(df)
+        return (pd.concat(frames) if frames else pd.DataFrame()), stats
+
+    monkeypatch.setattr(trends, "TrendReq", lambda **kw: None)
+    monkeypatch.setattr(trends, "fetch_interest_over_time", iot)
+    monkeypatch.setattr(trends, "fetch_interest_by_region", ibr)
+    monkeypatch.setattr(trends, "fetch_keyword_matrix", matrix)
+    run = dict(kw_list=["A"], timeframe="2025-01-01 2025-02-28", countries=["US", "KR"],
+               journal_path=str(tmp_path / "j.jsonl"), store_dir=str(tmp_path / "store"))
+    first = trends.main(cache_path=str(tmp_path / "c1.sqlite"), **run)
+    assert calls == ["world_iot", "ibr_country", "US", "KR"] and first["failed"] == {"KR": "boom"}
+
+    calls.clear(); failing.clear()
+    second = trends.main(cache_path=str(tmp_path / "c2.sqlite"), **run)   # an empty cache: skips come from the journal
+    assert calls == ["KR"] and second["failed"] == {}
+    assert second["world_iot"]["A"].tolist() == [10, 50, 100, 20]
+    assert second["ibr_country"]["A"].to_dict() == {"United States": 100, "South Korea": 40}
+    assert sorted(second["iot_by_country"]["geo"].unique()) == ["KR", "US"]
+
+
+class Throttled(Exception):
+    """What pytrends raises on an HTTP 429: the response rides on the exception."""
+
+    def __init__(self, retry_after=None):
+        super().__init__("429")
+        self.response = type("Response", (), {"status_code": 429,
+                                              "headers": {} if retry_after is None else {"Retry-After": retry_after}})()
+
+
+def test_token_bucket_backs_off_on_throttle_and_recovers_on_success(trends):
+    bucket = trends.TokenBucket(rate=2.0, min_rate=0.5, max_rate=3.0, step=0.25, factor=0.5)
+    bucket.on_throttle()
+    assert bucket.rate == 1.0 and bucket.tokens <= 0
+    assert bucket._paused_until - trends.time.monotonic() == pytest.approx(1.0, abs=0.05)  # no Retry-After: one interval
+    bucket.on_throttle(retry_after=0.2)
+    assert bucket.rate == 0.5                                   # floored at min_rate
+    for _ in range(20):
+        bucket.on_success()
+    assert bucket.rate == 3.0                                   # capped at max_rate
+
+
+def test_fetch_iot_concurrent_retries_throttled_geos_after_retry_after(trends):
+    throttles = {"US": 2, "KR": 1}
+
+    def fetch(session, keywords, timeframe, geo):
+        if throttles[geo]:
+            throttles[geo] -= 1
+            raise Throttled(retry_after="0.1")
+        return pd.DataFrame({"date": WEEKS[:2], "A": [1.0, 2]})
+
+    bucket = trends.TokenBucket(rate=100.0, min_rate=1.0, max_rate=100.0, step=0.0, factor=0.5)
+    t0 = trends.time.perf_counter()
+    df, stats = trends.fetch_iot_concurrent(["A"], "2025-01-01 2025-02-01", ["US", "KR"], workers=2, limiter=bucket,
+                                            session_factory=lambda: None, fetch=fetch)
+    assert trends.time.perf_counter() - t0 >= 0.2              # two Retry-After pauses in a row for US
+    assert stats.throttled == 3 and stats.requests == 5 and stats.errors == 0 and not stats.failed
+    assert stats.final_rate == bucket.rate == 100.0 * 0.5 ** 3
+    assert df["geo"].tolist() == ["US", "US", "KR", "KR"]
+
+
+def test_fetch_iot_concurrent_gives_up_on_a_geo_throttled_max_times(trends, monkeypatch):
+    monkeypatch.setattr(trends, "MAX_THROTTLED", 3)
+
+    def fetch(session, keywords, timeframe, geo):
+        if geo == "US":
+            raise Throttled(retry_after="0")
+        return pd.DataFrame({"date": WEEKS[:2], "A": [1.0, 2]})
+
+    bucket = trends.TokenBucket(rate=1000.0, min_rate=1000.0, max_rate=1000.0)
+    df, stats = trends.fetch_iot_concurrent(["A"], "2025-01-01 2025-02-01", ["US", "KR"], workers=1, limiter=bucket,
+                                            session_factory=lambda: None, fetch=fetch)
+    assert stats.throttled == 3 and list(stats.failed) == ["US"]
+    assert df["geo"].unique().tolist() == ["KR"]
+
+
+def test_keyword_groups_and_incremental_windows_share_one_limiter(trends, monkeypatch):
+    limiters = []
+
+    def concurrent(keywords, timeframe, countries, limiter=None, **kw):
+        limiters.append(limiter)
+        return pd.DataFrame({"geo": "US", "date": WEEKS[:2], **{k: [1.0, 2] for k in keywords}}), trends.FetchStats()
+
+    monkeypatch.setattr(trends, "fetch_iot_concurrent", concurrent)
+    stored = pd.DataFrame({"geo": "US", "date": WEEKS[2:4], **{f"K{i}": [1.0, 2] for i in range(1, 8)}})
+    trends.update_series([f"K{i}" for i in range(1, 8)], "2024-12-01 2025-03-01", ["US"], stored, overlap_days=7)
+    assert len(limiters) == 4                                   # 2 windows x 2 keyword groups
+    assert limiters[0] is not None and all(lim is limiters[0] for lim in limiters)
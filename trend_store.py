@@ -0,0 +1,143 @@
+# ============================================
+# Squid Game - Google Trends store (partitioned Parquet / Feather)
+# ============================================
+# "get google trend data.py" used to write a new set of timestamped CSVs every
+# run. TrendStore keeps one long, typed table per dataset instead:
+#
+#   <root>/<dataset>/geo=<GEO>/month=<YYYY-MM>/part.parquet
+#   columns: geo, date, keyword, value [, name, timeframe]
+#
+# Writes are upserts: rows are deduplicated on (geo, date, keyword) with the
+# newest winning, and only the partitions that received rows are rewritten
+# (each one atomically). Reads prune partitions by geo and date range from the
+# directory names, so a dashboard only opens the files it shows.
+#
+# Needs pyarrow (the engine pandas uses for Parquet and Feather).
+#
+# Usage:
+#   store = TrendStore()
+#   store.upsert("iot_by_country", to_long(df, ["Squid Game"]))
+#   store.read("iot_by_country", geos=["US", "KR"], start="2025-06-01", wide=True)
+
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+STORE_DIR = os.environ.get("SQUID_TRENDS_STORE", "trends_store")
+FORMAT = "parquet"           # or "feather"
+WORLD = "WORLD"              # geo of the worldwide series
+
+KEY = ["geo", "date", "keyword"]
+# The region breakdown is one small table per timeframe: partitioning it by geo
+# would mean ~250 one-row files, so it is split by month only.
+PARTITIONS: Dict[str, Tuple[str, ...]] = {
+    "world_iot": ("geo", "month"),
+    "iot_by_country": ("geo", "month"),
+    "ibr_country": ("month",),
+}
+DTYPES = {"geo": "string", "date": "datetime64[ns]", "keyword": "string", "value": "float32",
+          "name": "string", "timeframe": "string"}
+
+
+def _typed(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype({c: t for c, t in DTYPES.items() if c in df.columns})
+
+
+def to_long(df: pd.DataFrame, keywords: List[str], geo: Optional[str] = None, date=None) -> pd.DataFrame:
+    """Wide trends frame (id columns + one column per keyword) -> typed long rows."""
+    df = df.assign(**{k: v for k, v in (("geo", geo), ("date", date)) if v is not None})
+    ids = [c for c in df.columns if c not in keywords]
+    long = df.melt(id_vars=ids, value_vars=[k for k in keywords if k in df.columns],
+                   var_name="keyword", value_name="value")
+    return _typed(long)
+
+
+def ibr_to_long(ibr: pd.DataFrame, keywords: List[str], timeframe: str) -> pd.DataFrame:
+    """Region breakdown (index geoName, geoCode + keywords) -> long rows dated at the timeframe's end."""
+    df = ibr.reset_index().rename(columns={"geoName": "name", "geoCode": "geo"})
+    return to_long(df.assign(timeframe=timeframe), keywords, date=pd.Timestamp(timeframe.split()[-1]))
+
+
+def to_wide(long: pd.DataFrame) -> pd.DataFrame:
+    """Long rows -> one column per keyword (the layout of the old CSVs)."""
+    if long.empty:
+        return long
+    ids = [c for c in ("geo", "date") if c in long.columns]
+    ids += [c for c in long.columns if c not in ids + ["keyword", "value"]]
+    wide = long.pivot(index=ids, columns="keyword", values="value").reset_index()
+    wide.columns.name = None
+    return wide
+
+
+class TrendStore:
+    def __init__(self, root: str = STORE_DIR, fmt: str = FORMAT):
+        if fmt not in ("parquet", "feather"):
+            raise ValueError(f"Unsupported format '{fmt}' (use parquet or feather)")
+        self.root, self.fmt = Path(root), fmt
+
+    def _load(self, path: Path) -> pd.DataFrame:
+        return pd.read_parquet(path) if self.fmt == "parquet" else pd.read_feather(path)
+
+    def _save(self, df: pd.DataFrame, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".tmp-{os.getpid()}-{path.name}")
+        if self.fmt == "parquet":
+            df.to_parquet(tmp, index=False)
+        else:
+            df.reset_index(drop=True).to_feather(tmp)
+        os.replace(tmp, path)  # readers never see half a partition
+
+    def upsert(self, dataset: str, rows: pd.DataFrame) -> int:
+        """Merge long `rows` into `dataset`; the last row per (geo, date, keyword) wins.
+
+        Returns the number of partitions rewritten.
+        """
+        if rows.empty:
+            return 0
+        keys = list(PARTITIONS[dataset])
+        rows = _typed(rows).assign(month=lambda d: d["date"].dt.strftime("%Y-%m"))
+        written = 0
+        for values, part in rows.groupby(keys, sort=False):
+            path = self.root / dataset / Path(*[f"{k}={v}" for k, v in zip(keys, values)]) / f"part.{self.fmt}"
+            part = part.drop(columns="month")
+            if path.exists():
+                part = pd.concat([self._load(path), part], ignore_index=True)
+            part = _typed(part).drop_duplicates(KEY, keep="last").sort_values(KEY, ignore_index=True)
+            self._save(part, path)
+            written += 1
+        return written
+
+    def partitions(self, dataset: str, geos: Optional[List[str]] = None, start=None, end=None) -> List[Path]:
+        """Partition files of `dataset` that can hold rows for `geos` within [start, end]."""
+        lo = pd.Timestamp(start).strftime("%Y-%m") if start is not None else None
+        hi = pd.Timestamp(end).strftime("%Y-%m") if end is not None else None
+        out = []
+        for path in sorted((self.root / dataset).glob(f"**/part.{self.fmt}")):
+            parts = dict(p.split("=", 1) for p in path.parent.relative_to(self.root / dataset).parts)
+            if geos is not None and "geo" in parts and parts["geo"] not in geos:
+                continue
+            if (lo and parts["month"] < lo) or (hi and parts["month"] > hi):
+                continue
+            out.append(path)
+        return out
+
+    def read(self, dataset: str, geos: Optional[List[str]] = None, start=None, end=None,
+             keywords: Optional[List[str]] = None, wide: bool = False) -> pd.DataFrame:
+        """Rows of `dataset` filtered by geo, date range and keyword (long, or wide=True)."""
+        files = self.partitions(dataset, geos, start, end)
+        if not files:
+            return pd.DataFrame()
+        df = pd.concat([self._load(f) for f in files], ignore_index=True)
+        mask = pd.Series(True, index=df.index)
+        if geos is not None:
+            mask &= df["geo"].isin(geos)
+        if start is not None:
+            mask &= df["date"] >= pd.Timestamp(start)
+        if end is not None:
+            mask &= df["date"] <= pd.Timestamp(end)
+        if keywords is not None:
+            mask &= df["keyword"].isin(keywords)
+        df = _typed(df[mask]).sort_values(KEY, ignore_index=True)
+        return to_wide(df) if wide else df